@@ -347,8 +347,69 @@ class YComboBoxCurses(YSelectionWidget):
         except Exception:
             pass
 
+    def selectItem(self, item, selected=True):
+        """Make *item* the current entry, or drop its selection."""
+        if selected:
+            self.setValue(item.label())
+        else:
+            item.setSelected(False)
+            if item in self._selected_items:
+                self._selected_items.remove(item)
+
+    def _refresh_item(self, item, what):
+        """Keep the shown value in step with a relabelled current entry."""
+        if item in self._selected_items:
+            self._value = item.label()
+
+    def _remove_rows(self, row, count):
+        """Drop a run of entries; the hover stays on the entry it showed."""
+        if self._hover_index >= row + count:
+            self._hover_index -= count
+        elif self._hover_index >= row:
+            self._hover_index = row
+        self._delete_run(None, row, count)
+
+    def _rows_removed(self, first, gone):
+        super()._rows_removed(first, gone)
+        if self._selected_items:
+            self._value = self._selected_items[0].label()
+        elif not self._editable:
+            self._value = ""
+        self._hover_index = min(self._hover_index, max(0, len(self._items) - 1))
+        if not self._items:
+            self._expanded = False
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
+        except Exception:
+            pass
+
+    def _apply_item_diff(self, diff):
+        """Swap in the setItems() result, keeping the hovered entry of an open list."""
+        hover = diff.oldToNew.get(self._hover_index)
+        selected = self._replace_items(diff)
+        for it in selected[:-1]:
+            it.setSelected(False)
+        self._selected_items = selected[-1:]
+        if self._selected_items:
+            self._value = self._selected_items[0].label()
+        elif not self._editable:
+            self._value = ""
+        if hover is None:
+            hover = min(self._hover_index, max(0, len(self._items) - 1))
+        self._hover_index = hover
+        if not self._items:
+            self._expanded = False
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
+        except Exception:
+            pass
+
     def deleteAllItems(self):
-        super().deleteAllItems()     
+        super().deleteAllItems()
         self._value = ""
         self._expanded = False
         self._hover_index = 0
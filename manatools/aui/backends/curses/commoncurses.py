@@ -20,6 +20,7 @@ import os
 import time
 import logging
 from typing import Tuple, Optional
+from collections import OrderedDict
 from ...yui_common import *
 
 def extract_mnemonic(label: Optional[str]) -> Tuple[Optional[str], str]:
@@ -144,7 +145,8 @@ def split_mnemonic(label: Optional[str]) -> Tuple[Optional[str], Optional[int],
     return mn, idx, ''.join(out)
  
 
-__all__ = ["pixels_to_chars", "_curses_recursive_min_height", "_curses_recursive_min_width"]
+__all__ = ["pixels_to_chars", "_curses_recursive_min_height", "_curses_recursive_min_width",
+           "color_pair", "pin_color_pair", "color_number"]
 
 # Module-level logger for common curses helpers
 _mod_logger = logging.getLogger("manatools.aui.curses.common")
@@ -294,3 +296,149 @@ def _curses_recursive_min_width(widget):
             return max(1, int(getattr(widget, "_width", 10)))
         except Exception:
             return 10
+
+
+class _ColorPairRegistry:
+    """Process-wide (fg, bg) -> color pair table shared by all curses widgets.
+
+    Pairs are allocated on first use and reused afterwards. When the
+    terminal runs out of pairs the least recently used one is redefined;
+    pinned pairs (the ones set up at start-up) are never taken. Only the
+    first 255 pairs are used because attributes carry the pair number in
+    8 bits (see curses.color_pair()).
+    """
+    _NAMES = {
+        'black': curses.COLOR_BLACK,
+        'red': curses.COLOR_RED,
+        'green': curses.COLOR_GREEN,
+        'yellow': curses.COLOR_YELLOW,
+        'blue': curses.COLOR_BLUE,
+        'magenta': curses.COLOR_MAGENTA,
+        'purple': curses.COLOR_MAGENTA,
+        'cyan': curses.COLOR_CYAN,
+        'white': curses.COLOR_WHITE,
+        'gray': curses.COLOR_WHITE,
+        'grey': curses.COLOR_WHITE,
+    }
+    # RGB of the 8 basic colors, to map "#rrggbb" on 8/16 color terminals
+    _BASIC_RGB = [(0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+                  (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229)]
+
+    def __init__(self):
+        self._ready = None  # None: not probed yet, then True/False
+        self._default_bg = True
+        self._colors = 8
+        self._limit = 0
+        self._pairs = OrderedDict()  # (fg, bg) -> pair number, LRU order
+        self._pinned = set()
+        self._next = 1
+        self._numbers = {}  # color spec -> color number
+
+    def _probe(self):
+        try:
+            self._ready = bool(curses.has_colors())
+            if self._ready:
+                if not hasattr(curses, "COLORS"):  # start_color() not called yet
+                    try:
+                        curses.start_color()
+                    except Exception:
+                        pass
+                try:
+                    curses.use_default_colors()
+                except Exception:
+                    self._default_bg = False
+                self._colors = int(getattr(curses, "COLORS", 8) or 8)
+                self._limit = min(int(getattr(curses, "COLOR_PAIRS", 64) or 64), 256) - 1
+        except Exception:
+            self._ready = False
+        return self._ready
+
+    def number(self, spec):
+        """Color number for *spec*: an int, a basic color name or "#rgb"/"#rrggbb"."""
+        if spec is None or isinstance(spec, int):
+            return -1 if spec is None else spec
+        key = str(spec).strip().lower()
+        n = self._numbers.get(key)
+        if n is None:
+            n = self._NAMES.get(key)
+            if n is None and key.startswith('#') and len(key) in (4, 7):
+                try:
+                    h = key[1:] if len(key) == 7 else "".join(c * 2 for c in key[1:])
+                    n = self._from_rgb(int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
+                except ValueError:
+                    n = None
+            if n is None:
+                return None
+            self._numbers[key] = n
+        return n
+
+    def _from_rgb(self, r, g, b):
+        if self._ready is None:
+            self._probe()
+        if self._colors >= 256:
+            steps = [0, 95, 135, 175, 215, 255]
+            idx = [min(range(6), key=lambda i: abs(steps[i] - v)) for v in (r, g, b)]
+            cube = (16 + 36 * idx[0] + 6 * idx[1] + idx[2],
+                    sum((steps[i] - v) ** 2 for i, v in zip(idx, (r, g, b))))
+            level = min(23, max(0, (((r + g + b) // 3) - 8) // 10))
+            gv = 8 + 10 * level
+            gray = (232 + level, (gv - r) ** 2 + (gv - g) ** 2 + (gv - b) ** 2)
+            return min(cube, gray, key=lambda c: c[1])[0]
+        return min(range(8), key=lambda i: sum((a - c) ** 2 for a, c in zip(self._BASIC_RGB[i], (r, g, b))))
+
+    def pair_number(self, fg, bg=-1, pin=False):
+        """Pair number for the (fg, bg) colors, allocating it if needed; None
+        when the terminal has no colors or a color is unknown."""
+        if not (self._ready if self._ready is not None else self._probe()):
+            return None
+        fgn, bgn = self.number(fg), self.number(bg)
+        if fgn is None or bgn is None or fgn >= self._colors or bgn >= self._colors:
+            return None
+        if bgn == -1 and not self._default_bg:
+            bgn = curses.COLOR_BLACK
+        key = (fgn, bgn)
+        pid = self._pairs.get(key)
+        if pid is not None:
+            self._pairs.move_to_end(key)
+        else:
+            if self._next <= self._limit:
+                pid = self._next
+                self._next += 1
+            else:
+                victim = next((k for k, v in self._pairs.items() if v not in self._pinned), None)
+                if victim is None:
+                    return None
+                pid = self._pairs.pop(victim)
+            try:
+                curses.init_pair(pid, fgn, bgn)
+            except Exception:
+                _mod_logger.debug("init_pair(%s, %s, %s) failed", pid, fgn, bgn, exc_info=True)
+                return None
+            self._pairs[key] = pid
+        if pin:
+            self._pinned.add(pid)
+        return pid
+
+
+_color_pairs = _ColorPairRegistry()
+
+
+def color_pair(fg, bg=-1) -> int:
+    """Return the curses attribute drawing in *fg* on *bg*, or 0 without colors.
+
+    Colors are curses color numbers, basic color names ("red", "gray", ...)
+    or "#rrggbb" values mapped to the nearest terminal color (256-color
+    palette where available); -1 is the terminal default.
+    """
+    pid = _color_pairs.pair_number(fg, bg)
+    return curses.color_pair(pid) if pid else 0
+
+
+def pin_color_pair(fg, bg=-1):
+    """Allocate the (fg, bg) pair for good and return its number (None without colors)."""
+    return _color_pairs.pair_number(fg, bg, pin=True)
+
+
+def color_number(spec):
+    """Return the curses color number for *spec* (see color_pair()), or None."""
+    return _color_pairs.number(spec)
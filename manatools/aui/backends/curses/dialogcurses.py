@@ -11,6 +11,10 @@ Author:  Angelo Naselli <anaselli@linux.it>
 '''
 import curses
 import curses.ascii
+try:
+    import curses.panel as curses_panel
+except ImportError:  # built without the panel library
+    curses_panel = None
 import gettext
 import sys
 import os
@@ -33,6 +37,10 @@ class YDialogCurses(YSingleChildContainerWidget):
     """Ncurses dialog container with focus, help, and default button support."""
     _open_dialogs = []
     _current_dialog = None
+    # xterm bracketed-paste markers, as they follow ESC in the getch() stream
+    _PASTE_BEGIN = b"[200~"
+    _PASTE_END = b"\x1b[201~"
+    _PASTE_QUIET_TIMEOUT = 0.5  # seconds without input that end an unterminated paste
     
     def __init__(self, dialog_type=YDialogType.YMainDialog, color_mode=YDialogColorMode.YDialogNormalColor):
         super().__init__()
@@ -50,6 +58,14 @@ class YDialogCurses(YSingleChildContainerWidget):
         self._last_draw_time = 0
         self._draw_interval = 0.1  # seconds
         self._needs_redraw = True   # set on any state change; cleared after each draw
+        self._item_flush_queue = []  # selection widgets with pending item changes
+        self._idle_callbacks = []    # run by waitForEvent() while no key is pending
+        self._keys_pending = False   # input left to read: redraw only once it is drained
+        # focus candidates in tree order and pushbuttons by mnemonic, see _focus_chain()
+        self._focus_chain_serial = -1
+        self._focus_candidates = []
+        self._focus_positions = {}
+        self._mnemonic_buttons = {}
         self._event_result = None
         # Debounce for resize handling (avoid flicker)
         self._resize_pending_until = 0.0
@@ -59,6 +75,8 @@ class YDialogCurses(YSingleChildContainerWidget):
         self._help_overlay_until = 0.0
         self._help_overlay_pos = None  # (y, x) where to draw the overlay; None = auto fallback
         self._default_button = None
+        # panel stacking this dialog's window over the ones opened before it
+        self._panel = None
         YDialogCurses._open_dialogs.append(self)
     
     def widgetClass(self):
@@ -102,6 +120,12 @@ class YDialogCurses(YSingleChildContainerWidget):
     def open(self):
         if not self._window:
             self._create_backend_widget()
+        if self._panel is not None:
+            # opening (again) activates the dialog: raise it above the others
+            try:
+                self._panel.top()
+            except Exception:
+                self._logger.debug("panel top failed", exc_info=True)
         
         self._is_open = True
         YDialogCurses._current_dialog = self
@@ -140,6 +164,18 @@ class YDialogCurses(YSingleChildContainerWidget):
             self._logger.debug("dialog destroyed; remaining open=%d", len(YDialogCurses._open_dialogs))
         except Exception:
             pass
+        if self._panel is not None:
+            # uncover the dialog below: its window still holds its last frame,
+            # so the panel library only has to copy it back to the screen
+            try:
+                self._panel.hide()
+                self._panel = None
+                curses_panel.update_panels()
+                curses.doupdate()
+            except Exception:
+                self._logger.debug("panel hide failed", exc_info=True)
+            if YDialogCurses._open_dialogs:
+                YDialogCurses._open_dialogs[-1]._check_term_size()
         if not YDialogCurses._open_dialogs:
             try:
                 ui = yui_mod.YUI.ui()
@@ -200,12 +236,56 @@ class YDialogCurses(YSingleChildContainerWidget):
     
     def _create_backend_widget(self):
         # Use the main screen
-        self._backend_widget = curses.newwin(0, 0, 0, 0)
+        self._set_window(curses.newwin(0, 0, 0, 0))
+        try:
+            self._logger.debug("_create_backend_widget created backend window")
+        except Exception:
+            pass
+
+    def _set_window(self, win):
+        """Make *win* the dialog window.
+
+        A new dialog's panel goes on top of the stack; a replaced window
+        (after a resize) keeps the panel's place, so a dialog covered by a
+        newer popup stays covered.
+        """
+        self._backend_widget = win
         # keypad(True) must be called on the window used for getch() so that
         # function keys (F1, F10, arrow keys, KEY_BTAB, …) are decoded properly.
         self._backend_widget.keypad(True)
+        if curses_panel is None:
+            return
         try:
-            self._logger.debug("_create_backend_widget created backend window")
+            if self._panel is None:
+                self._panel = curses_panel.new_panel(win)
+            else:
+                self._panel.replace(win)
+        except Exception:
+            self._logger.debug("panel setup failed", exc_info=True)
+            self._panel = None
+
+    def _refresh_screen(self):
+        """Send the dialog window to the terminal.
+
+        With panels the window is staged and update_panels() works out which
+        parts of each stacked dialog are visible, so one doupdate() writes
+        only what changed on screen.
+        """
+        if self._panel is not None:
+            self._backend_widget.noutrefresh()
+            curses_panel.update_panels()
+            curses.doupdate()
+        else:
+            self._backend_widget.refresh()
+
+    def _check_term_size(self):
+        """Schedule a window rebuild if the terminal was resized while this
+        dialog was covered by another one."""
+        try:
+            ui = yui_mod.YUI.ui()
+            if self._backend_widget is not None and \
+                    self._backend_widget.getmaxyx() != ui._stdscr.getmaxyx():
+                self._resize_pending_until = time.time()
         except Exception:
             pass
 
@@ -213,10 +293,12 @@ class YDialogCurses(YSingleChildContainerWidget):
         """Show or hide the dialog.
 
         ncurses has no native window-hide concept, so visibility is emulated:
-        * *hiding* (``visible=False``): the curses window is erased and the
-          terminal is refreshed immediately so the screen area is cleared.
-        * *showing* (``visible=True``): ``_needs_redraw`` is set so the event
-          loop redraws the dialog on its very next iteration.
+        * *hiding* (``visible=False``): the dialog's panel is hidden, which
+          uncovers the dialog below it (or the blank screen); without panel
+          support the curses window is erased and the terminal refreshed.
+        * *showing* (``visible=True``): the panel is shown again and
+          ``_needs_redraw`` is set so the event loop redraws the dialog on
+          its very next iteration.
 
         :meth:`_draw_dialog` also checks this flag and skips all rendering
         while the dialog is hidden.
@@ -224,7 +306,11 @@ class YDialogCurses(YSingleChildContainerWidget):
         super().setVisible(visible)
         try:
             if getattr(self, "_backend_widget", None) is not None:
-                if not visible:
+                if not visible and self._panel is not None:
+                    self._panel.hide()
+                    curses_panel.update_panels()
+                    curses.doupdate()
+                elif not visible:
                     # Immediately erase the terminal area occupied by this window.
                     try:
                         self._backend_widget.erase()
@@ -237,6 +323,8 @@ class YDialogCurses(YSingleChildContainerWidget):
                             "setVisible(False): erase/refresh failed for <%s>",
                             self.debugLabel(), exc_info=True)
                 else:
+                    if self._panel is not None:
+                        self._panel.show()
                     # Mark dirty so the event loop redraws on its next tick.
                     self._needs_redraw = True
                     self._logger.debug(
@@ -289,8 +377,10 @@ class YDialogCurses(YSingleChildContainerWidget):
             height, width = self._backend_widget.getmaxyx()
             #self._logger.debug("Dialog window size: height=%d width=%d", height, width)
             
-            # Clear screen
-            self._backend_widget.clear()
+            # Blank the window.  erase() rather than clear(): clear() forces
+            # refresh() to repaint the whole terminal, whereas after erase()
+            # ncurses compares with the screen and sends only changed lines.
+            self._backend_widget.erase()
 
             # Draw border
             self._backend_widget.border()
@@ -432,7 +522,7 @@ class YDialogCurses(YSingleChildContainerWidget):
                 pass
             
             # Refresh main window first
-            self._backend_widget.refresh()
+            self._refresh_screen()
             
         except curses.error as e:
             # Ignore curses errors (like writing beyond screen bounds)
@@ -451,24 +541,24 @@ class YDialogCurses(YSingleChildContainerWidget):
 
     def _cycle_focus(self, forward=True):
         """Cycle focus between focusable widgets"""
-        focusable = self._find_focusable_widgets()
-        if not focusable:
+        candidates = self._focus_chain()
+        count = len(candidates)
+        if not count:
             return
-        
-        current_index = -1
-        if self._focused_widget:
-            for i, widget in enumerate(focusable):
-                if widget == self._focused_widget:
-                    current_index = i
-                    break
-        
-        if current_index == -1:
-            new_index = 0
+
+        current_index = self._focus_positions.get(self._focused_widget) if self._focused_widget else None
+        new_widget = None
+        if current_index is None:
+            new_widget = next((w for w in candidates if w._can_focus), None)
         else:
-            if forward:
-                new_index = (current_index + 1) % len(focusable)
-            else:
-                new_index = (current_index - 1) % len(focusable)
+            step = 1 if forward else -1
+            for n in range(1, count + 1):
+                w = candidates[(current_index + step * n) % count]
+                if w._can_focus:
+                    new_widget = w
+                    break
+        if new_widget is None:
+            return
         
         # If the currently focused widget is an expanded combo, collapse it
         # so tabbing away closes the dropdown but does not change selection.
@@ -480,7 +570,7 @@ class YDialogCurses(YSingleChildContainerWidget):
                 pass
             self._focused_widget._focused = False
         
-        self._focused_widget = focusable[new_index]
+        self._focused_widget = new_widget
         self._focused_widget._focused = True
         # Mark dirty on focus change
         self._needs_redraw = True
@@ -520,22 +610,53 @@ class YDialogCurses(YSingleChildContainerWidget):
             pass
         return True
 
+    def _focus_chain(self):
+        """
+        Return the widgets that may take focus, in tree order.
+
+        The list (with each widget's position and a mnemonic -> pushbuttons
+        index) is built once and reused until a widget is added, removed or
+        relabelled (YWidget._structure_serial). Whether a widget can take
+        focus right now (_can_focus, enabled) is checked when it is used.
+        """
+        if self._focus_chain_serial != YWidget._structure_serial:
+            candidates = []
+            mnemonics = {}
+            stack = [self.child()] if self.hasChildren() else []
+            while stack:
+                widget = stack.pop()
+                if hasattr(widget, '_can_focus'):
+                    candidates.append(widget)
+                try:
+                    if widget.widgetClass() == 'YPushButton' and getattr(widget, '_mnemonic', None):
+                        mnemonics.setdefault(str(widget._mnemonic).lower(), []).append(widget)
+                except Exception:
+                    pass
+                stack.extend(reversed(getattr(widget, '_children', None) or []))
+            self._focus_candidates = candidates
+            self._focus_positions = {w: i for i, w in enumerate(candidates)}
+            self._mnemonic_buttons = mnemonics
+            self._focus_chain_serial = YWidget._structure_serial
+        return self._focus_candidates
+
     def _find_focusable_widgets(self):
         """Find all widgets that can receive focus"""
-        focusable = []
-        
-        def find_in_widget(widget):
-            if hasattr(widget, '_can_focus') and widget._can_focus:
-                focusable.append(widget)
-            for child in widget._children:
-                find_in_widget(child)
-        
-        if self.hasChildren():
-            find_in_widget(self.child())
-        
-        return focusable
+        return [w for w in self._focus_chain() if w._can_focus]
 
     
+    def _end_batch_update(self):
+        """Draws are held while a batchUpdate() is open; redraw once now."""
+        self.mark_dirty()
+
+    def _call_when_idle(self, callback):
+        """Run *callback* from the event loop the next time no key is pending."""
+        self._idle_callbacks.append(callback)
+
+    def _queue_item_flush(self, widget):
+        """Apply *widget*'s pending item changes before the next redraw."""
+        self._item_flush_queue.append(widget)
+        self._needs_redraw = True
+
     def _post_event(self, event):
         """Post an event to this dialog; waitForEvent will return it."""
         self._event_result = event
@@ -544,6 +665,72 @@ class YDialogCurses(YSingleChildContainerWidget):
             # Mark closed so loop can clean up
             self._is_open = False
 
+    def _paste_begins(self):
+        """Check whether the ESC just read opens a bracketed paste.
+
+        Reads the bytes already queued after ESC; if they are not the
+        ``[200~`` marker they are pushed back so ESC and whatever key
+        followed it are handled as usual.
+        """
+        seen = []
+        while len(seen) < len(self._PASTE_BEGIN):
+            key = self._backend_widget.getch()
+            if key == -1:
+                break
+            seen.append(key)
+            if key != self._PASTE_BEGIN[len(seen) - 1]:
+                break
+        if seen == list(self._PASTE_BEGIN):
+            return True
+        for key in reversed(seen):
+            try:
+                curses.ungetch(key)
+            except Exception:
+                pass
+        return False
+
+    def _read_paste(self):
+        """Read a bracketed paste up to its end marker and return it as text."""
+        data = bytearray()
+        quiet_since = time.time()
+        while True:
+            key = self._backend_widget.getch()
+            if key == -1:
+                if time.time() - quiet_since >= self._PASTE_QUIET_TIMEOUT:
+                    break
+                time.sleep(0.005)
+                continue
+            quiet_since = time.time()
+            if 0 <= key < 256:
+                data.append(key)
+                if data.endswith(self._PASTE_END):
+                    del data[-len(self._PASTE_END):]
+                    break
+            elif key == curses.KEY_ENTER:
+                data.append(10)
+        text = data.decode("utf-8", errors="replace")
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def _dispatch_paste(self, text):
+        """Hand pasted *text* to the focused widget as one insert.
+
+        Widgets implementing ``_handle_paste(text)`` get the whole block;
+        others receive it key by key through ``_handle_key``.
+        """
+        fw = self._focused_widget
+        if not text or fw is None:
+            return
+        self._help_overlay_text = None
+        try:
+            if hasattr(fw, '_handle_paste'):
+                fw._handle_paste(text)
+            elif hasattr(fw, '_handle_key'):
+                for ch in text:
+                    fw._handle_key(ord(ch))
+        except Exception:
+            self._logger.exception("paste dispatch failed")
+        self._needs_redraw = True
+
     def waitForEvent(self, timeout_millisec=0):
         """
         Run the ncurses event loop until an event is posted or timeout occurs.
@@ -576,10 +763,9 @@ class YDialogCurses(YSingleChildContainerWidget):
                             curses.resizeterm(new_h, new_w)
                         except Exception:
                             pass
-                        # Recreate backend window (full-screen)
-                        self._backend_widget = curses.newwin(new_h, new_w, 0, 0)
-                        # Restore keypad on the new window so function keys keep working.
-                        self._backend_widget.keypad(True)
+                        # Recreate backend window (full-screen), keeping keypad
+                        # and the panel stacking order
+                        self._set_window(curses.newwin(new_h, new_w, 0, 0))
                         self._last_term_size = (new_h, new_w)
                     except Exception:
                         pass
@@ -590,9 +776,18 @@ class YDialogCurses(YSingleChildContainerWidget):
                 # Maintain redraw cadence while a help overlay is active (to detect expiry)
                 if getattr(self, '_help_overlay_text', None) is not None:
                     self._needs_redraw = True
+                # Item edits (label, selection, cells) made since the last pass
+                if self._item_flush_queue:
+                    queued, self._item_flush_queue = self._item_flush_queue, []
+                    for w in queued:
+                        try:
+                            w._flush_item_changes()
+                        except Exception:
+                            self._logger.exception("item flush failed")
                 # Only redraw when state changed; prevents idle 10 Hz redraws that
                 # flicker on VT framebuffers where clear()+refresh() is not atomic.
-                if self._needs_redraw and (now - self._last_draw_time) >= self._draw_interval:
+                if (self._needs_redraw and not self._batch_depth and not self._keys_pending
+                        and (now - self._last_draw_time) >= self._draw_interval):
                     self._draw_dialog()
                     self._needs_redraw = False
                     self._last_draw_time = now
@@ -610,11 +805,26 @@ class YDialogCurses(YSingleChildContainerWidget):
                 key = self._backend_widget.getch()
 
                 if key == -1:
+                    if self._keys_pending:
+                        # input drained: draw everything it changed in one frame
+                        self._keys_pending = False
+                        continue
                     if deadline and time.time() >= deadline:
                         self._event_result = YTimeoutEvent()
                         break
+                    if self._idle_callbacks:
+                        # background work (e.g. addItemsAsync chunks) between key polls
+                        pending, self._idle_callbacks = self._idle_callbacks, []
+                        for cb in pending:
+                            try:
+                                cb()
+                            except Exception:
+                                self._logger.exception("idle callback failed")
+                        self._needs_redraw = True
+                        continue
                     time.sleep(0.01)
                     continue
+                self._keys_pending = True
                 
                 #any key received, clear help overlay if active
                 self._help_overlay_text = None
@@ -634,6 +844,9 @@ class YDialogCurses(YSingleChildContainerWidget):
                     # Wait 150ms after the last resize event before applying
                     self._resize_pending_until = time.time() + 0.15
                     continue
+                elif key == 27 and self._paste_begins():
+                    self._dispatch_paste(self._read_paste())
+                    continue
 
                 # Handle hide/show for paned via focused child
                 if key in (ord('+'), ord('-')):
@@ -744,26 +957,12 @@ class YDialogCurses(YSingleChildContainerWidget):
         Returns True if a button was found and an event posted.
         """
         try:
+            self._focus_chain()
             target = None
-            ch_low = ch.lower()
-
-            def visit(widget):
-                nonlocal target
-                if target is not None:
-                    return
-                try:
-                    if getattr(widget, 'widgetClass', lambda: '')() == 'YPushButton':
-                        if widget.isEnabled() and getattr(widget, '_mnemonic', None):
-                            if str(widget._mnemonic).lower() == ch_low:
-                                target = widget
-                                return
-                except Exception:
-                    pass
-                for c in getattr(widget, '_children', []) or []:
-                    visit(c)
-
-            if self.hasChildren():
-                visit(self.child())
+            for widget in self._mnemonic_buttons.get(ch.lower(), ()):
+                if widget.isEnabled():
+                    target = widget
+                    break
             if target is not None:
                 try:
                     self._post_event(YWidgetEvent(target, YEventReason.Activated))
@@ -28,6 +28,7 @@ class YImageCurses(YWidget):
         else:
             self._fallback_name = ""
         self._auto_scale = False
+        self._async_loading = False
         self._zero_size = {YUIDimension.YD_HORIZ: False, YUIDimension.YD_VERT: False}
         self._height = 3
         self._width = 10
@@ -52,6 +53,13 @@ class YImageCurses(YWidget):
         except Exception:
             self._logger.exception("setImage failed")
 
+    def asyncLoading(self):
+        return bool(self._async_loading)
+
+    def setAsyncLoading(self, on=True):
+        """Kept for API compatibility; nothing is decoded in text mode."""
+        self._async_loading = bool(on)
+
     def autoScale(self):
         return bool(self._auto_scale)
 
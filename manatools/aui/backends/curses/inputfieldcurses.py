@@ -218,6 +218,26 @@ class YInputFieldCurses(YWidget):
         
         return handled
 
+    def _handle_paste(self, text):
+        """Insert pasted *text* at the cursor in one step; line breaks become spaces."""
+        if not self._focused or not self.isEnabled() or not self.visible():
+            return False
+        chunk = "".join(ch for ch in text.rstrip("\n").replace("\n", " ").expandtabs()
+                        if ch.isprintable())
+        if not self._password_mode and getattr(self, '_input_max_length', -1) >= 0:
+            chunk = chunk[:max(0, self._input_max_length - len(self._value))]
+        if not chunk:
+            return True
+        self._value = self._value[:self._cursor_pos] + chunk + self._value[self._cursor_pos:]
+        self._cursor_pos += len(chunk)
+        try:
+            dlg = self.findDialog()
+            if dlg is not None and self.notify():
+                dlg._post_event(YWidgetEvent(self, YEventReason.ValueChanged))
+        except Exception:
+            pass
+        return True
+
     def key_hints(self) -> str:
         return _("Type to edit")
 
@@ -40,19 +40,24 @@ class YLogViewCurses(YWidget):
         recently appended appears at the *top* of the widget and older
         lines are pushed downward.  ``False`` (default) keeps the natural
         insertion order (oldest at top, newest at bottom).
+    compression : str, optional
+        ``None`` (default) keeps every retained line as a plain string.
+        ``"zlib"`` or ``"lzma"`` enables tiered storage: recent lines stay
+        plain while older ones are packed into compressed chunks that are
+        decoded on demand (see :class:`YLogLineStore`).
 
         In *reverse* mode the scroll offset is *not* auto-adjusted on
         append because the newest line is already at position 0.
     """
     def __init__(self, parent=None, label: str = "", visibleLines: int = 10,
                  storedLines: int = 0, focus: 'YLogViewFocus' = None,
-                 reverse: bool = False):
+                 reverse: bool = False, compression: str = None):
         super().__init__(parent)
         self._logger = logging.getLogger(f"manatools.aui.ncurses.{self.__class__.__name__}")
         self._label = label or ""
         self._visible = max(1, int(visibleLines or 10))
         self._max_lines = max(0, int(storedLines or 0))
-        self._lines = []
+        self._lines = YLogLineStore(self._max_lines, compression)
         self._backend_widget = self
         if focus is None:
             focus = YLogViewFocus.HEAD
@@ -94,18 +99,19 @@ class YLogViewCurses(YWidget):
         self._trim_if_needed()
 
     def logText(self) -> str:
-        return "\n".join(self._lines)
+        return self._lines.text()
 
     def setLogText(self, text: str):
         try:
             raw = [] if text is None else str(text).splitlines()
-            self._lines = raw
+            self._lines.clear()
+            self._lines.extend(raw)
             self._trim_if_needed()
         except Exception:
             self._logger.exception("setLogText failed")
 
     def lastLine(self) -> str:
-        return self._lines[-1] if self._lines else ""
+        return self._lines.last()
 
     def appendLines(self, text: str):
         """Append one or more lines to the log.
@@ -165,18 +171,32 @@ class YLogViewCurses(YWidget):
         self._scroll_y = 0
 
     def clearText(self):
-        self._lines = []
+        self._lines.clear()
         self._scroll_y = 0
         self._scroll_x = 0
 
     def lines(self) -> int:
         return len(self._lines)
 
+    def historyCompression(self):
+        """Return the codec used for older log lines, or None if disabled."""
+        return self._lines.compression()
+
+    def setHistoryCompression(self, codec: str = "zlib", chunkLines: int = 1000):
+        """Enable (``"zlib"``/``"lzma"``) or disable (``None``) compressed
+        storage of older lines, packing them in chunks of *chunkLines*.
+
+        Retained lines are re-packed; the displayed text does not change.
+        """
+        try:
+            self._lines.setCompression(codec, chunkLines)
+        except Exception:
+            self._logger.exception("setHistoryCompression failed")
+
     # internals
     def _trim_if_needed(self):
         try:
-            if self._max_lines > 0 and len(self._lines) > self._max_lines:
-                self._lines = self._lines[-self._max_lines:]
+            self._lines.setMaxLines(self._max_lines)
         except Exception:
             self._logger.exception("trim failed")
 
@@ -199,7 +219,7 @@ class YLogViewCurses(YWidget):
             total_lines = len(self._lines)
             max_len = 0
             try:
-                max_len = max((len(s) for s in self._lines)) if self._lines else 0
+                max_len = self._lines.maxLineLength()
             except Exception:
                 max_len = 0
 
@@ -21,11 +21,86 @@ if not logging.getLogger().handlers:
     _mod_logger.setLevel(logging.INFO)
 
 
+class _LineGapBuffer:
+    """List of text lines kept as a gap buffer.
+
+    The free slots sit where the last edit happened, so inserting or
+    removing lines at the cursor only moves the lines between the old and
+    the new edit position (O(1) amortised while typing), instead of
+    shifting every following line as a plain list would. Indexing,
+    assignment and len() work like on a list.
+    """
+    _MIN_GAP = 64
+
+    def __init__(self, lines=None):
+        self._buf = list(lines) if lines else [""]
+        self._gap_start = len(self._buf)
+        self._gap_end = len(self._buf)
+
+    def __len__(self):
+        return len(self._buf) - (self._gap_end - self._gap_start)
+
+    def _pos(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("line index out of range")
+        return i if i < self._gap_start else i + self._gap_end - self._gap_start
+
+    def __getitem__(self, i):
+        return self._buf[self._pos(i)]
+
+    def __setitem__(self, i, line):
+        self._buf[self._pos(i)] = line
+
+    def __iter__(self):
+        for i in range(self._gap_start):
+            yield self._buf[i]
+        for i in range(self._gap_end, len(self._buf)):
+            yield self._buf[i]
+
+    def _move_gap(self, i):
+        """Move the gap so that it starts before line *i*."""
+        gs, ge = self._gap_start, self._gap_end
+        if i < gs:
+            n = gs - i
+            self._buf[ge - n:ge] = self._buf[i:gs]
+            self._buf[i:i + min(n, ge - gs)] = [None] * min(n, ge - gs)
+        elif i > gs:
+            n = i - gs
+            self._buf[gs:i] = self._buf[ge:ge + n]
+            self._buf[max(ge, i):ge + n] = [None] * (ge + n - max(ge, i))
+        self._gap_end = ge + (i - gs)
+        self._gap_start = i
+
+    def insert(self, i, line):
+        i = max(0, min(i, len(self)))
+        self._move_gap(i)
+        if self._gap_start == self._gap_end:
+            grow = max(self._MIN_GAP, len(self._buf) // 2)
+            self._buf[self._gap_start:self._gap_start] = [None] * grow
+            self._gap_end += grow
+        self._buf[self._gap_start] = line
+        self._gap_start += 1
+
+    def pop(self, i=-1):
+        self._pos(i)  # bounds check
+        if i < 0:
+            i += len(self)
+        # after the move line i is the last one before the gap
+        self._move_gap(i + 1)
+        self._gap_start -= 1
+        line = self._buf[self._gap_start]
+        self._buf[self._gap_start] = None
+        return line
+
+
 class YMultiLineEditCurses(YWidget):
     def __init__(self, parent=None, label=""):
         super().__init__(parent)
         self._label = label
-        self._lines = [""]
+        self._lines = _LineGapBuffer()
+        self._value_cache = ""  # joined text of _lines, None after an edit
         self._editing = False
         self._focused = False
         self._can_focus = True
@@ -62,7 +137,9 @@ class YMultiLineEditCurses(YWidget):
 
     def value(self):
         try:
-            return "\n".join(self._lines)
+            if self._value_cache is None:
+                self._value_cache = "\n".join(self._lines)
+            return self._value_cache
         except Exception:
             return ""
 
@@ -72,9 +149,10 @@ class YMultiLineEditCurses(YWidget):
         except Exception:
             s = ""
         try:
-            self._lines = s.split('\n')
+            self._lines = _LineGapBuffer(s.split('\n'))
         except Exception:
-            self._lines = [s]
+            self._lines = _LineGapBuffer([s])
+        self._value_cache = s
         self._editing = False
 
     def label(self):
@@ -368,6 +446,7 @@ class YMultiLineEditCurses(YWidget):
                 return False
 
             if edited:
+                self._value_cache = None
                 # post value-changed on each edit
                 dlg = self.findDialog()
                 if dlg is not None and self.notify():
@@ -381,6 +460,42 @@ class YMultiLineEditCurses(YWidget):
         except Exception:
             return False
 
+    def _handle_paste(self, text):
+        """Insert a pasted block at the cursor as a single edit."""
+        if not getattr(self, '_focused', False) or not self.isEnabled() or not self.visible():
+            return False
+        try:
+            pieces = ["".join(ch for ch in p.expandtabs() if ch.isprintable())
+                      for p in text.split("\n")]
+            row = min(self._cursor_row, len(self._lines) - 1)
+            line = self._lines[row]
+            col = min(self._cursor_col, len(line))
+            left, right = line[:col], line[col:]
+            limit = getattr(self, '_input_max_length', -1)
+            if limit >= 0:
+                # same per-line limit as typing
+                pieces[0] = pieces[0][:max(0, limit - len(left) - (len(right) if len(pieces) == 1 else 0))]
+                pieces[1:-1] = [p[:limit] for p in pieces[1:-1]]
+                if len(pieces) > 1:
+                    pieces[-1] = pieces[-1][:max(0, limit - len(right))]
+            self._lines[row] = left + pieces[0]
+            for p in pieces[1:]:
+                row += 1
+                self._lines.insert(row, p)
+            self._cursor_row = row
+            self._cursor_col = len(self._lines[row])
+            self._lines[row] += right
+            self._value_cache = None
+            dlg = self.findDialog()
+            if dlg is not None and self.notify():
+                try:
+                    dlg._post_event(YWidgetEvent(self, YEventReason.ValueChanged))
+                except Exception:
+                    pass
+            return True
+        except Exception:
+            return False
+
     def setVisible(self, visible: bool = True):
         super().setVisible(visible)
         # in curses backend visibility controls whether widget can receive focus
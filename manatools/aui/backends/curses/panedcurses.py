@@ -78,6 +78,7 @@ class YPanedCurses(YWidget):
         try:
             self._children[0] = child
             self._hidden[0] = False
+            YWidget._structure_changed()
             self._logger.debug("setStartChild: %s", getattr(child, "debugLabel", lambda: repr(child))())
         except Exception as e:
             self._logger.error("setStartChild error: %s", e, exc_info=True)
@@ -87,6 +88,7 @@ class YPanedCurses(YWidget):
         try:
             self._children[1] = child
             self._hidden[1] = False
+            YWidget._structure_changed()
             self._logger.debug("setEndChild: %s", getattr(child, "debugLabel", lambda: repr(child))())
         except Exception as e:
             self._logger.error("setEndChild error: %s", e, exc_info=True)
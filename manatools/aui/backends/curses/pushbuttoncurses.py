@@ -66,6 +66,8 @@ class YPushButtonCurses(YWidget):
             self._mnemonic, self._mnemonic_index, self._clean_label = split_mnemonic(self._label)
         except Exception:
             self._mnemonic, self._mnemonic_index, self._clean_label = None, None, self._label
+        # the dialog indexes buttons by mnemonic
+        YWidget._structure_changed()
 
     def setDefault(self, default: bool):
         """Mark this button as the dialog default (or clear it)."""
@@ -4,14 +4,14 @@
 Curses backend RichText widget.
 - Displays text content in a scrollable area.
 - In plain text mode, shows the text as-is.
-- In rich mode, strips simple HTML tags for display; detects URLs.
+- In rich mode, draws the styled segments of YRichTextDocument; detects URLs.
 - Link activation: pressing Enter on a line with a URL posts a YMenuEvent with the URL.
 '''
 import curses
 import re
-from html.parser import HTMLParser
 import logging
 from ...yui_common import *
+from .commoncurses import color_pair
 
 _mod_logger = logging.getLogger("manatools.aui.curses.richtext.module")
 if not logging.getLogger().handlers:
@@ -37,11 +37,11 @@ class YRichTextCurses(YWidget):
         self._anchors = []  # list of dicts: {sline, scol, eline, ecol, target}
         self._armed_index = -1
         self._heading_lines = set()
-        self._color_link = None
-        self._color_link_armed = None
         self._parsed_lines = None
-        self._named_color_pairs = {}
-        self._next_color_pid = 20
+        self._lines_owned = False
+        self._max_len = 0
+        # lines and metrics derived from _text, see _content()
+        self._content_cache = None
         self._preferred_rows = 6 #not used by now
         #tooltip support
         self._x = 0
@@ -52,6 +52,8 @@ class YRichTextCurses(YWidget):
         if not self._logger.handlers and not logging.getLogger().handlers:
             for h in _mod_logger.handlers:
                 self._logger.addHandler(h)
+        # curses widgets are drawn without _create_backend_widget(): parse now
+        self._reparse()
 
     def widgetClass(self):
         return "YRichText"
@@ -61,12 +63,7 @@ class YRichTextCurses(YWidget):
             self._backend_widget = self
             self._logger.debug("_create_backend_widget: <%s>", self.debugLabel())
             # initial parse for rich mode
-            if not self._plain:
-                try:
-                    self._anchors = self._parse_anchors(self._text)
-                    self._anchors.sort(key=lambda a: (a['sline'], a['scol']))
-                except Exception:
-                    self._anchors = []
+            self._reparse()
         except Exception as e:
             try:
                 self._logger.error("_create_backend_widget error: %s", e, exc_info=True)
@@ -76,17 +73,120 @@ class YRichTextCurses(YWidget):
     def setValue(self, newValue: str):
         self._text = newValue or ""
         # re-parse anchors when in rich mode
+        self._reparse()
+        # autoscroll: move hover to last line
+        if self._auto_scroll:
+            lines = self._content()['lines']
+            self._hover_line = max(0, len(lines) - 1)
+            self._ensure_hover_visible()
+
+    def appendValue(self, fragment: str):
+        """Append *fragment* to the content, parsing only the fragment.
+
+        Its first line continues the last shown line, the others are added
+        below it; lines already shown are left untouched.  Tags left open
+        by the text before still apply to the fragment.
+        """
+        fragment = fragment or ""
+        if not fragment:
+            return
+        content = self._content()
+        if content['segmented']:
+            self._append_segments(fragment)
+        else:
+            self._append_plain(fragment, content)
+        self._text += fragment
+        if self._auto_scroll:
+            self._hover_line = max(0, len(self._content()['lines']) - 1)
+            self._ensure_hover_visible()
+
+    def _append_plain(self, fragment, content):
+        lines = content['lines']
+        new = fragment.splitlines()
+        if not new:
+            return
+        if not self._text:
+            lines[:] = []
+        elif len((self._text[-1] + "x").splitlines()) == 1:
+            # the text does not end with a line break: continue its last line
+            lines[-1] += new.pop(0)
+            content['max_len'] = max(content['max_len'], len(lines[-1]))
+        lines.extend(new)
+        content['max_len'] = max([content['max_len']] + [len(l) for l in new])
+
+    def _append_segments(self, fragment):
+        try:
+            doc = YRichTextDocument.parse(fragment, self._tail_state)
+        except Exception:
+            self._logger.exception("appendValue: cannot parse rich text")
+            return
+        self._tail_state = doc.endState()
+        # the document lines are shared with the parse cache: own them first
+        if not self._lines_owned:
+            self._parsed_lines = list(self._parsed_lines)
+            self._heading_lines = set(self._heading_lines)
+            self._lines_owned = True
+        lines = self._parsed_lines
+        base = len(lines) - 1
+        shift_col = sum(len(seg['text']) for seg in lines[base])
+        shift_seg = len(lines[base])
+        new = doc.lines()
+        lines[base] = lines[base] + new[0]
+        lines.extend(new[1:])
+        self._heading_lines.update(base + idx for idx in doc.headingLines())
+        for a in doc.anchors():
+            a = dict(a, sline=a['sline'] + base, eline=a['eline'] + base)
+            if a['sline'] == base:
+                a['scol'] += shift_col
+                a['ecol'] += shift_col
+                a['seg_idx'] += shift_seg
+                last = self._anchors[-1] if self._anchors else None
+                if (last is not None and a['scol'] == shift_col and last['eline'] == base
+                        and last['ecol'] == shift_col and last['target'] == a['target']):
+                    # a link left open by the previous text goes on
+                    self._anchors[-1] = dict(last, ecol=a['ecol'])
+                    continue
+            self._anchors.append(a)
+        self._max_len = max([self._max_len] + [sum(len(seg['text']) for seg in row)
+                                                for row in lines[base:]])
+        self._content_cache = None
+
+    def _reparse(self):
+        """Parse _text once (anchors, headings, segments in rich mode) and
+        drop the derived lines, so drawing and scrolling never re-parse."""
+        self._content_cache = None
+        self._parsed_lines = None
+        self._lines_owned = False
+        self._max_len = 0
+        self._heading_lines = set()
+        self._anchors = []
+        self._tail_state = None
         if not self._plain:
             try:
                 self._anchors = self._parse_anchors(self._text)
                 self._anchors.sort(key=lambda a: (a['sline'], a['scol']))
             except Exception:
                 self._anchors = []
-        # autoscroll: move hover to last line
-        if self._auto_scroll:
-            lines = self._lines()
-            self._hover_line = max(0, len(lines) - 1)
-            self._ensure_hover_visible()
+
+    def _content(self):
+        """
+        Return the lines to draw and their metrics, computed once per text.
+
+        A dict with 'lines' (segment lists in rich mode, plain strings
+        otherwise), 'segmented' and 'max_len', the longest line in
+        characters used by the scrollbars and horizontal scrolling.
+        """
+        if self._content_cache is None:
+            lines = self._parsed_lines if not self._plain else None
+            if lines:
+                max_len = self._max_len
+                segmented = True
+            else:
+                lines = self._lines()
+                max_len = max(map(len, lines), default=0)
+                segmented = False
+            self._content_cache = {'lines': lines, 'segmented': segmented, 'max_len': max_len}
+        return self._content_cache
 
     def value(self) -> str:
         return self._text
@@ -95,7 +195,9 @@ class YRichTextCurses(YWidget):
         return bool(self._plain)
 
     def setPlainTextMode(self, on: bool = True):
-        self._plain = bool(on)
+        if bool(on) != self._plain:
+            self._plain = bool(on)
+            self._reparse()
 
     def autoScrollDown(self) -> bool:
         return bool(self._auto_scroll)
@@ -103,205 +205,31 @@ class YRichTextCurses(YWidget):
     def setAutoScrollDown(self, on: bool = True):
         self._auto_scroll = bool(on)
         if self._auto_scroll:
-            lines = self._lines()
+            lines = self._content()['lines']
             self._hover_line = max(0, len(lines) - 1)
             self._ensure_hover_visible()
 
     def lastActivatedUrl(self):
         return self._last_url
 
-    def _strip_tags(self, s: str) -> str:
-        # Convert minimal HTML into text breaks and bullets, then strip remaining tags
-        try:
-            t = s
-            # breaks and paragraphs
-            t = re.sub(r"<br\s*/?>", "\n", t, flags=re.IGNORECASE)
-            t = re.sub(r"</p\s*>", "\n\n", t, flags=re.IGNORECASE)
-            t = re.sub(r"<p\s*>", "", t, flags=re.IGNORECASE)
-            # lists
-            t = re.sub(r"<ul\s*>", "\n", t, flags=re.IGNORECASE)
-            t = re.sub(r"</ul\s*>", "\n", t, flags=re.IGNORECASE)
-            t = re.sub(r"<ol\s*>", "\n", t, flags=re.IGNORECASE)
-            t = re.sub(r"</ol\s*>", "\n", t, flags=re.IGNORECASE)
-            t = re.sub(r"<li\s*>", "• ", t, flags=re.IGNORECASE)
-            t = re.sub(r"</li\s*>", "\n", t, flags=re.IGNORECASE)
-            # headings -> uppercase with newline
-            for n in range(1,7):
-                t = re.sub(fr"<h{n}\s*>", "", t, flags=re.IGNORECASE)
-                t = re.sub(fr"</h{n}\s*>", "\n", t, flags=re.IGNORECASE)
-            # anchors: keep inner text only; URLs handled via anchor list
-            t = re.sub(r"<a\s+[^>]*href=\"([^\"]+)\"[^>]*>(.*?)</a>", r"\2", t, flags=re.IGNORECASE|re.DOTALL)
-            t = re.sub(r"<a\s+[^>]*href='([^']+)'[^>]*>(.*?)</a>", r"\2", t, flags=re.IGNORECASE|re.DOTALL)
-            return re.sub(r"<[^>]+>", "", t)
-        except Exception:
-            return s
-
     def _lines(self):
-        content = self._text
-        if not self._plain:
-            content = self._strip_tags(content)
-        lines = content.splitlines() or [""]
+        lines = self._text.splitlines() or [""]
         return lines
 
     def _parse_anchors(self, s: str):
-        # New parser-based implementation
-        anchors = []
+        """Parse *s* with the shared YRichTextDocument tokenizer (memoised per
+        text) and return its anchors; lines and headings are kept too."""
         try:
-            class Parser(HTMLParser):
-                def __init__(self):
-                    super().__init__()
-                    self.lines = [[]]
-                    self.styles = []
-                    self.anchor = None
-                    self.buf = ""
-                    self.heading_lines = set()
-
-                def _flush(self):
-                    if not self.buf:
-                        return
-                    seg = {
-                        'text': self.buf,
-                        'bold': any(s == 'b' for s in self.styles),
-                        'italic': any(s == 'i' for s in self.styles),
-                        'underline': any(s == 'u' for s in self.styles) or (self.anchor is not None),
-                        'color': None,
-                        'anchor': self.anchor
-                    }
-                    for s in self.styles:
-                        if isinstance(s, dict) and 'color' in s:
-                            seg['color'] = s['color']
-                    self.lines[-1].append(seg)
-                    self.buf = ""
-
-                def handle_starttag(self, tag, attrs):
-                    at = dict(attrs)
-                    if tag == 'br':
-                        self._flush()
-                        self.lines.append([])
-                    elif tag == 'p':
-                        self._flush()
-                        self.lines.append([])
-                    elif tag in ('ul','ol'):
-                        self._flush()
-                        self.lines.append([])
-                    elif tag == 'li':
-                        self._flush()
-                        self.buf += '• '
-                    elif tag in ('h1','h2','h3','h4','h5','h6'):
-                        # flush previous text, then mark heading as bold
-                        self._flush()
-                        self.styles.append('b')
-                    elif tag == 'a':
-                        href = at.get('href') or at.get('HREF')
-                        self._flush()
-                        self.anchor = href
-                    elif tag == 'span':
-                        # flush previous text, then push color/style
-                        self._flush()
-                        color = at.get('foreground') or None
-                        if not color and 'style' in at:
-                            m = re.search(r'color:\s*([^;]+)', at.get('style'))
-                            if m:
-                                color = m.group(1)
-                        if color:
-                            self.styles.append({'color': color})
-                        else:
-                            self.styles.append('span')
-                    elif tag == 'b':
-                        self._flush()
-                        self.styles.append('b')
-                    elif tag in ('i','em'):
-                        self._flush()
-                        self.styles.append('i')
-                    elif tag == 'u':
-                        self._flush()
-                        self.styles.append('u')
-
-                def handle_endtag(self, tag):
-                    if tag == 'br':
-                        self._flush()
-                        self.lines.append([])
-                    elif tag == 'p':
-                        self._flush()
-                        self.lines.append([])
-                    elif tag in ('ul','ol'):
-                        self._flush()
-                        self.lines.append([])
-                    elif tag == 'li':
-                        self._flush()
-                        self.lines.append([])
-                    elif tag in ('h1','h2','h3','h4','h5','h6'):
-                        try:
-                            self.styles.remove('b')
-                        except ValueError:
-                            pass
-                        self._flush()
-                        # mark current line as heading
-                        try:
-                            self.heading_lines.add(len(self.lines)-1)
-                        except Exception:
-                            pass
-                        self.lines.append([])
-                    elif tag == 'a':
-                        self._flush()
-                        self.anchor = None
-                    elif tag == 'span':
-                        # pop last color dict if present
-                        for i in range(len(self.styles)-1, -1, -1):
-                            if isinstance(self.styles[i], dict) and 'color' in self.styles[i]:
-                                del self.styles[i]
-                                break
-                        else:
-                            if self.styles:
-                                self.styles.pop()
-                        self._flush()
-                    elif tag == 'b':
-                        try:
-                            self.styles.remove('b')
-                        except ValueError:
-                            pass
-                        self._flush()
-                    elif tag in ('i','em'):
-                        try:
-                            self.styles.remove('i')
-                        except ValueError:
-                            pass
-                        self._flush()
-                    elif tag == 'u':
-                        try:
-                            self.styles.remove('u')
-                        except ValueError:
-                            pass
-                        self._flush()
-
-                def handle_data(self, data):
-                    parts = data.split('\n')
-                    for idx, part in enumerate(parts):
-                        if idx > 0:
-                            self._flush()
-                            self.lines.append([])
-                        self.buf += part
-
-            p = Parser()
-            p.feed(s)
-            p._flush()
-            lines = p.lines
-            # collect anchors and heading lines from parser
-            anchors = []
-            self._heading_lines = set(p.heading_lines)
-            for ln_idx, segs in enumerate(lines):
-                col = 0
-                for seg_idx, seg in enumerate(segs):
-                    text = seg.get('text','')
-                    length = len(text)
-                    if seg.get('anchor'):
-                        anchors.append({'sline': ln_idx, 'scol': col, 'eline': ln_idx, 'ecol': col + length, 'target': seg.get('anchor'), 'seg_idx': seg_idx})
-                    col += length
-            self._parsed_lines = lines
+            doc = YRichTextDocument.parse(s)
+            self._heading_lines = doc.headingLines()
+            self._parsed_lines = doc.lines()
+            self._max_len = doc.maxLength()
+            self._tail_state = doc.endState()
+            return doc.anchors()
         except Exception:
+            self._logger.exception("_parse_anchors: cannot parse rich text")
             self._parsed_lines = None
-            anchors = []
-        return anchors
+            return []
 
     def _visible_row_count(self):
         return max(1, getattr(self, "_preferred_rows", 6))
@@ -331,10 +259,11 @@ class YRichTextCurses(YWidget):
             inner_w = max(1, width)
             inner_h = max(1, height)
 
-            # obtain lines (prefer parsed rich lines if available)
-            lines = self._parsed_lines if (not self._plain and getattr(self, '_parsed_lines', None)) else self._lines()
+            # parsed lines and their metrics are cached per text (_content())
+            content = self._content()
+            lines = content['lines']
             total_rows = len(lines)
-            max_row_len = max(len(row) for row in lines) if lines else 0
+            max_row_len = content['max_len']
 
             # reserve rightmost column for vertical scrollbar, bottom row for horizontal scrollbar
             bar_w = 1 if inner_w > 2 and max_row_len > inner_w else 0            
@@ -348,7 +277,7 @@ class YRichTextCurses(YWidget):
             self._last_width = width
 
             # draw content with horizontal scrolling
-            segmented = bool(lines and isinstance(lines[0], list))
+            segmented = content['segmented']
             for i in range(visible):
                 idx = self._scroll_offset + i
                 if idx >= total_rows:
@@ -374,13 +303,7 @@ class YRichTextCurses(YWidget):
                         segment = txt[start_col:end_col]
                         if is_heading:
                             # bold + red for headings
-                            a = attr_default
-                            red_pid = self._get_named_color_pair('red')
-                            if red_pid is not None:
-                                try:
-                                    a |= curses.color_pair(red_pid)
-                                except Exception:
-                                    pass
+                            a = attr_default | color_pair('red')
                             window.addstr(inner_y + i, inner_x, segment.ljust(content_w), a)
                         else:
                             window.addstr(inner_y + i, inner_x, segment.ljust(content_w), attr_default)
@@ -412,35 +335,15 @@ class YRichTextCurses(YWidget):
                             a = attr_default
                             if is_heading:
                                 # headings: bold + red
-                                red_pid = self._get_named_color_pair('red')
-                                if red_pid is not None:
-                                    try:
-                                        a |= curses.color_pair(red_pid)
-                                    except Exception:
-                                        pass
+                                a |= color_pair('red')
                             else:
                                 # unify bold/italic/underline and anchors to bold gray
                                 if seg.get('bold') or seg.get('italic') or seg.get('underline') or seg.get('anchor'):
-                                    a |= curses.A_BOLD
-                                    gray_pid = self._get_named_color_pair('gray')
-                                    if gray_pid is not None:
-                                        try:
-                                            a |= curses.color_pair(gray_pid)
-                                        except Exception:
-                                            pass
+                                    a |= curses.A_BOLD | color_pair('gray')
                                 else:
                                     # optional explicit color spans for normal text
-                                    self._ensure_color_pairs()
-                                    color_id = None
-                                    if isinstance(seg.get('color'), int):
-                                        color_id = seg.get('color')
-                                    elif seg.get('color'):
-                                        color_id = self._get_named_color_pair(seg.get('color'))
-                                    if color_id is not None:
-                                        try:
-                                            a |= curses.color_pair(color_id)
-                                        except Exception:
-                                            pass
+                                    if seg.get('color'):
+                                        a |= color_pair(seg.get('color'))
                                 # armed anchor: add reverse for visibility
                                 if seg.get('anchor') and self._armed_index != -1 and 0 <= self._armed_index < len(self._anchors):
                                     a_active = self._anchors[self._armed_index]
@@ -485,7 +388,7 @@ class YRichTextCurses(YWidget):
                     for c in range(content_w):
                         window.addch(inner_y + content_h, inner_x + c, '-')
                     # slider position relative to max line length
-                    maxlen = max((len(l) for l in lines), default=0)
+                    maxlen = max_row_len
                     if maxlen > content_w:
                         hpos = int((self._hscroll_offset / max(1, maxlen - content_w)) * (content_w - 1))
                         hpos = max(0, min(content_w - 1, hpos))
@@ -499,7 +402,8 @@ class YRichTextCurses(YWidget):
         if not self._focused or not self.isEnabled() or not self.visible():
             return False
         handled = True
-        lines = self._parsed_lines if (not self._plain and getattr(self, '_parsed_lines', None)) else self._lines()
+        content = self._content()
+        lines = content['lines']
         if key == curses.KEY_UP:
             if self._anchors:
                 if self._armed_index > 0:
@@ -541,7 +445,7 @@ class YRichTextCurses(YWidget):
                     self._hover_line = a['sline']
                     self._ensure_anchor_visible(a)
             else:
-                maxlen = max((len(l) for l in lines), default=0)
+                maxlen = content['max_len']
                 if maxlen > self._hscroll_offset:
                     self._hscroll_offset = min(maxlen, self._hscroll_offset + max(1, (self._visible_row_count() // 2)))
         elif key == curses.KEY_PPAGE:
@@ -570,6 +474,8 @@ class YRichTextCurses(YWidget):
                             dlg._post_event(YMenuEvent(item=None, id=url))
                 else:
                     line = lines[self._hover_line] if 0 <= self._hover_line < len(lines) else ""
+                    if content['segmented']:
+                        line = "".join(seg.get('text', '') for seg in line)
                     m = re.search(r"https?://\S+", line)
                     if m:
                         url = m.group(0)
@@ -628,84 +534,6 @@ class YRichTextCurses(YWidget):
         except Exception:
             pass
 
-    def _ensure_color_pairs(self):
-        try:
-            if self._color_link is not None and self._color_link_armed is not None:
-                return
-            if curses.has_colors():
-                try:
-                    curses.start_color()
-                    # prefer default background where supported
-                    if hasattr(curses, 'use_default_colors'):
-                        try:
-                            curses.use_default_colors()
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                pid_link = 10
-                pid_link_armed = 11
-                try:
-                    curses.init_pair(pid_link, curses.COLOR_BLUE, -1)
-                    self._color_link = pid_link
-                except Exception:
-                    self._color_link = None
-                try:
-                    curses.init_pair(pid_link_armed, curses.COLOR_CYAN, -1)
-                    self._color_link_armed = pid_link_armed
-                except Exception:
-                    self._color_link_armed = None
-        except Exception:
-            pass
-
-    def _get_named_color_pair(self, name: str):
-        try:
-            if not name:
-                return None
-            if not curses.has_colors():
-                self._logger.debug("_get_named_color_pair: terminal has no color support")
-                return None
-            # normalize name
-            nm = str(name).strip().lower()
-            # map common color names
-            cmap = {
-                'black': curses.COLOR_BLACK,
-                'red': curses.COLOR_RED,
-                'green': curses.COLOR_GREEN,
-                'yellow': curses.COLOR_YELLOW,
-                'blue': curses.COLOR_BLUE,
-                'magenta': curses.COLOR_MAGENTA,
-                'purple': curses.COLOR_MAGENTA,
-                'cyan': curses.COLOR_CYAN,
-                'white': curses.COLOR_WHITE,
-                'gray': curses.COLOR_WHITE,
-                'grey': curses.COLOR_WHITE,
-            }
-            fg = cmap.get(nm)
-            if fg is None:
-                return None
-            # reuse if exists
-            if nm in self._named_color_pairs:
-                return self._named_color_pairs[nm]
-            # init colors if needed
-            try:
-                curses.start_color()
-                if hasattr(curses, 'use_default_colors'):
-                    curses.use_default_colors()
-            except Exception:
-                pass
-            pid = self._next_color_pid
-            # advance, avoid collisions with link pairs
-            self._next_color_pid = pid + 1
-            try:
-                curses.init_pair(pid, fg, -1)
-                self._named_color_pairs[nm] = pid
-                return pid
-            except Exception:
-                return None
-        except Exception:
-            return None
-
     def setVisible(self, visible=True):
         super().setVisible(visible)
         self._can_focus = visible
\ No newline at end of file
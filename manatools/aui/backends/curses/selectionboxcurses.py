@@ -379,6 +379,55 @@ class YSelectionBoxCurses(YSelectionWidget):
         except Exception:
             pass
 
+    def _refresh_item(self, item, what):
+        """Rows are drawn from the items; only the cached value may be stale."""
+        self._value = self._selected_items[0].label() if self._selected_items else ""
+
+    def _remove_rows(self, row, count):
+        """Drop a run of items; hover and scroll stay on the rows they showed."""
+        if self._hover_index >= row + count:
+            self._hover_index -= count
+        elif self._hover_index >= row:
+            self._hover_index = row
+        if self._scroll_offset >= row + count:
+            self._scroll_offset -= count
+        elif self._scroll_offset > row:
+            self._scroll_offset = row
+        self._delete_run(None, row, count)
+
+    def _rows_removed(self, first, gone):
+        super()._rows_removed(first, gone)
+        self._value = self._selected_items[0].label() if self._selected_items else ""
+        self._hover_index = min(self._hover_index, max(0, len(self._items) - 1))
+        self._ensure_hover_visible()
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
+        except Exception:
+            pass
+
+    def _apply_item_diff(self, diff):
+        """Swap in the setItems() result, keeping hover item and scroll position."""
+        hover = diff.oldToNew.get(self._hover_index)
+        selected = self._replace_items(diff)
+        if not self._multi_selection and len(selected) > 1:
+            for it in selected[:-1]:
+                it.setSelected(False)
+            selected = selected[-1:]
+        self._selected_items = selected
+        self._value = selected[0].label() if selected else ""
+        if hover is None:
+            hover = min(self._hover_index, max(0, len(self._items) - 1))
+        self._hover_index = hover
+        self._ensure_hover_visible()
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
+        except Exception:
+            pass
+
     def setVisible(self, visible=True):
         super().setVisible(visible)
         # in curses backend visibility controls whether widget can receive focus
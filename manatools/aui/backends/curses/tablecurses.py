@@ -34,6 +34,8 @@ class YTableCurses(YSelectionWidget):
     - Selection driven by `YTableItem.selected()`; emits SelectionChanged on change.
     - SPACE toggles the first checkbox column for the current row and emits ValueChanged.
     - ENTER toggles row selection (multi or single as configured).
+    - Digit keys 1-9 sort by that column (again to reverse); the previous
+      sort columns break ties.  The header marks the primary one with ▲/▼.
     """
     def __init__(self, parent=None, header: YTableHeader = None, multiSelection: bool = False):
         super().__init__(parent)
@@ -72,6 +74,18 @@ class YTableCurses(YSelectionWidget):
         # once from the header so that _draw() avoids repeated method calls inside
         # the inner visible-row × column loop.
         self._col_meta: list = []
+        # Rendered-line caches for _draw(): item -> (marked, padded row text)
+        # for the rows drawn in the last frame, valid for _row_cache_width;
+        # _header_cache is (key, header line).  Unchanged rows are then only
+        # re-emitted, and ncurses sends just the lines that differ.
+        self._row_cache: dict = {}
+        self._row_cache_width = None
+        self._header_cache = None
+        # setFilter() state: _rows is the filtered item list shown instead of
+        # _items (None while no filter is set)
+        self._filter = YTableFilter()
+        self._rows = None
+        self._sort = YTableSort()
         # widget position
         self._x = 0
         self._y = 0
@@ -154,6 +168,7 @@ class YTableCurses(YSelectionWidget):
         # Pre-build column metadata so _draw() does not call header methods per row.
         self._col_meta = self._build_col_meta()
         self._col_width_cache = None
+        self._invalidate_rows()
         self._logger.debug(
             "_create_backend_widget: items=%d selected=%d col_meta=%d",
             len(self._items) if self._items else 0,
@@ -181,6 +196,10 @@ class YTableCurses(YSelectionWidget):
         except Exception:
             pass
 
+    def _shown_items(self):
+        """Items currently listed, in display order (hover_row indexes this)."""
+        return self._items if self._rows is None else self._rows
+
     def _visible_row_count(self):
         # number of rows available excluding the header line
         return max(1, getattr(self, "_preferred_rows", 6))
@@ -232,6 +251,70 @@ class YTableCurses(YSelectionWidget):
         else:
             return s.ljust(width)
 
+    def _header_line(self, widths, sep, use_selection_marker):
+        """Return the aligned header line, with the sort indicator."""
+        headers = []
+        sort_keys = self._sort.keys()
+        try:
+            for c in range(self._header.columns()):
+                lbl = self._header.header(c)
+                if sort_keys and sort_keys[0][0] == c:
+                    lbl = f"{lbl} {'▲' if sort_keys[0][1] else '▼'}"
+                align = self._header.alignment(c)
+                headers.append(self._align_text(lbl, widths[c], align))
+        except Exception:
+            # fallback single empty header
+            headers = [" ".ljust(widths[0])]
+        header_line = (" " * sep).join(headers)
+        if use_selection_marker:
+            header_line = "    " + header_line
+        return header_line
+
+    def _render_row(self, it, widths, sep, marked):
+        """Return the text of one row: aligned cells, optional selection marker."""
+        cells = []
+        # Use precomputed column metadata to avoid header method calls
+        # inside the per-column loop.
+        col_meta = self._col_meta if self._col_meta else self._build_col_meta()
+        for c in range(len(widths)):
+            try:
+                cell = it.cell(c)
+            except Exception:
+                cell = None
+            if c < len(col_meta):
+                is_cb, align = col_meta[c]
+            else:
+                is_cb = False
+                align = YAlignmentType.YAlignBegin
+            if is_cb:
+                val = False
+                try:
+                    val = cell.checked() if cell is not None else False
+                except Exception:
+                    val = False
+                txt = "[x]" if val else "[ ]"
+            else:
+                txt = ""
+                try:
+                    txt = cell.label() if cell is not None else ""
+                except Exception:
+                    txt = ""
+            cells.append(self._align_text(txt, widths[c], align))
+        row_text = (" " * sep).join(cells)
+        if marked is not None:
+            # selection marker for multi-selection without checkbox columns
+            row_text = ("[x] " if marked else "[ ] ") + row_text
+        return row_text
+
+    def _invalidate_rows(self, items=None):
+        """Drop the cached rendering of *items* (all rows when None)."""
+        if items is None:
+            self._row_cache = {}
+            self._header_cache = None
+            return
+        for it in items:
+            self._row_cache.pop(it, None)
+
     def _draw(self, window, y, x, width, height):
         if self._visible is False:
             return
@@ -239,24 +322,17 @@ class YTableCurses(YSelectionWidget):
             line = y
             # Header
             widths, sep = self._col_widths(width)
-            headers = []
-            try:
-                for c in range(self._header.columns()):
-                    lbl = self._header.header(c)
-                    align = self._header.alignment(c)
-                    headers.append(self._align_text(lbl, widths[c], align))
-            except Exception:
-                # fallback single empty header
-                headers = [" ".ljust(widths[0])]
-            header_line = (" " * sep).join(headers)
             # If multi-selection without checkbox columns, reserve left space for selection marker
             use_selection_marker = False
             try:
                 use_selection_marker = self._multi and (self._first_checkbox_col() is None)
             except Exception:
                 use_selection_marker = False
-            if use_selection_marker:
-                header_line = "    " + header_line
+            header_key = (width, tuple(self._sort.keys()), use_selection_marker)
+            if self._header_cache is None or self._header_cache[0] != header_key:
+                self._header_cache = (header_key,
+                                      self._header_line(widths, sep, use_selection_marker))
+            header_line = self._header_cache[1]
             self._x = x
             self._y = line
             try:
@@ -266,72 +342,51 @@ class YTableCurses(YSelectionWidget):
             line += 1
 
             # Rows
+            rows = self._shown_items()
             available_rows = max(0, height - 1)
-            visible = min(len(self._items), available_rows)
+            visible = min(len(rows), available_rows)
             if self.stretchable(YUIDimension.YD_VERT):
-                visible = min(len(self._items), available_rows)
+                visible = min(len(rows), available_rows)
             else:
-                visible = min(len(self._items), self._visible_row_count(), available_rows)
+                visible = min(len(rows), self._visible_row_count(), available_rows)
             self._current_visible_rows = visible
 
+            # Rows keep their rendered text while their cells, their marker
+            # and the width stay the same: moving the cursor or scrolling by
+            # one line renders at most the rows that came into view.
+            cache = self._row_cache if self._row_cache_width == width else {}
+            drawn = {}
             for i in range(visible):
                 row_idx = self._scroll_offset + i
-                if row_idx >= len(self._items):
+                if row_idx >= len(rows):
                     break
-                it = self._items[row_idx]
-                cells = []
-                # Use precomputed column metadata to avoid header method calls
-                # inside the inner visible-row × column loop.
-                col_meta = self._col_meta if self._col_meta else self._build_col_meta()
-                for c in range(len(widths)):
-                    try:
-                        cell = it.cell(c)
-                    except Exception:
-                        cell = None
-                    if c < len(col_meta):
-                        is_cb, align = col_meta[c]
-                    else:
-                        is_cb = False
-                        align = YAlignmentType.YAlignBegin
-                    if is_cb:
-                        val = False
-                        try:
-                            val = cell.checked() if cell is not None else False
-                        except Exception:
-                            val = False
-                        txt = "[x]" if val else "[ ]"
-                    else:
-                        txt = ""
-                        try:
-                            txt = cell.label() if cell is not None else ""
-                        except Exception:
-                            txt = ""
-                    cells.append(self._align_text(txt, widths[c], align))
-                row_text = (" " * sep).join(cells)
-                # selection marker for multi-selection without checkbox columns
-                if use_selection_marker:
-                    try:
-                        # _selected_set gives O(1) membership test vs O(N) list scan.
-                        marker = "[x] " if (it in self._selected_set) else "[ ] "
-                    except Exception:
-                        marker = "[ ] "
-                    row_text = marker + row_text
+                it = rows[row_idx]
+                # _selected_set gives O(1) membership test vs O(N) list scan.
+                marked = (it in self._selected_set) if use_selection_marker else None
+                entry = cache.get(it)
+                if entry is None or entry[0] != marked:
+                    entry = (marked,
+                             self._render_row(it, widths, sep, marked)[:width].ljust(width))
+                drawn[it] = entry
+                row_text = entry[1]
                 attr = curses.A_NORMAL
                 if not self.isEnabled():
                     attr |= curses.A_DIM
                 if self._focused and row_idx == self._hover_row and self.isEnabled():
                     attr |= curses.A_REVERSE
                 try:
-                    window.addstr(line + i, x, row_text[:width].ljust(width), attr)
+                    window.addstr(line + i, x, row_text, attr)
                 except curses.error:
                     pass
+            self._row_cache = drawn
+            self._row_cache_width = width
 
             # simple scroll indicators
-            if self._focused and len(self._items) > visible and width > 0 and self.isEnabled():
+            if self._focused and len(rows) > visible and width > 0 and self.isEnabled():
                 try:
                     if self._scroll_offset > 0:
                         window.addch(y + 1, x + width - 1, '↑', curses.A_REVERSE)
-                    if (self._scroll_offset + visible) < len(self._items):
+                    if (self._scroll_offset + visible) < len(rows):
                         window.addch(y + visible, x + width - 1, '↓', curses.A_REVERSE)
                 except curses.error:
                     pass
@@ -342,12 +397,13 @@ class YTableCurses(YSelectionWidget):
         if not self._focused or not self.isEnabled() or not self.visible():
             return False
         handled = True
+        rows = self._shown_items()
         if key == curses.KEY_UP:
             if self._hover_row > 0:
                 self._hover_row -= 1
                 self._ensure_hover_visible()
         elif key == curses.KEY_DOWN:
-            if self._hover_row < max(0, len(self._items) - 1):
+            if self._hover_row < max(0, len(rows) - 1):
                 self._hover_row += 1
                 self._ensure_hover_visible()
         elif key == curses.KEY_PPAGE:
@@ -356,18 +412,18 @@ class YTableCurses(YSelectionWidget):
             self._ensure_hover_visible()
         elif key == curses.KEY_NPAGE:
             step = self._visible_row_count() or 1
-            self._hover_row = min(max(0, len(self._items) - 1), self._hover_row + step)
+            self._hover_row = min(max(0, len(rows) - 1), self._hover_row + step)
             self._ensure_hover_visible()
         elif key == curses.KEY_HOME:
             self._hover_row = 0
             self._ensure_hover_visible()
         elif key == curses.KEY_END:
-            self._hover_row = max(0, len(self._items) - 1)
+            self._hover_row = max(0, len(rows) - 1)
             self._ensure_hover_visible()
         elif key in (ord(' '),):  # toggle checkbox or selection if no checkbox columns
             col = self._first_checkbox_col()
-            if 0 <= self._hover_row < len(self._items):
-                it = self._items[self._hover_row]
+            if 0 <= self._hover_row < len(rows):
+                it = rows[self._hover_row]
                 if col is not None:
                     # Toggle checkbox value
                     cell = None
@@ -381,6 +437,7 @@ class YTableCurses(YSelectionWidget):
                             self._changed_item = it
                         except Exception:
                             pass
+                        self._invalidate_rows([it])
                         # notify value changed
                         if self.notify():
                             dlg = self.findDialog()
@@ -412,9 +469,21 @@ class YTableCurses(YSelectionWidget):
                             dlg = self.findDialog()
                             if dlg is not None:
                                 dlg._post_event(YWidgetEvent(self, YEventReason.SelectionChanged))
+        elif ord('1') <= key <= ord('9'):  # sort by column
+            column = key - ord('1')
+            try:
+                columns = int(self._header.columns())
+            except Exception:
+                columns = 0
+            if column >= columns:
+                return False
+            keys = self._sort.keys()
+            ascending = not keys[0][1] if keys and keys[0][0] == column else True
+            self._sort.clickColumn(column, ascending)
+            self._apply_sort()
         elif key in (ord('\n'),):  # toggle row selection
-            if 0 <= self._hover_row < len(self._items):
-                it = self._items[self._hover_row]
+            if 0 <= self._hover_row < len(rows):
+                it = rows[self._hover_row]
                 if self._multi:
                     was_selected = it in self._selected_set
                     if was_selected:
@@ -458,7 +527,8 @@ class YTableCurses(YSelectionWidget):
         return handled
 
     def key_hints(self) -> str:
-        return _("↑↓=Move") + " | " + _("SPACE=Toggle") + " | " + _("ENTER=Select")
+        return (_("↑↓=Move") + " | " + _("SPACE=Toggle") + " | " + _("ENTER=Select")
+                + " | " + _("1-9=Sort"))
 
     # API
     def addItem(self, item):
@@ -471,6 +541,10 @@ class YTableCurses(YSelectionWidget):
             item.setIndex(len(self._items) - 1)
         except Exception:
             pass
+        if self._rows is not None and self._filter.matches(item):
+            self._rows.append(item)
+        if self._sort.keys():
+            self._reposition(item)
         # reflect initial selected flag into internal list
         try:
             if item.selected():
@@ -497,20 +571,27 @@ class YTableCurses(YSelectionWidget):
         More efficient than N addItem() calls because the selection-flag scan
         is done once at the end in a single pass instead of per item.
         """
+        new_items = []
         for item in items:
             if isinstance(item, str):
                 item = YTableItem(item)
             if not isinstance(item, YTableItem):
                 raise TypeError("YTableCurses.addItem expects a YTableItem or string label")
             super().addItem(item)
+            new_items.append(item)
             try:
                 item.setIndex(len(self._items) - 1)
             except Exception:
                 pass
-        # Single-pass selection sync from model flags.
+        if self._rows is not None:
+            self._rows.extend(self._filter.filterItems(new_items))
+        if self._sort.keys() and new_items:
+            self._apply_sort()
+        # Single-pass selection sync from the new items' flags (the existing
+        # selection is already in _selected_items).
         try:
             if self._multi:
-                for it in list(getattr(self, '_items', []) or []):
+                for it in new_items:
                     try:
                         if it.selected() and it not in self._selected_set:
                             self._selected_items.append(it)
@@ -520,7 +601,7 @@ class YTableCurses(YSelectionWidget):
             else:
                 # Last item marked selected wins in single-selection mode.
                 chosen = None
-                for it in reversed(list(getattr(self, '_items', []) or [])):
+                for it in reversed(new_items):
                     try:
                         if it.selected():
                             chosen = it
@@ -566,7 +647,7 @@ class YTableCurses(YSelectionWidget):
                 pass
         # move hover to this item if present
         try:
-            for i, it in enumerate(list(getattr(self, '_items', []) or [])):
+            for i, it in enumerate(self._shown_items()):
                 if it is item:
                     self._hover_row = i
                     self._ensure_hover_visible()
@@ -586,6 +667,183 @@ class YTableCurses(YSelectionWidget):
             self._scroll_offset = 0
             self._current_visible_rows = None
             self._changed_item = None
+            self._filter.invalidate()
+            self._invalidate_rows()
+            if self._rows is not None:
+                self._rows = []
+        except Exception:
+            pass
+
+    def _remove_item_runs(self, runs, gone):
+        """Drop the removed rows, keeping the hovered row when it stays."""
+        rows = self._shown_items()
+        hovered = rows[self._hover_row] if 0 <= self._hover_row < len(rows) else None
+        self._delete_runs(runs)
+        if self._rows is not None:
+            self._rows = [it for it in self._rows if it not in gone]
+        self._selected_set.difference_update(gone)
+        self._invalidate_rows(gone)
+        for it in gone:
+            self._filter.invalidate(it)
+        if self._changed_item in gone:
+            self._changed_item = None
+        first = min((row for row, _count in runs.get(None, [])), default=len(self._items))
+        for row in range(first, len(self._items)):
+            self._items[row].setIndex(row)
+        rows = self._shown_items()
+        if hovered is not None and hovered not in gone:
+            try:
+                self._hover_row = rows.index(hovered)
+            except ValueError:
+                pass
+        self._hover_row = min(self._hover_row, max(0, len(rows) - 1))
+        self._scroll_offset = min(self._scroll_offset, self._hover_row)
+        self._ensure_hover_visible()
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
+        except Exception:
+            pass
+
+    def _apply_item_diff(self, diff):
+        """Swap in the setItems() result, keeping hover row and scroll position.
+
+        With an active sort the new rows are sorted too.
+        """
+        rows = self._shown_items()
+        hovered = rows[self._hover_row] if 0 <= self._hover_row < len(rows) else None
+        hover = None
+        if self._rows is None and not self._sort.keys():
+            hover = diff.oldToNew.get(self._hover_row)
+        self._filter.carryOver(diff)
+        self._invalidate_rows()
+        selected = self._replace_items(diff)
+        if self._sort.keys():
+            self._items[:] = self._sort.sorted(self._items)
+        if self._rows is not None:
+            self._rows = self._filter.filterItems(self._items)
+        if hover is None:
+            new_hovered = dict(diff.pairs).get(hovered)
+            if new_hovered is not None and (self._rows is None or self._filter.matches(new_hovered)):
+                hover = self._shown_items().index(new_hovered)
+        if not self._multi:
+            selected = selected[-1:]
+        self._selected_items = selected
+        self._selected_set = set(selected)
+        if self._changed_item is not None:
+            self._changed_item = dict(diff.pairs).get(self._changed_item)
+        if hover is None:
+            hover = min(self._hover_row, max(0, len(self._shown_items()) - 1))
+        self._hover_row = hover
+        self._ensure_hover_visible()
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
+        except Exception:
+            pass
+
+    def _refresh_item(self, item, what):
+        """Re-render and re-index an edited row, showing or hiding it for the
+        current filter and moving it to its place in the current sort."""
+        self._invalidate_rows([item])
+        self._filter.invalidate(item)
+        if self._rows is not None and (item in self._rows) != self._filter.matches(item):
+            self._apply_filter(YTableFilter.DIFFERENT)
+        if ("cell" in what or "label" in what) and self._sort.keys():
+            self._reposition(item)
+
+    def _reposition(self, item):
+        """Move *item* to its sorted place in _items and the shown rows,
+        keeping the hovered row."""
+        rows = self._shown_items()
+        hovered = rows[self._hover_row] if 0 <= self._hover_row < len(rows) else None
+        for seq in (self._items, self._rows):
+            if seq is None:
+                continue
+            try:
+                seq.remove(item)
+            except ValueError:
+                continue
+            seq.insert(self._sort.insertPosition(seq, item), item)
+        if hovered is not None:
+            try:
+                self._hover_row = self._shown_items().index(hovered)
+            except ValueError:
+                pass
+            self._ensure_hover_visible()
+
+    def setFilter(self, text="", columns=None, mode="substring"):
+        """Show only the rows matching *text* (see YTableFilter); "" shows all.
+
+        *columns* restricts matching to the given column numbers; *mode* is
+        "substring", "prefix" or "regex".  Hidden rows keep their selection.
+        """
+        change = self._filter.setFilter(text, columns, mode)
+        if change != YTableFilter.UNCHANGED:
+            self._apply_filter(change)
+
+    def filterText(self) -> str:
+        return self._filter.text()
+
+    def sortByColumns(self, keys):
+        """Sort rows by several columns: *keys* lists column numbers or
+        (column, ascending) pairs, primary first; [] keeps the current order."""
+        self._sort.setKeys(keys)
+        if self._sort.keys():
+            self._apply_sort()
+
+    def sortColumns(self) -> list:
+        """Return the current sort columns as [(column, ascending)], primary first."""
+        return self._sort.keys()
+
+    def _apply_sort(self):
+        """Reorder _items (and the filtered rows) by the sort keys, keeping the hovered row."""
+        rows = self._shown_items()
+        hovered = rows[self._hover_row] if 0 <= self._hover_row < len(rows) else None
+        self._items[:] = self._sort.sorted(self._items)
+        if self._rows is not None:
+            # a stable sort of the shown rows equals filtering the sorted items
+            self._rows = self._sort.sorted(self._rows)
+        if hovered is not None:
+            try:
+                self._hover_row = self._shown_items().index(hovered)
+            except ValueError:
+                self._hover_row = 0
+            self._ensure_hover_visible()
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
+        except Exception:
+            pass
+
+    def _apply_filter(self, change):
+        """Recompute the shown rows, keeping the hovered one when it still matches."""
+        rows = self._shown_items()
+        hovered = rows[self._hover_row] if 0 <= self._hover_row < len(rows) else None
+        if not self._filter.isActive():
+            self._rows = None
+        elif change == YTableFilter.STRICTER and self._rows is not None:
+            # a stricter filter only needs to re-test the rows shown now
+            self._rows = self._filter.filterItems(self._rows)
+        else:
+            self._rows = self._filter.filterItems(self._items)
+        rows = self._shown_items()
+        self._hover_row = 0
+        if hovered is not None and self._filter.matches(hovered):
+            try:
+                self._hover_row = rows.index(hovered)
+            except ValueError:
+                pass
+        if self._hover_row == 0:
+            self._scroll_offset = 0
+        self._ensure_hover_visible()
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
         except Exception:
             pass
 
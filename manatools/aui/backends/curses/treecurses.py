@@ -53,6 +53,9 @@ class YTreeCurses(YSelectionWidget):
         self._hover_index = 0
         self._scroll_offset = 0
         self._visible_items = []
+        # item -> row in _visible_items, rebuilt on demand after the rows
+        # moved (None); see _visible_row()
+        self._visible_pos = None
         self._selected_items = []
         self._last_selected_ids = set()
         self._suppress_selection_handler = False
@@ -111,7 +114,9 @@ class YTreeCurses(YSelectionWidget):
         finally:
             try:
                 # mark rebuild so new items are visible without waiting for external trigger
-                self._rebuildTree()
+                # (once at the end of an enclosing batchUpdate())
+                if not self._defer_to_batch_end(self._rebuildTree):
+                    self._rebuildTree()
             except Exception:
                 pass
 
@@ -130,26 +135,67 @@ class YTreeCurses(YSelectionWidget):
         finally:
             try:
                 # mark rebuild so new items are visible without waiting for external trigger
-                self._rebuildTree()
+                # (once at the end of an enclosing batchUpdate())
+                if not self._defer_to_batch_end(self._rebuildTree):
+                    self._rebuildTree()
             except Exception:
                 pass
 
-    def removeItem(self, item):
-        """Remove item from internal list and rebuild."""
+    def _append_items(self, items):
+        """Append one addItemsAsync() chunk: new roots come last in the
+        flattened tree, so only their visible rows are computed."""
+        new_items = []
+        for item in items:
+            if isinstance(item, str):
+                item = YTreeItem(item)
+            super().addItem(item)
+            new_items.append(item)
+        has_selected = False
+        stack = list(new_items)
+        while stack and not has_selected:
+            n = stack.pop()
+            has_selected = n.selected()
+            stack.extend(getattr(n, "_children", []) or [])
+        if has_selected:
+            # opens ancestors and applies single-selection rules
+            self._rebuildTree()
+            return
+        if self._visible_pos is not None:
+            base = len(self._visible_items)
+            new_rows = self._visible_rows(new_items, 0)
+            for i, (n, _d) in enumerate(new_rows):
+                self._visible_pos[n] = base + i
+            self._visible_items.extend(new_rows)
+        else:
+            self._visible_items.extend(self._visible_rows(new_items, 0))
+
+    def _remove_item_runs(self, runs, gone):
+        """Drop the visible rows of the removed subtrees, keeping the hovered
+        node when it stays (no re-flattening of the whole tree)."""
+        hover_item = None
         try:
-            try:
-                super().removeItem(item)
-            except Exception:
-                if hasattr(self, "_items") and item in self._items:
-                    try:
-                        self._items.remove(item)
-                    except Exception:
-                        pass
-        finally:
-            try:
-                self._rebuildTree()
-            except Exception:
-                pass
+            hover_item = self._visible_items[self._hover_index][0]
+        except Exception:
+            pass
+        self._delete_runs(runs)
+        self._visible_items = [(n, d) for n, d in self._visible_items if n not in gone]
+        self._visible_pos = None
+        self._last_selected_ids = set(id(i) for i in self._selected_items)
+        first = min((row for row, _count in runs.get(None, [])), default=len(self._items))
+        for row in range(first, len(self._items)):
+            self._items[row].setIndex(row)
+        if hover_item is not None and hover_item not in gone:
+            row = self._visible_row(hover_item)
+            if row is not None:
+                self._hover_index = row
+        self._hover_index = min(self._hover_index, max(0, len(self._visible_items) - 1))
+        self._ensure_hover_visible()
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
+        except Exception:
+            pass
 
     def deleteAllItems(self):
         """Clear model and all internal state for this tree."""
@@ -177,6 +223,46 @@ class YTreeCurses(YSelectionWidget):
             pass
         self._suppress_selection_handler = False
 
+    def _apply_item_diff(self, diff):
+        """Swap in the setItems() result and recompute the visible rows once.
+
+        Selection and open state were carried over by the diff; the hovered
+        node keeps the hover when it still exists.
+        """
+        hover_item = None
+        try:
+            hover_item = self._visible_items[self._hover_index][0]
+        except Exception:
+            pass
+        mapping = dict(diff.allPairs())
+        self._replace_items(diff)
+        self._last_selected_ids = set()
+        self._rebuildTree()
+        new_hover = mapping.get(hover_item)
+        if new_hover is not None:
+            row = self._visible_row(new_hover)
+            if row is not None:
+                self._hover_index = row
+                self._ensure_hover_visible()
+        try:
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg.mark_dirty()
+        except Exception:
+            pass
+
+    def _refresh_item(self, item, what):
+        """Rows are drawn straight from the items; only new children change
+        the visible rows, and only those below *item* when it is open."""
+        if "children" not in what or not getattr(item, "_is_open", False):
+            return
+        row = self._visible_row(item)
+        if row is None:
+            return
+        self._collapse_rows(row)
+        self._expand_rows(row)
+        self._ensure_hover_visible()
+
     def _collect_all_descendants(self, item):
         out = []
         stack = []
@@ -218,25 +304,83 @@ class YTreeCurses(YSelectionWidget):
                     _clear(chs)
         _clear(roots)
 
-    def _flatten_visible(self):
-        """Produce self._visible_items = [(item, depth), ...] following _is_open flags."""
-        self._visible_items = []
-        def _visit(nodes, depth=0):
+    def _visible_rows(self, nodes, depth):
+        """Return [(item, depth), ...] for *nodes* and their descendants that
+        open ancestors make visible, in display order."""
+        rows = []
+        def _visit(nodes, depth):
             for n in nodes:
-                self._visible_items.append((n, depth))
+                rows.append((n, depth))
                 try:
                     is_open = bool(getattr(n, "_is_open", False))
                 except Exception:
                     is_open = False
                 if is_open:
-                    try:
-                        childs = callable(getattr(n, "children", None)) and n.children() or getattr(n, "_children", []) or []
-                    except Exception:
-                        childs = getattr(n, "_children", []) or []
+                    childs = getattr(n, "_children", []) or []
                     if childs:
                         _visit(childs, depth + 1)
-        roots = list(getattr(self, "_items", []) or [])
-        _visit(roots, 0)
+        _visit(nodes, depth)
+        return rows
+
+    def _flatten_visible(self):
+        """Produce self._visible_items = [(item, depth), ...] following _is_open flags."""
+        self._visible_items = self._visible_rows(list(getattr(self, "_items", []) or []), 0)
+        self._visible_pos = None
+
+    def _visible_row(self, item):
+        """Return the row of *item* in _visible_items, or None when hidden."""
+        if self._visible_pos is None:
+            self._visible_pos = {n: i for i, (n, _d) in enumerate(self._visible_items)}
+        return self._visible_pos.get(item)
+
+    def _expand_rows(self, row):
+        """Splice the visible descendants of the open node at *row* in below
+        it; costs time proportional to the rows inserted."""
+        item, depth = self._visible_items[row]
+        new_rows = self._visible_rows(getattr(item, "_children", []) or [], depth + 1)
+        if not new_rows:
+            return
+        self._visible_items[row + 1:row + 1] = new_rows
+        self._visible_pos = None
+        if self._hover_index > row:
+            self._hover_index += len(new_rows)
+
+    def _collapse_rows(self, row):
+        """Cut the rows below the node at *row* that belong to its subtree;
+        costs time proportional to the rows removed."""
+        depth = self._visible_items[row][1]
+        end = row + 1
+        total = len(self._visible_items)
+        while end < total and self._visible_items[end][1] > depth:
+            end += 1
+        if end == row + 1:
+            return
+        del self._visible_items[row + 1:end]
+        self._visible_pos = None
+        if self._hover_index >= end:
+            self._hover_index -= end - row - 1
+        elif self._hover_index > row:
+            self._hover_index = row
+
+    def _open_ancestors(self, item):
+        """Open the closed ancestors of *item* and splice the rows they
+        reveal into _visible_items."""
+        chain = []
+        parent = getattr(item, "_parent_item", None)
+        while parent is not None:
+            chain.append(parent)
+            parent = getattr(parent, "_parent_item", None)
+        top = None
+        for parent in reversed(chain):
+            if not getattr(parent, "_is_open", False):
+                if top is None:
+                    top = parent
+                parent.setOpen(True)
+        if top is None:
+            return
+        row = self._visible_row(top)
+        if row is not None:
+            self._expand_rows(row)
 
     def rebuildTree(self):
         """RebuildTree to maintain compatibility."""
@@ -244,164 +388,58 @@ class YTreeCurses(YSelectionWidget):
         self._rebuildTree()
 
     def _rebuildTree(self):
-        """Recompute visible items and restore selection from item.selected() or last_selected_ids.
+        """Recompute visible items and restore selection from item.selected().
 
-        Ensures ancestors of selected items are opened so selections are visible.
+        Ensures ancestors of selected items (or of the last selected ones)
+        are opened so selections are visible.  All nodes are walked once.
         """
-        # preserve items selection if any
         self._suppress_selection_handler = True
         try:
-            # collect all nodes and desired selected ids (from last ids or model flags)
-            def _all_nodes(nodes):
-                out = []
-                for n in nodes:
-                    out.append(n)
-                    try:
-                        chs = callable(getattr(n, "children", None)) and n.children() or getattr(n, "_children", []) or []
-                    except Exception:
-                        chs = getattr(n, "_children", []) or []
-                    if chs:
-                        out.extend(_all_nodes(chs))
-                return out
-            roots = list(getattr(self, "_items", []) or [])
-            all_nodes = _all_nodes(roots)
-
-            selected_ids = set(self._last_selected_ids) if self._last_selected_ids else set()
-            if not selected_ids:
-                for n in all_nodes:
-                    try:
-                        sel = False
-                        if hasattr(n, "selected") and callable(getattr(n, "selected")):
-                            sel = n.selected()
-                        else:
-                            sel = bool(getattr(n, "_selected", False))
-                        if sel:
-                            selected_ids.add(id(n))
-                    except Exception:
-                        pass
+            # one preorder walk: flagged nodes (YTreeItem wins) and the nodes
+            # whose ancestors have to be opened
+            wanted_ids = set(self._last_selected_ids) if self._last_selected_ids else None
+            flagged = []
+            to_open = []
+            stack = list(reversed(list(getattr(self, "_items", []) or [])))
+            while stack:
+                n = stack.pop()
+                try:
+                    sel = bool(n.selected())
+                except Exception:
+                    sel = bool(getattr(n, "_selected", False))
+                if sel:
+                    flagged.append(n)
+                if (id(n) in wanted_ids) if wanted_ids is not None else sel:
+                    to_open.append(n)
+                chs = getattr(n, "_children", []) or []
+                if chs:
+                    stack.extend(reversed(chs))
 
             # open ancestors for any selected node so it becomes visible
-            if selected_ids:
-                for n in list(all_nodes):
+            for n in to_open:
+                parent = getattr(n, "_parent_item", None)
+                while parent is not None:
                     try:
-                        if id(n) in selected_ids:
-                            parent = None
-                            try:
-                                parent = n.parentItem() if callable(getattr(n, 'parentItem', None)) else getattr(n, '_parent_item', None)
-                            except Exception:
-                                parent = getattr(n, '_parent_item', None)
-                            while parent:
-                                try:
-                                    try:
-                                        parent.setOpen(True)
-                                    except Exception:
-                                        setattr(parent, '_is_open', True)
-                                except Exception:
-                                    pass
-                                try:
-                                    parent = parent.parentItem() if callable(getattr(parent, 'parentItem', None)) else getattr(parent, '_parent_item', None)
-                                except Exception:
-                                    break
+                        parent.setOpen(True)
                     except Exception:
-                        pass
+                        setattr(parent, "_is_open", True)
+                    parent = getattr(parent, "_parent_item", None)
 
             # now recompute visible list based on possibly opened parents
             self._flatten_visible()
 
-            # In single-selection mode, clamp desired selection to a single item.
-            if selected_ids and not self._multi:
-                chosen_id = None
-                # Prefer a visible item
-                for itm, _d in self._visible_items:
-                    try:
-                        if id(itm) in selected_ids:
-                            chosen_id = id(itm)
-                            break
-                    except Exception:
-                        pass
-                if chosen_id is None:
-                    try:
-                        # fallback: arbitrary one
-                        chosen_id = next(iter(selected_ids))
-                    except Exception:
-                        chosen_id = None
-                selected_ids = {chosen_id} if chosen_id is not None else set()
-            # collect from items' selected() property only (YTreeItem wins)
-            selected_ids = set()
-            try:
-                def _collect_selected(nodes):
-                    out = []
-                    for n in nodes:
-                        try:
-                            sel = False
-                            if hasattr(n, "selected") and callable(getattr(n, "selected")):
-                                sel = n.selected()
-                            else:
-                                sel = bool(getattr(n, "_selected", False))
-                            if sel:
-                                out.append(n)
-                        except Exception:
-                            pass
-                        try:
-                            chs = callable(getattr(n, "children", None)) and n.children() or getattr(n, "_children", []) or []
-                        except Exception:
-                            chs = getattr(n, "_children", []) or []
-                        if chs:
-                            out.extend(_collect_selected(chs))
-                    return out
-                pre_selected = _collect_selected(list(getattr(self, "_items", []) or []))
-                for p in pre_selected:
-                    selected_ids.add(id(p))
-            except Exception:
-                pass
-            # build logical selected list and last_selected_ids
-            sel_items = []
-            for itm, _d in self._visible_items:
-                try:
-                    if id(itm) in selected_ids:
-                        sel_items.append(itm)
-                except Exception:
-                    pass
-            # also include non-visible selected nodes (descendants) when tracking logic
-            if selected_ids:
-                for n in all_nodes:
-                    if id(n) in selected_ids and n not in sel_items:
-                        sel_items.append(n)
-                # Ensure single-selection list contains only one item
-                if not self._multi and len(sel_items) > 1:
-                    # Prefer the visible one if present
-                    visible_ids = {id(itm) for itm, _d in self._visible_items}
-                    chosen = None
-                    for it in sel_items:
-                        if id(it) in visible_ids:
-                            chosen = it
-                            break
-                    if chosen is None:
-                        chosen = sel_items[0]
-                    sel_items = [chosen]
-            # apply selected flags to items consistently
-            try:
-                # clear all first
-                def _clear(nodes):
-                    for n in nodes:
+            sel_items = flagged
+            if not self._multi and len(sel_items) > 1:
+                # Ensure single-selection list contains only one item,
+                # preferring a visible one
+                chosen = next((it for it in sel_items if self._is_shown(it)), sel_items[0])
+                for it in sel_items:
+                    if it is not chosen:
                         try:
-                            n.setSelected(False)
+                            it.setSelected(False)
                         except Exception:
                             pass
-                        try:
-                            chs = callable(getattr(n, "children", None)) and n.children() or getattr(n, "_children", []) or []
-                        except Exception:
-                            chs = getattr(n, "_children", []) or []
-                        if chs:
-                            _clear(chs)
-                _clear(list(getattr(self, "_items", []) or []))
-            except Exception:
-                pass
-            for it in sel_items:
-                try:
-                    it.setSelected(True)
-                except Exception:
-                    pass
+                sel_items = [chosen]
             self._selected_items = list(sel_items)
             self._last_selected_ids = set(id(i) for i in self._selected_items)
             # ensure hover_index valid
@@ -412,6 +450,16 @@ class YTreeCurses(YSelectionWidget):
             pass
         self._suppress_selection_handler = False
 
+    @staticmethod
+    def _is_shown(item):
+        """True when every ancestor of *item* is open."""
+        parent = getattr(item, "_parent_item", None)
+        while parent is not None:
+            if not getattr(parent, "_is_open", False):
+                return False
+            parent = getattr(parent, "_parent_item", None)
+        return True
+
     def _ensure_hover_visible(self, height=None):
         """Adjust scroll offset so hover visible in given height area (if None use last draw height)."""
         try:
@@ -426,7 +474,9 @@ class YTreeCurses(YSelectionWidget):
         except Exception:
             pass
 
-    def _toggle_expand(self, item):
+    def _toggle_expand(self, item, row=None):
+        """Expand or collapse *item* (shown at *row*, looked up when None):
+        its visible subtree is spliced into or cut out of _visible_items."""
         try:
             self._suppress_selection_handler = True
         except Exception:
@@ -441,12 +491,15 @@ class YTreeCurses(YSelectionWidget):
                     item._is_open = not cur
                 except Exception:
                     pass
-            # preserve selected ids and rebuild
-            try:
-                self._last_selected_ids = set(id(i) for i in getattr(self, "_selected_items", []) or [])
-            except Exception:
-                self._last_selected_ids = set()
-            self._rebuildTree()
+            if row is None or not (0 <= row < len(self._visible_items)) \
+                    or self._visible_items[row][0] is not item:
+                row = self._visible_row(item)
+            if row is not None:
+                if getattr(item, "_is_open", False):
+                    self._expand_rows(row)
+                else:
+                    self._collapse_rows(row)
+                self._ensure_hover_visible(self._height)
         finally:
             try:
                 self._suppress_selection_handler = False
@@ -560,8 +613,6 @@ class YTreeCurses(YSelectionWidget):
 
             # record last draw height for navigation/ensure logic
             self._height = available_rows
-            # rebuild visible items (safe cheap operation)
-            self._flatten_visible()
             total = len(self._visible_items)
             if total == 0:
                 try:
@@ -574,6 +625,7 @@ class YTreeCurses(YSelectionWidget):
             # Clamp scroll/hover to the viewport
             self._ensure_hover_visible(height=self._height)
 
+            selected = set(self._selected_items)
             # Draw only inside the allocated rectangle
             draw_rows = min(available_rows, max(0, total - self._scroll_offset))
             for i in range(draw_rows):
@@ -581,7 +633,7 @@ class YTreeCurses(YSelectionWidget):
                 if idx >= total:
                     break
                 itm, depth = self._visible_items[idx]
-                is_selected = itm in self._selected_items
+                is_selected = itm in selected
                 # expander, text, attrs...
                 try:
                     has_children = bool(getattr(itm, "_children", []) or (callable(getattr(itm, "children", None)) and (itm.children() or [])))
@@ -648,7 +700,7 @@ class YTreeCurses(YSelectionWidget):
             if 0 <= self._hover_index < total:
                 itm, _ = self._visible_items[self._hover_index]
                 # Toggle expand/collapse without changing selection
-                self._toggle_expand(itm)
+                self._toggle_expand(itm, self._hover_index)
         elif key in (ord('\n'),):  # ENTER toggles selection
             if 0 <= self._hover_index < total:
                 itm, _ = self._visible_items[self._hover_index]
@@ -680,6 +732,12 @@ class YTreeCurses(YSelectionWidget):
         if item is None:
             return
         try:
+            # membership is checked on the id set, kept in step with the list,
+            # so bulk selection through _flush_item_changes() stays linear
+            sel_ids = self._last_selected_ids
+            if len(sel_ids) != len(self._selected_items):
+                sel_ids = set(id(i) for i in self._selected_items)
+                self._last_selected_ids = sel_ids
             if selected:
                 if not self._multi:
                     # clear others recursively and select only this one
@@ -695,8 +753,10 @@ class YTreeCurses(YSelectionWidget):
                         except Exception:
                             pass
                     self._selected_items = [item]
+                    sel_ids.clear()
+                    sel_ids.add(id(item))
                 else:
-                    if item not in self._selected_items:
+                    if id(item) not in sel_ids:
                         try:
                             item.setSelected(True)
                         except Exception:
@@ -705,9 +765,10 @@ class YTreeCurses(YSelectionWidget):
                             except Exception:
                                 pass
                         self._selected_items.append(item)
+                        sel_ids.add(id(item))
                     if self._recursive:
                         for d in self._collect_all_descendants(item):
-                            if d not in self._selected_items:
+                            if id(d) not in sel_ids:
                                 try:
                                     d.setSelected(True)
                                 except Exception:
@@ -716,30 +777,28 @@ class YTreeCurses(YSelectionWidget):
                                     except Exception:
                                         pass
                                 self._selected_items.append(d)
+                                sel_ids.add(id(d))
                 # open parents so programmatically selected items are visible
                 try:
-                    parent = item.parentItem() if callable(getattr(item, 'parentItem', None)) else getattr(item, '_parent_item', None)
+                    self._open_ancestors(item)
                 except Exception:
-                    parent = getattr(item, '_parent_item', None)
-                while parent:
-                    try:
-                        try:
-                            parent.setOpen(True)
-                        except Exception:
-                            setattr(parent, '_is_open', True)
-                    except Exception:
-                        pass
-                    try:
-                        parent = parent.parentItem() if callable(getattr(parent, 'parentItem', None)) else getattr(parent, '_parent_item', None)
-                    except Exception:
-                        break
+                    self._flatten_visible()
             else:
                 # deselect
-                if item in self._selected_items:
-                    try:
-                        self._selected_items.remove(item)
-                    except Exception:
-                        pass
+                drop = [item]
+                if self._recursive:
+                    drop.extend(self._collect_all_descendants(item))
+                drop_ids = set(id(d) for d in drop) & sel_ids
+                if drop_ids:
+                    if len(drop_ids) == 1 and id(item) in drop_ids:
+                        try:
+                            self._selected_items.remove(item)
+                        except Exception:
+                            pass
+                    else:
+                        self._selected_items = [i for i in self._selected_items
+                                                if id(i) not in drop_ids]
+                    sel_ids -= drop_ids
                 try:
                     item.setSelected(False)
                 except Exception:
@@ -748,12 +807,7 @@ class YTreeCurses(YSelectionWidget):
                     except Exception:
                         pass
                 if self._recursive:
-                    for d in self._collect_all_descendants(item):
-                        if d in self._selected_items:
-                            try:
-                                self._selected_items.remove(d)
-                            except Exception:
-                                pass
+                    for d in drop[1:]:
                         try:
                             d.setSelected(False)
                         except Exception:
@@ -761,16 +815,7 @@ class YTreeCurses(YSelectionWidget):
                                 setattr(d, "_selected", False)
                             except Exception:
                                 pass
-            # update last ids
-            try:
-                self._last_selected_ids = set(id(i) for i in self._selected_items)
-            except Exception:
-                self._last_selected_ids = set()
-            # after programmatic selection, rebuild visible list to reflect opened parents
-            try:
-                self._rebuildTree()
-            except Exception:
-                pass
+            self._ensure_hover_visible()
         except Exception:
             pass
 
@@ -41,6 +41,8 @@ class YComboBoxGtk(YSelectionWidget):
         self._value = ""
         self._selected_items = []
         self._combo_widget = None
+        # set while the dropdown model or entry text is changed programmatically
+        self._suppress_selection = False
         self._logger = logging.getLogger(f"manatools.aui.gtk.{self.__class__.__name__}")
         # reference to the visible label widget (if any)
         self._label_widget = None
@@ -324,6 +326,8 @@ class YComboBoxGtk(YSelectionWidget):
         """
         Handler for editable text changes. Updates internal value and notifies dialog.
         """
+        if self._suppress_selection:
+            return
         try:
             text = entry.get_text()
         except Exception:
@@ -347,6 +351,8 @@ class YComboBoxGtk(YSelectionWidget):
         """
         Handler for Gtk.DropDown selection changes. Attempts robust extraction of selected label.
         """
+        if self._suppress_selection:
+            return
         # Prefer using the selected index to get a reliable label
         idx = None
         try:
@@ -492,6 +498,118 @@ class YComboBoxGtk(YSelectionWidget):
             except Exception:
                 self._logger.exception("addItem: unexpected error while updating backend widget")
 
+    def _apply_item_diff(self, diff):
+        """
+        Apply setItems() changes to the Gtk.StringList backing the dropdown,
+        one splice() per removed/inserted run and per changed label.
+        """
+        model = getattr(self, "_string_list_model", None)
+        use_model = isinstance(model, Gtk.StringList) and isinstance(self._combo_widget, Gtk.DropDown)
+        if use_model:
+            self._suppress_selection = True
+            try:
+                for row, count in diff.removed:
+                    model.splice(row, count, [])
+                for row, new_items in diff.inserted:
+                    model.splice(row, 0, [it.label() for it in new_items])
+                for row, _old, new, changed in diff.kept:
+                    if changed:
+                        model.splice(row, 1, [new.label()])
+            except Exception:
+                self._logger.exception("_apply_item_diff: failed to update string_list_model")
+            finally:
+                self._suppress_selection = False
+        selected = self._replace_items(diff)
+        for it in selected[:-1]:
+            it.setSelected(False)
+        self._selected_items = selected[-1:]
+        if self._selected_items:
+            self._value = self._selected_items[0].label()
+        self._show_selection()
+
+    def _remove_rows(self, row, count):
+        """Drop a run of entries with one splice() of the dropdown model."""
+        model = getattr(self, "_string_list_model", None)
+        if isinstance(model, Gtk.StringList) and isinstance(self._combo_widget, Gtk.DropDown):
+            self._suppress_selection = True
+            try:
+                model.splice(row, count, [])
+            except Exception:
+                self._logger.exception("_remove_rows: failed to update string_list_model")
+            finally:
+                self._suppress_selection = False
+        self._delete_run(None, row, count)
+
+    def _rows_removed(self, first, gone):
+        """Show the remaining selection, or the row the dropdown moved to."""
+        super()._rows_removed(first, gone)
+        self._show_selection()
+
+    def _show_selection(self):
+        """Reflect _selected_items in the dropdown (or fallback button) without
+        posting events; with nothing selected a dropdown keeps its current row."""
+        model = getattr(self, "_string_list_model", None)
+        if isinstance(model, Gtk.StringList) and isinstance(self._combo_widget, Gtk.DropDown):
+            self._suppress_selection = True
+            try:
+                if self._selected_items:
+                    self._combo_widget.set_selected(self._items.index(self._selected_items[0]))
+                elif not self._editable:
+                    pos = self._combo_widget.get_selected()
+                    self._value = self._items[pos].label() if 0 <= pos < len(self._items) else ""
+            except Exception:
+                self._logger.exception("_show_selection: failed to restore dropdown selection")
+            finally:
+                self._suppress_selection = False
+        elif getattr(self._combo_widget, "set_label", None) and self._selected_items and not isinstance(self._combo_widget, Gtk.Entry):
+            try:
+                self._combo_widget.set_label(self._value)
+            except Exception:
+                self._logger.exception("_show_selection: failed to update fallback combo widget label")
+
+    def selectItem(self, item, selected=True):
+        """Make *item* the current entry (no event posted), or drop its selection."""
+        if not selected:
+            item.setSelected(False)
+            if item in self._selected_items:
+                self._selected_items.remove(item)
+            return
+        for prev in self._selected_items:
+            if prev is not item:
+                prev.setSelected(False)
+        item.setSelected(True)
+        self._selected_items = [item]
+        self._value = item.label()
+        if isinstance(self._combo_widget, Gtk.Entry):
+            self._suppress_selection = True
+            try:
+                self._combo_widget.set_text(self._value)
+            finally:
+                self._suppress_selection = False
+        self._show_selection()
+
+    def _refresh_item(self, item, what):
+        """Replace the label of one entry in the dropdown model."""
+        try:
+            row = self._items.index(item)
+        except ValueError:
+            return
+        if item in self._selected_items:
+            self._value = item.label()
+        model = getattr(self, "_string_list_model", None)
+        if isinstance(model, Gtk.StringList) and isinstance(self._combo_widget, Gtk.DropDown):
+            self._suppress_selection = True
+            try:
+                current = self._combo_widget.get_selected()
+                model.splice(row, 1, [item.label()])
+                self._combo_widget.set_selected(current)
+            except Exception:
+                self._logger.exception("_refresh_item: failed to update string_list_model")
+            finally:
+                self._suppress_selection = False
+        else:
+            self._show_selection()
+
     def deleteAllItems(self):
         """
         Remove all items and reset backend widgets. Logs any issues so runtime problems are visible.
@@ -21,10 +21,59 @@ import logging
 from ...yui_common import *
 
 
-__all__ = ["_resolve_icon", "_resolve_gicon", "_convert_mnemonic_to_gtk"]
+__all__ = ["_resolve_icon", "_resolve_gicon", "_convert_mnemonic_to_gtk", "_icon_cache_key"]
 
 
-def _resolve_icon(icon_name, size=16):
+def _icon_theme():
+    """Return the Gtk.IconTheme of the default display (or None).
+
+    The first call also connects the theme's ``changed`` signal so the
+    shared icon cache is dropped whenever the user switches icon theme.
+    """
+    global _icon_theme_watched
+    try:
+        display = Gdk.Display.get_default()
+        if display is None:
+            return None
+        theme = Gtk.IconTheme.get_for_display(display)
+        if theme is not None and not _icon_theme_watched:
+            theme.connect("changed", _on_icon_theme_changed)
+            _icon_theme_watched = True
+        return theme
+    except Exception:
+        return None
+
+_icon_theme_watched = False
+# theme name used in icon cache keys; None until read, reset on "changed"
+_icon_theme_name = None
+
+
+def _on_icon_theme_changed(theme, *_args):
+    global _icon_theme_name
+    _icon_theme_name = None
+    YIconCache.shared().invalidate()
+
+
+def _icon_cache_key(kind, icon_name, size, scale=1):
+    """Build the shared icon cache key: (kind, name, size, scale, theme).
+
+    The theme name is looked up once and then only after the theme's
+    ``changed`` signal, so a cache hit costs no display or theme query.
+    """
+    global _icon_theme_name
+    theme_name = _icon_theme_name
+    if theme_name is None:
+        theme_name = ""
+        try:
+            theme = _icon_theme()
+            if theme is not None:
+                theme_name = _icon_theme_name = theme.get_theme_name() or ""
+        except Exception:
+            pass
+    return (kind, str(icon_name), int(size), int(scale), theme_name)
+
+
+def _resolve_icon(icon_name, size=16, scale=1):
         """Return a `Gtk.Image` for the given icon_name or None.
 
         Resolution policy:
@@ -34,10 +83,32 @@ def _resolve_icon(icon_name, size=16):
         - Otherwise, strip any extension and try to load from the system
         icon theme. If that fails, try creating an image from the original
         name (some engines accept full names).
-        """        
+
+        The resolved paintable (or failure) is kept in the shared YIconCache,
+        keyed by (name, size, scale, theme); only the cheap Gtk.Image wrapper
+        is created per call, since a widget cannot have two parents.
+        """
         if not icon_name:
             return None
-        
+        key = _icon_cache_key("gtk-image", icon_name, size, scale)
+        source = YIconCache.shared().lookup(key, lambda: _load_icon_source(icon_name, size, scale))
+        if source is None:
+            return None
+        kind, value = source
+        try:
+            if kind == "paintable":
+                return Gtk.Image.new_from_paintable(value)
+            return Gtk.Image.new_from_icon_name(value)
+        except Exception:
+            return None
+
+
+def _load_icon_source(icon_name, size=16, scale=1):
+        """Resolve icon_name without caching.
+
+        Returns ``("paintable", Gdk.Paintable)``, ``("icon-name", str)`` or
+        None when the icon cannot be found.
+        """
         # Helper function to load from file
         def load_from_file(filename):
             if os.path.exists(filename):
@@ -45,9 +116,7 @@ def _resolve_icon(icon_name, size=16):
                     # Try as a file path
                     picture = Gtk.Picture.new_for_filename(filename)
                     if picture.get_paintable():
-                        image = Gtk.Image.new_from_paintable(picture.get_paintable())
-                        if image.get_paintable():
-                            return image
+                        return ("paintable", picture.get_paintable())
                 except Exception:
                     pass
                 
@@ -55,7 +124,7 @@ def _resolve_icon(icon_name, size=16):
                 try:
                     pixbuf = GdkPixbuf.Pixbuf.new_from_file(filename)
                     if pixbuf:
-                        return Gtk.Image.new_from_pixbuf(pixbuf)
+                        return ("paintable", Gdk.Texture.new_for_pixbuf(pixbuf))
                 except Exception:
                     pass
             return None
@@ -85,27 +154,25 @@ def _resolve_icon(icon_name, size=16):
             base_name = os.path.splitext(icon_name)[0] if '.' in icon_name else icon_name
             
             # Get default display and theme
-            display = Gdk.Display.get_default()
-            if display:
-                theme = Gtk.IconTheme.get_for_display(display)
-                
+            theme = _icon_theme()
+            if theme is not None:
                 # Try to lookup the icon
                 paint = theme.lookup_icon(
                     base_name,
                     fallbacks=None,
                     size=size,
-                    scale=1,
+                    scale=scale,
                     direction=Gtk.TextDirection.LTR,
                     flags=Gtk.IconLookupFlags.FORCE_REGULAR
                 )
                 
                 if paint:
-                    return Gtk.Image.new_from_paintable(paint)
+                    return ("paintable", paint)
             
             # Fallback: simple icon name creation
             image = Gtk.Image.new_from_icon_name(base_name)
             if image.get_icon_name():  # Check if icon was actually set
-                return image
+                return ("icon-name", base_name)
                 
         except Exception:
             pass
@@ -114,7 +181,7 @@ def _resolve_icon(icon_name, size=16):
         try:
             image = Gtk.Image.new_from_icon_name(icon_name)
             if image.get_icon_name():
-                return image
+                return ("icon-name", icon_name)
         except Exception:
             pass
         
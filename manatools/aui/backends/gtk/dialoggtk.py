@@ -131,6 +131,20 @@ class YDialogGtk(YSingleChildContainerWidget):
                 pass
         return True
 
+    def _call_when_idle(self, callback):
+        """Run *callback* once the main loop has no higher priority work."""
+        def _idle():
+            callback()
+            return False
+        GLib.idle_add(_idle)
+
+    def _queue_item_flush(self, widget):
+        """Apply *widget*'s pending item changes from the main loop."""
+        def _flush():
+            widget._flush_item_changes()
+            return False
+        GLib.idle_add(_flush)
+
     def _post_event(self, event):
         """Internal: post an event to this dialog and quit local GLib.MainLoop if running."""
         self._event_result = event
@@ -12,13 +12,56 @@ Author:  Angelo Naselli <anaselli@linux.it>
 import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('GdkPixbuf', '2.0')
-from gi.repository import Gtk, GdkPixbuf, Gdk, GObject
+from gi.repository import Gtk, GdkPixbuf, Gdk, GObject, GLib
 import logging
 import os
+import threading
 from ...yui_common import *
 from .commongtk import _resolve_icon, _resolve_gicon
 
 
+def _decode_pixbuf(path, target=None):
+    """Decode *path* with GdkPixbuf.PixbufLoader; safe to call off the main thread.
+
+    When *target* (width, height) is given and the image is larger, the
+    loader is asked to decode at the fitting size from its size-prepared
+    signal: SVG is rendered at that size and JPEG uses its native
+    down-scaled decoding.  Returns (pixbuf, natural_width, natural_height).
+    """
+    loader = GdkPixbuf.PixbufLoader()
+    natural = [0, 0]
+
+    def _on_size_prepared(ldr, width, height):
+        natural[0], natural[1] = width, height
+        if target is None or width <= 0 or height <= 0:
+            return
+        scale = min(float(target[0]) / width, float(target[1]) / height)
+        if scale < 1.0:
+            ldr.set_size(max(1, int(width * scale)), max(1, int(height * scale)))
+
+    loader.connect("size-prepared", _on_size_prepared)
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(64 * 1024)
+                if not chunk:
+                    break
+                loader.write(chunk)
+    finally:
+        loader.close()
+    pixbuf = loader.get_pixbuf()
+    if pixbuf is None:
+        raise ValueError("no image data in %s" % path)
+    # honour EXIF orientation like Gdk.Texture does
+    try:
+        oriented = pixbuf.apply_embedded_orientation()
+        if oriented is not None:
+            pixbuf = oriented
+    except Exception:
+        pass
+    return pixbuf, natural[0], natural[1]
+
+
 class YImageGtk(YWidget):
     """GTK4 image widget backed by Gtk.Picture for native scaling and SVG support.
 
@@ -30,10 +73,13 @@ class YImageGtk(YWidget):
     def __init__(self, parent=None, imageFileName="", fallBackName=None):
         super().__init__(parent)
         self._imageFileName = imageFileName
-        # fallBackName is reserved for text-mode backends; ignored here.
+        # fallBackName is drawn by text-mode backends; here it is only used as
+        # alternative text of the placeholder shown during asynchronous loads.
         self._fallback_name = fallBackName
         self._auto_scale = False
         self._zero_size = {YUIDimension.YD_HORIZ: False, YUIDimension.YD_VERT: False}
+        self._async_loading = False
+        self._load_serial = 0
         self._logger = logging.getLogger(f"manatools.aui.gtk.{self.__class__.__name__}")
         self._logger.debug("%s.__init__ file=%s", self.__class__.__name__, imageFileName)
 
@@ -43,15 +89,115 @@ class YImageGtk(YWidget):
     def imageFileName(self):
         return self._imageFileName
 
+    def asyncLoading(self):
+        return bool(self._async_loading)
+
+    def setAsyncLoading(self, on=True):
+        """Decode image files on a worker thread instead of the GTK main loop.
+
+        Affects the next setImage() call, and the initial image when enabled
+        before the dialog is built.  Theme icons are always resolved
+        synchronously.
+        """
+        self._async_loading = bool(on)
+
     def setImage(self, imageFileName):
         try:
             self._imageFileName = imageFileName
+            # drop any decode still in flight for the previous image
+            self._load_serial += 1
             if getattr(self, '_backend_widget', None) is None:
                 return
-            self._load_paintable(imageFileName)
+            self._load_image(imageFileName)
         except Exception:
             self._logger.exception("setImage failed")
 
+    def _load_image(self, imageFileName):
+        """Load synchronously, or start a background decode for image files."""
+        if self._async_loading and YIconCache.imageFilePath(imageFileName):
+            self._start_async_load(imageFileName)
+        else:
+            self._load_paintable(imageFileName)
+
+    def _decode_target_size(self):
+        """Largest size the picture can be shown at: the monitor, in device pixels.
+
+        Gtk.Picture scales the texture itself on every allocation, so
+        decoding beyond the monitor resolution only wastes time and memory.
+        """
+        try:
+            display = self._backend_widget.get_display() or Gdk.Display.get_default()
+            monitor = None
+            native = self._backend_widget.get_native()
+            surface = native.get_surface() if native is not None else None
+            if surface is not None:
+                monitor = display.get_monitor_at_surface(surface)
+            if monitor is None:
+                monitors = display.get_monitors()
+                if monitors.get_n_items() > 0:
+                    monitor = monitors.get_item(0)
+            if monitor is None:
+                return None
+            geom = monitor.get_geometry()
+            scale = max(1, int(monitor.get_scale_factor()))
+            if geom.width <= 0 or geom.height <= 0:
+                return None
+            return (geom.width * scale, geom.height * scale)
+        except Exception:
+            return None
+
+    def _start_async_load(self, path):
+        """Show a placeholder and decode *path* on a worker thread."""
+        self._load_serial += 1
+        serial = self._load_serial
+        try:
+            self._backend_widget.set_paintable(self._placeholder_paintable())
+            if self._fallback_name:
+                self._backend_widget.set_alternative_text(str(self._fallback_name))
+        except Exception:
+            pass
+        target = self._decode_target_size()
+
+        def _worker():
+            try:
+                pixbuf, nat_w, nat_h = _decode_pixbuf(path, target)
+                err = None
+            except Exception as e:
+                pixbuf, nat_w, nat_h, err = None, 0, 0, e
+            GLib.idle_add(self._on_pixbuf_decoded, serial, path, pixbuf, err)
+
+        threading.Thread(target=_worker, name="YImageGtk-decode", daemon=True).start()
+        self._logger.debug("_start_async_load: %s serial=%d target=%s", path, serial, target)
+
+    def _placeholder_paintable(self):
+        """Theme 'image-loading' icon, or None."""
+        try:
+            display = Gdk.Display.get_default()
+            if display is None:
+                return None
+            theme = Gtk.IconTheme.get_for_display(display)
+            if not theme.has_icon("image-loading"):
+                return None
+            return theme.lookup_icon("image-loading", None, 48, 1,
+                                     Gtk.TextDirection.LTR, Gtk.IconLookupFlags.FORCE_REGULAR)
+        except Exception:
+            return None
+
+    def _on_pixbuf_decoded(self, serial, path, pixbuf, err):
+        """Swap in a decoded pixbuf (runs in the GTK main loop)."""
+        try:
+            if serial != self._load_serial or getattr(self, '_backend_widget', None) is None:
+                # superseded by a later setImage()
+                return False
+            if pixbuf is None:
+                self._logger.debug("_on_pixbuf_decoded: async decode failed for %s (%s), loading synchronously", path, err)
+                self._load_paintable(path)
+                return False
+            self._backend_widget.set_paintable(Gdk.Texture.new_for_pixbuf(pixbuf))
+        except Exception:
+            self._logger.exception("_on_pixbuf_decoded failed")
+        return False
+
     def _load_paintable(self, imageFileName):
         """Load imageFileName into the Gtk.Picture backend widget.
 
@@ -61,20 +207,15 @@ class YImageGtk(YWidget):
         3. GdkPixbuf → Gdk.Texture        (raster fallback, file path only)
         4. Gtk.IconTheme paintable        (bare icon name resolution)
 
-        File-based attempts (1–3) are only tried when *imageFileName* looks like
-        a real filesystem path, i.e. it is absolute or contains a path separator.
+        File-based attempts (1–3) are only tried when *imageFileName* names an
+        existing file by the rules of YIconCache.imageFilePath(), the same ones
+        the Qt backend uses: absolute, with a path separator or an extension.
         Bare names such as ``'manafirewall'`` are icon names, NOT relative file
         paths — treating them as relative paths is wrong because a same-named
         executable may exist in the current working directory, which would cause
         ``GdkPixbuf.new_from_file`` to receive a binary script as input.
         """
-        # A name is treated as a file path only when it is absolute or contains
-        # a directory separator.  Bare names go straight to icon theme lookup.
-        is_file_path = bool(imageFileName) and (
-            os.path.isabs(imageFileName) or os.sep in imageFileName
-        )
-
-        if is_file_path and os.path.exists(imageFileName):
+        if YIconCache.imageFilePath(imageFileName):
             # Attempt 1: new_from_filename — SVG rendered at display resolution
             try:
                 texture = Gdk.Texture.new_from_filename(imageFileName)
@@ -172,7 +313,7 @@ class YImageGtk(YWidget):
             # height-for-width / CONTAIN scaling works correctly.
             self._backend_widget.set_can_shrink(True)
             if self._imageFileName:
-                self._load_paintable(self._imageFileName)
+                self._load_image(self._imageFileName)
             self._apply_size_policy()
             self._logger.debug("_create_backend_widget: <%s>", self.debugLabel())
         except Exception:
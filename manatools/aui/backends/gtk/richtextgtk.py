@@ -5,6 +5,10 @@ GTK4 backend RichText widget.
 
 - Plain text mode: Gtk.TextView (read-only) inside Gtk.ScrolledWindow
 - Rich text mode: Gtk.Label with markup inside Gtk.ScrolledWindow
+- Large rich documents (over _LARGE_TEXT_THRESHOLD characters) and rich
+  content extended by appendValue(): read-only Gtk.TextView whose buffer is
+  styled with text tags, laid out lazily by GTK; size measurement then uses
+  cached line metrics instead of the content
 - Link activation: emits YMenuEvent with URL id
 - Auto scroll down: applies to TextView; for Label, scrolled window shows full content
 '''
@@ -14,6 +18,8 @@ gi.require_version('Gdk', '4.0')
 from gi.repository import Gtk, Pango, GLib, Gdk
 import logging
 import re
+import html
+import bisect
 from ...yui_common import *
 
 
@@ -50,6 +56,10 @@ class _YRichTextMeasureScrolledWindow(Gtk.ScrolledWindow):
 class YRichTextGtk(YWidget):
     """GTK4 rich text widget with plain/markup rendering and link activation."""
 
+    # rich documents longer than this (in characters) are drawn by a TextView
+    _LARGE_TEXT_THRESHOLD = 64 * 1024
+    _HEADING_SCALES = {1: 1.728, 2: 1.44, 3: 1.2, 4: 1.0, 5: 0.833, 6: 0.694}
+
     def __init__(self, parent=None, text: str = "", plainTextMode: bool = False):
         super().__init__(parent)
         self._text = text or ""
@@ -58,6 +68,11 @@ class YRichTextGtk(YWidget):
         self._last_url = None
         self._backend_widget = None
         self._content_widget = None  # TextView or Label
+        self._streaming = False  # appendValue() used since the last setValue()
+        self._links = []  # (start, end, target) char offsets in a rich TextView buffer
+        self._link_starts = []  # start offsets of _links, for bisect
+        self._metrics = None  # (line count, longest line, last line) of _text
+        self._tail_state = None  # YRichTextDocument.endState() of _text, once appended to
         self._logger = logging.getLogger(f"manatools.aui.gtk.{self.__class__.__name__}")
         # Default: richtext should be stretchable both horizontally and vertically
         try:
@@ -164,17 +179,29 @@ class YRichTextGtk(YWidget):
 
     def setValue(self, newValue: str):
         self._text = newValue or ""
+        self._metrics = None
+        self._tail_state = None
+        self._streaming = False
         w = getattr(self, "_content_widget", None)
         if w is None:
             return
+        if self._sync_content_kind():
+            self._scroll_to_end()
+            return
         try:
             if isinstance(w, Gtk.TextView):
                 buf = w.get_buffer()
                 if buf:
                     try:
-                        buf.set_text(self._text)
+                        if self._plain:
+                            buf.set_text(self._text)
+                        else:
+                            buf.set_text("")
+                            self._links = []
+                            self._link_starts = []
+                            self._insert_document(buf, YRichTextDocument.parse(self._text))
                     except Exception:
-                        pass
+                        self._logger.exception("setValue: cannot fill the text buffer")
                 if self._auto_scroll:
                     try:
                         itr_end = buf.get_end_iter()
@@ -200,6 +227,46 @@ class YRichTextGtk(YWidget):
         except Exception:
             self._logger.exception("setValue failed", exc_info=True)
 
+    def appendValue(self, fragment: str):
+        """Append *fragment* to the content.
+
+        The fragment is inserted at the end of the TextView buffer.  Rich
+        text shown by a Gtk.Label switches to the TextView renderer on the
+        first append, so the document is never laid out again as a whole.
+        Only the fragment is parsed, continuing from the tags the text
+        before it left open.
+        """
+        fragment = fragment or ""
+        if not fragment:
+            return
+        doc = None
+        if not self._plain:
+            state = self._tail_state
+            if state is None:
+                state = YRichTextDocument.parse(self._text).endState()
+            doc = YRichTextDocument.parse(fragment, state)
+            self._tail_state = doc.endState()
+        self._text += fragment
+        self._streaming = True
+        if self._metrics is not None:
+            self._extend_metrics(fragment.split("\n") if doc is None else doc.plainLines())
+        w = getattr(self, "_content_widget", None)
+        if w is None:
+            return
+        if self._sync_content_kind():
+            self._scroll_to_end()
+            return
+        try:
+            if isinstance(w, Gtk.TextView):
+                buf = w.get_buffer()
+                if doc is None:
+                    buf.insert(buf.get_end_iter(), fragment)
+                else:
+                    self._insert_document(buf, doc)
+                self._scroll_to_end()
+        except Exception:
+            self._logger.exception("appendValue failed", exc_info=True)
+
     def value(self) -> str:
         return self._text
 
@@ -208,11 +275,11 @@ class YRichTextGtk(YWidget):
 
     def setPlainTextMode(self, on: bool = True):
         self._plain = bool(on)
+        self._metrics = None
+        self._tail_state = None
         # rebuild content widget to reflect mode
         if getattr(self, "_backend_widget", None) is not None:
-            self._create_content()
-            self._apply_size_policy()
-            self.setValue(self._text)
+            self._replace_content()
 
     def autoScrollDown(self) -> bool:
         return bool(self._auto_scroll)
@@ -220,11 +287,14 @@ class YRichTextGtk(YWidget):
     def setAutoScrollDown(self, on: bool = True):
         self._auto_scroll = bool(on)
         # apply immediately for TextView
-        if self._auto_scroll and isinstance(getattr(self, "_content_widget", None), Gtk.TextView):
+        self._scroll_to_end()
+
+    def _scroll_to_end(self):
+        """Scroll a TextView content to its end when autoScrollDown is on."""
+        w = getattr(self, "_content_widget", None)
+        if self._auto_scroll and isinstance(w, Gtk.TextView):
             try:
-                buf = self._content_widget.get_buffer()
-                itr_end = buf.get_end_iter()
-                self._content_widget.scroll_to_iter(itr_end, 0.0, True, 0.0, 1.0)
+                w.scroll_to_iter(w.get_buffer().get_end_iter(), 0.0, True, 0.0, 1.0)
             except Exception:
                 pass
 
@@ -242,7 +312,7 @@ class YRichTextGtk(YWidget):
             tuple: (minimum_size, natural_size, minimum_baseline, natural_baseline)
         """
         widget = getattr(self, "_backend_widget", None)
-        if widget is not None:
+        if widget is not None and not self._is_rich_buffer():
             try:
                 minimum_size, natural_size, minimum_baseline, natural_baseline = Gtk.ScrolledWindow.do_measure(widget, orientation, for_size)
                 if orientation == Gtk.Orientation.HORIZONTAL:
@@ -255,9 +325,7 @@ class YRichTextGtk(YWidget):
             except Exception:
                 self._logger.exception("RichText base do_measure failed", exc_info=True)
 
-        text = str(getattr(self, "_text", "") or "")
-        line_count = max(1, text.count("\n") + 1)
-        longest_line = max((len(line) for line in text.splitlines()), default=len(text))
+        line_count, longest_line = self._line_metrics()
         if orientation == Gtk.Orientation.HORIZONTAL:
             minimum_size = 160
             natural_size = max(minimum_size, min(900, max(220, longest_line * 7)))
@@ -265,7 +333,7 @@ class YRichTextGtk(YWidget):
             minimum_size = max(72, min(240, line_count * 18))
             natural_size = max(minimum_size, min(720, line_count * 22))
         self._logger.debug(
-            "RichText fallback do_measure orientation=%s for_size=%s -> min=%s nat=%s",
+            "RichText bounded do_measure orientation=%s for_size=%s -> min=%s nat=%s",
             orientation,
             for_size,
             minimum_size,
@@ -297,6 +365,8 @@ class YRichTextGtk(YWidget):
                     buf.set_text(self._text)
                 except Exception:
                     self._logger.debug("set_text failed on Gtk.TextBuffer", exc_info=True)
+            elif self._wants_rich_buffer():
+                self._content_widget = self._create_rich_buffer_view()
             else:
                 lbl = Gtk.Label()
                 try:
@@ -323,14 +393,7 @@ class YRichTextGtk(YWidget):
                     self._logger.debug("set_justify failed on Gtk.Label", exc_info=True)
                 # connect link activation
                 def _on_activate_link(label, uri):
-                    try:
-                        self._last_url = uri
-                        dlg = self.findDialog()
-                        if dlg and self.notify():
-                            # emit a MenuEvent for link activation (back-compat)
-                            dlg._post_event(YMenuEvent(item=None, id=uri))
-                    except Exception:
-                        self._logger.debug("activate-link handler failed", exc_info=True)
+                    self._activate_link(uri)
                     # return True to stop default handling
                     return True
                 try:
@@ -343,6 +406,174 @@ class YRichTextGtk(YWidget):
             # fallback to a simple label
             self._content_widget = Gtk.Label(label=self._text)
 
+    def _activate_link(self, uri):
+        try:
+            self._last_url = uri
+            dlg = self.findDialog()
+            if dlg and self.notify():
+                # emit a MenuEvent for link activation (back-compat)
+                dlg._post_event(YMenuEvent(item=None, id=uri))
+        except Exception:
+            self._logger.debug("activate-link handler failed", exc_info=True)
+
+    def _is_rich_buffer(self):
+        """True when rich text is drawn by the TextView renderer."""
+        return not self._plain and isinstance(getattr(self, "_content_widget", None), Gtk.TextView)
+
+    def _line_metrics(self):
+        """Return (line count, longest line length) of the text, computed once per value."""
+        if self._metrics is None:
+            text = str(getattr(self, "_text", "") or "")
+            if self._plain:
+                lines = text.split("\n")
+                longest_line = max(map(len, lines), default=0)
+            else:
+                doc = YRichTextDocument.parse(text)
+                lines = doc.plainLines()
+                longest_line = doc.maxLength()
+            self._metrics = (max(1, len(lines)), longest_line, len(lines[-1]) if lines else 0)
+        return self._metrics[:2]
+
+    def _extend_metrics(self, lines):
+        """Update the cached metrics with appended *lines*; the first one
+        continues the last line of the text."""
+        if not lines:
+            return
+        count, longest, last = self._metrics
+        first = last + len(lines[0])
+        longest = max([longest, first] + [len(l) for l in lines[1:]])
+        last = len(lines[-1]) if len(lines) > 1 else first
+        self._metrics = (count + len(lines) - 1, longest, last)
+
+    def _wants_rich_buffer(self):
+        """True when rich text should be drawn by the TextView renderer:
+        large documents and content extended by appendValue()."""
+        return self._streaming or len(self._text) > self._LARGE_TEXT_THRESHOLD
+
+    def _sync_content_kind(self):
+        """Switch between Label and TextView when rich text crosses the size
+        threshold or starts streaming. Return True when the content widget
+        was rebuilt."""
+        w = getattr(self, "_content_widget", None)
+        if self._plain or w is None or getattr(self, "_backend_widget", None) is None:
+            return False
+        if isinstance(w, Gtk.TextView) == self._wants_rich_buffer():
+            return False
+        self._replace_content()
+        return True
+
+    def _replace_content(self):
+        """Recreate the content widget for the current mode and text."""
+        self._create_content()
+        try:
+            self._backend_widget.set_child(self._content_widget)
+        except Exception:
+            self._logger.exception("Failed to attach content to scrolled window")
+        self._apply_size_policy()
+
+    def _create_rich_buffer_view(self):
+        """Create a read-only TextView showing the rich text through text tags."""
+        tv = Gtk.TextView()
+        tv.set_editable(False)
+        tv.set_cursor_visible(False)
+        tv.set_wrap_mode(Gtk.WrapMode.WORD_CHAR)
+        buf = tv.get_buffer()
+        buf.create_tag("bold", weight=Pango.Weight.BOLD)
+        buf.create_tag("italic", style=Pango.Style.ITALIC)
+        buf.create_tag("underline", underline=Pango.Underline.SINGLE)
+        buf.create_tag("link", underline=Pango.Underline.SINGLE)
+        for n, scale in self._HEADING_SCALES.items():
+            buf.create_tag(f"h{n}", weight=Pango.Weight.BOLD, scale=scale)
+        self._links = []
+        self._link_starts = []
+        try:
+            self._insert_document(buf, YRichTextDocument.parse(self._text))
+        except Exception:
+            self._logger.exception("Failed to fill the rich text buffer")
+
+        def _on_released(gesture, n_press, x, y):
+            try:
+                if buf.get_has_selection():
+                    return
+                bx, by = tv.window_to_buffer_coords(Gtk.TextWindowType.WIDGET, int(x), int(y))
+                found = tv.get_iter_at_location(bx, by)
+                if isinstance(found, tuple):
+                    ok, itr = found
+                    if not ok:
+                        return
+                else:
+                    itr = found
+                uri = self._link_at(itr.get_offset())
+                if uri is not None:
+                    self._activate_link(uri)
+            except Exception:
+                self._logger.debug("link click handler failed", exc_info=True)
+        try:
+            click = Gtk.GestureClick()
+            click.connect("released", _on_released)
+            tv.add_controller(click)
+        except Exception:
+            self._logger.debug("Failed to add link click controller", exc_info=True)
+        return tv
+
+    def _link_at(self, offset):
+        """Return the link target at buffer character *offset*, if any."""
+        i = bisect.bisect_right(self._link_starts, offset) - 1
+        if i >= 0 and offset < self._links[i][1]:
+            return self._links[i][2]
+        return None
+
+    def _insert_document(self, buf, doc):
+        """Insert *doc* at the end of *buf* and style it with text tags.
+
+        The plain text goes in with a single insert, then each tag is applied
+        to merged ranges; the first line of *doc* continues the last one.
+        """
+        start = buf.get_char_count()
+        buf.insert(buf.get_end_iter(), "\n".join(doc.plainLines()))
+        ranges = {}
+        offset = start
+        for row in doc.lines():
+            for seg in row:
+                end = offset + len(seg["text"])
+                for name in self._segment_tags(buf, seg):
+                    spans = ranges.setdefault(name, [])
+                    if spans and spans[-1][1] == offset:
+                        spans[-1][1] = end
+                    else:
+                        spans.append([offset, end])
+                if seg["anchor"]:
+                    self._links.append((offset, end, seg["anchor"]))
+                    self._link_starts.append(offset)
+                offset = end
+            offset += 1  # line break
+        for name, spans in ranges.items():
+            for s, e in spans:
+                buf.apply_tag_by_name(name, buf.get_iter_at_offset(s), buf.get_iter_at_offset(e))
+
+    def _segment_tags(self, buf, seg):
+        names = []
+        if seg["heading"]:
+            names.append("h%d" % seg["heading"])
+        elif seg["bold"]:
+            names.append("bold")
+        if seg["italic"]:
+            names.append("italic")
+        if seg["anchor"]:
+            names.append("link")
+        elif seg["underline"]:
+            names.append("underline")
+        if seg["color"]:
+            name = "color:" + seg["color"]
+            if buf.get_tag_table().lookup(name) is None:
+                try:
+                    buf.create_tag(name, foreground=seg["color"])
+                except Exception:
+                    self._logger.debug("unknown color %r", seg["color"], exc_info=True)
+                    return names
+            names.append(name)
+        return names
+
     def _create_backend_widget(self):
         """Create scrolled backend and attach rich text content widget."""
         sw = _YRichTextMeasureScrolledWindow(self)
@@ -400,43 +631,40 @@ class YRichTextGtk(YWidget):
         except Exception:
             self._logger.exception("Failed to set enabled state", exc_info=True)
 
+    _HEADING_SIZES = {1: "xx-large", 2: "x-large", 3: "large", 4: "medium", 5: "small", 6: "x-small"}
+
     def _html_to_pango_markup(self, s: str) -> str:
         """Convert a limited subset of HTML into GTK/Pango markup.
-        Supports: h1-h6 (as bold spans with size), b/i/em/u, a href, p/br, ul/li.
-        Unknown tags are stripped.
+        The text is tokenized once by YRichTextDocument (memoised per text) and
+        every styled segment becomes a span: h1-h6 as bold with size, b/i/em/u,
+        span colours, a href as links; p/br and ul/li become line breaks and
+        bullets. Unknown tags are stripped.
         """
         if not s:
             return ""
-        self._logger.debug("Converted markup: %s", s)
-        t = s
-        # Normalize newlines for paragraphs and breaks
-        t = re.sub(r"<br\s*/?>", "\n", t, flags=re.IGNORECASE)
-        t = re.sub(r"</p\s*>", "\n\n", t, flags=re.IGNORECASE)
-        t = re.sub(r"<p\s*>", "", t, flags=re.IGNORECASE)
-        # Lists
-        t = re.sub(r"<ul\s*>", "\n", t, flags=re.IGNORECASE)
-        t = re.sub(r"</ul\s*>", "\n", t, flags=re.IGNORECASE)
-        t = re.sub(r"<ol\s*>", "\n", t, flags=re.IGNORECASE)
-        t = re.sub(r"</ol\s*>", "\n", t, flags=re.IGNORECASE)
-        t = re.sub(r"<li\s*>", "• ", t, flags=re.IGNORECASE)
-        t = re.sub(r"</li\s*>", "\n", t, flags=re.IGNORECASE)
-        # Headings -> bold span with size
-        sizes = {1: "xx-large", 2: "x-large", 3: "large", 4: "medium", 5: "small", 6: "x-small"}
-        for n, sz in sizes.items():
-            t = re.sub(fr"<h{n}\s*>", f"<span weight=\"bold\" size=\"{sz}\">", t, flags=re.IGNORECASE)
-            t = re.sub(fr"</h{n}\s*>", "</span>\n", t, flags=re.IGNORECASE)
-        # Explicitly convert formatting tags to Pango span attributes
-        t = re.sub(r"<b\s*>", "<span weight=\"bold\">", t, flags=re.IGNORECASE)
-        t = re.sub(r"</b\s*>", "</span>", t, flags=re.IGNORECASE)
-        t = re.sub(r"<i\s*>", "<span style=\"italic\">", t, flags=re.IGNORECASE)
-        t = re.sub(r"</i\s*>", "</span>", t, flags=re.IGNORECASE)
-        t = re.sub(r"<em\s*>", "<span style=\"italic\">", t, flags=re.IGNORECASE)
-        t = re.sub(r"</em\s*>", "</span>", t, flags=re.IGNORECASE)
-        t = re.sub(r"<u\s*>", "<span underline=\"single\">", t, flags=re.IGNORECASE)
-        t = re.sub(r"</u\s*>", "</span>", t, flags=re.IGNORECASE)
-        # Allow basic formatting tags and <a href>; strip all other tags
-        t = re.sub(r"</?(?!span\b|a\b)[a-zA-Z0-9]+\b[^>]*>", "", t)
-
+        out = []
+        for row in YRichTextDocument.parse(s).lines():
+            parts = []
+            for seg in row:
+                text = html.escape(seg["text"], quote=False)
+                attrs = []
+                if seg["heading"]:
+                    attrs.append('weight="bold" size="%s"' % self._HEADING_SIZES.get(seg["heading"], "medium"))
+                elif seg["bold"]:
+                    attrs.append('weight="bold"')
+                if seg["italic"]:
+                    attrs.append('style="italic"')
+                if seg["underline"] and not seg["anchor"]:
+                    attrs.append('underline="single"')
+                if seg["color"]:
+                    attrs.append('foreground="%s"' % html.escape(seg["color"], quote=True))
+                if attrs:
+                    text = "<span %s>%s</span>" % (" ".join(attrs), text)
+                if seg["anchor"]:
+                    text = '<a href="%s">%s</a>' % (html.escape(seg["anchor"], quote=True), text)
+                parts.append(text)
+            out.append("".join(parts))
+        t = "\n".join(out)
         self._logger.debug("Converted markup: %s", t)
         return t
 
@@ -3,6 +3,32 @@
 '''
 Python manatools.aui.backends.gtk contains all GTK backend classes
 
+GTK4 backend for YSelectionBox using Gtk.ListView (virtual/lazy rendering).
+
+Pipeline
+--------
+  YItem list
+      |
+      v
+  Gio.ListStore[_ItemObject]            -- data store, one splice() per batch
+      |
+      v
+  Gtk.SingleSelection / MultiSelection  -- selection model
+      |
+      v
+  Gtk.ListView                          -- virtual view
+       |
+       +-- GtkSignalListItemFactory     -- setup/bind/teardown
+              (called only for visible rows; row widgets are recycled)
+
+Gtk.ListBox created one Gtk.ListBoxRow (plus icon and label widgets) per
+item, so filling it with tens of thousands of entries took seconds and
+hundreds of MB.  With Gtk.ListView memory and populate time depend on the
+visible rows only; the per-item cost is one small GObject wrapper.
+
+Selection changes are processed only for the range reported by the
+selection model's ``selection-changed`` signal, never by scanning all rows.
+
 License: LGPLv2+
 
 Author:  Angelo Naselli <anaselli@linux.it>
@@ -13,28 +39,45 @@ Author:  Angelo Naselli <anaselli@linux.it>
 import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('Gdk', '4.0')
-from gi.repository import Gtk, Gdk, GObject, GdkPixbuf, GLib
-import cairo
-import threading
-import os
+from gi.repository import Gtk, Gdk, GObject, GLib, Gio, Pango
 from typing import Optional
 import logging
 from ...yui_common import *
 from .commongtk import _resolve_icon
 
 
+class _ItemObject(GObject.Object):
+    """Lightweight GObject wrapper so a YItem can live in a Gio.ListStore."""
+    __gtype_name__ = '_YSelectionBoxItemObject'
+
+    def __init__(self, item: YItem):
+        super().__init__()
+        self.item = item
+        # row widget currently showing this item, if any (see _factory_bind)
+        self.list_item = None
+
+
 class YSelectionBoxGtk(YSelectionWidget):
+    """GTK4 implementation of YSelectionBox backed by Gtk.ListView.
+
+    Single selection uses Gtk.SingleSelection; multi selection uses
+    Gtk.MultiSelection, where a plain click toggles the clicked row as with
+    the other backends (Ctrl/Shift+click keep the GTK behaviour, Enter
+    toggles the focused row).
+    """
     def __init__(self, parent=None, label="", multi_selection: Optional[bool] = False):
         super().__init__(parent)
         self._label = label
-        self._value = ""        
-        self._old_selected_items = [] # for change detection
+        self._value = ""
         self._multi_selection = bool(multi_selection)
-        self._listbox = None
         self._backend_widget = None
-        # keep a stable list of rows we create so we don't rely on ListBox container APIs
-        # (GTK4 bindings may not expose get_children())
-        self._rows = []
+        self._listview = None          # Gtk.ListView
+        self._store = None             # Gio.ListStore[_ItemObject]
+        self._selection_model = None   # Gtk.SingleSelection | Gtk.MultiSelection
+        self._selection_handler = None
+        # item -> position in _store (store order == self._items order)
+        self._item_to_pos = {}
+        self._suppress_selection = False
         # Preferred visible rows for layout/paging; parent can give more space when stretchable
         self._preferred_rows = 6
         self.setStretchable(YUIDimension.YD_HORIZ, True)
@@ -53,6 +96,9 @@ class YSelectionBoxGtk(YSelectionWidget):
     def selectedItems(self):
         return list(self._selected_items)
 
+    def _update_value(self):
+        self._value = self._selected_items[0].label() if self._selected_items else ""
+
     def selectItem(self, item, selected=True):
         """Select or deselect a specific item"""
         if self.multiSelection():
@@ -63,653 +109,485 @@ class YSelectionBoxGtk(YSelectionWidget):
                 if item in self._selected_items:
                     self._selected_items.remove(item)
         else:
-            old_selected = self._selected_items[0] if self._selected_items else None            
+            old_selected = self._selected_items[0] if self._selected_items else None
             if selected:
-                if old_selected is not None:
+                if old_selected is not None and old_selected is not item:
                     old_selected.setSelected(False)
                 self._selected_items = [item]
-                idx = self._items.index( self._selected_items[0] )
-                row = self._rows[idx]
-                if self._listbox is not None:
-                    self._listbox.select_row( row )
-            else:
-                self._selected_items = [] 
-        
+            elif old_selected is item:
+                self._selected_items = []
+
         item.setSelected(bool(selected))
-        self._value = self._selected_items[0].label() if self._selected_items else None
+        self._update_value()
 
-    def setMultiSelection(self, enabled):
-        self._multi_selection = bool(enabled)
-        old_selected = list(self._selected_items)
-        # If listbox already created, update its selection mode at runtime.
-        if self._listbox is None:
+        pos = self._item_to_pos.get(item)
+        if self._selection_model is None or pos is None:
             return
+        self._suppress_selection = True
         try:
-            mode = Gtk.SelectionMode.MULTIPLE if self._multi_selection else Gtk.SelectionMode.SINGLE
-            self._listbox.set_selection_mode(mode)
+            if selected:
+                self._selection_model.select_item(pos, not self._multi_selection)
+            else:
+                self._selection_model.unselect_item(pos)
         except Exception:
-            pass
-        # Rewire signals: disconnect previous handlers and connect appropriate one.
+            self._logger.exception("selectItem: failed to update selection model")
+        finally:
+            self._suppress_selection = False
+
+    def setMultiSelection(self, enabled):
+        self._multi_selection = bool(enabled)
+        if not self._multi_selection and len(self._selected_items) > 1:
+            for it in self._selected_items[1:]:
+                it.setSelected(False)
+            self._selected_items = self._selected_items[:1]
+            self._update_value()
+        # If the list view already exists, swap its selection model at runtime.
+        if self._listview is None:
+            return
         try:
-            # Disconnect any previously stored handlers
-            try:
-                for key, hid in list(getattr(self, "_signal_handlers", {}).items()):
-                    if hid and isinstance(hid, int):
-                        try:
-                            self._listbox.disconnect(hid)
-                        except Exception:
-                            pass
-                self._signal_handlers = {}
-            except Exception:
-                self._signal_handlers = {}
-
-            # Connect new handler based on mode
-            if self._multi_selection:
-                try:
-                    hid = self._listbox.connect("selected-rows-changed", lambda lb: self._on_selected_rows_changed(lb))                    
-                    self._signal_handlers['selected-rows-changed'] = hid
-                    hid = self._listbox.connect("row-activated", lambda lb, row: self._on_row_selected_for_multi(lb, row))
-                    self._signal_handlers['row-selected_for_multi'] = hid
-                except Exception:                   
-                    pass
-            else:
-                try:
-                    hid = self._listbox.connect("row-selected", lambda lb, row: self._on_row_selected(lb, row))
-                    self._signal_handlers['row-selected'] = hid
-                except Exception:
-                    pass
-
-                selected_item = old_selected[0] if old_selected else None
-                if selected_item:
-                    if len(old_selected) > 1:
-                        for it in old_selected[1:]:
-                            it.setSelected(False)
-                    self._selected_items = [selected_item]
-                    self._value = self._selected_items[0].label() if self._selected_items else ""
-                    if self._selected_items and self._listbox:
-                        try:
-                            idx = self._items.index( self._selected_items[0] )
-                            row = self._rows[idx]
-                            self._listbox.select_row( row )
-                        except Exception:
-                            pass
-            self._logger.debug("setMultiSelection: mode set to %s - value=%r", "MULTIPLE" if self._multi_selection else "SINGLE", self._value)
+            self._listview.set_model(self._new_selection_model())
+            self._apply_selection_from_items()
+            self._logger.debug("setMultiSelection: mode set to %s - value=%r",
+                               "MULTIPLE" if self._multi_selection else "SINGLE", self._value)
         except Exception:
             self._logger.error("setMultiSelection: failed in multi-selection update", exc_info=True)
-            pass
 
     def multiSelection(self):
         return bool(self._multi_selection)
 
-    def _create_backend_widget(self):
-        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-        if self._label:
-            lbl = Gtk.Label(label=self._label)
+    def _new_selection_model(self):
+        """Create the selection model for the current mode and wire its signal."""
+        if self._selection_model is not None and self._selection_handler is not None:
             try:
-                if hasattr(lbl, "set_xalign"):
-                    lbl.set_xalign(0.0)
+                self._selection_model.disconnect(self._selection_handler)
             except Exception:
                 pass
+        if self._multi_selection:
+            model = Gtk.MultiSelection.new(self._store)
+        else:
+            model = Gtk.SingleSelection.new(self._store)
             try:
-                vbox.append(lbl)
-            except Exception:
-                vbox.add(lbl)
-
-        # Use Gtk.ListBox inside a ScrolledWindow for Gtk4
-        listbox = Gtk.ListBox()
-        listbox.set_selection_mode(Gtk.SelectionMode.MULTIPLE if self._multi_selection else Gtk.SelectionMode.SINGLE)
-        # allow listbox to expand if parent allocates more space (only when logical stretch/weight allows)
-        try:
-            try:
-                vexpand_flag = bool(self.stretchable(YUIDimension.YD_VERT)) or bool(int(self.weight(YUIDimension.YD_VERT)))
-            except Exception:
-                vexpand_flag = bool(self.stretchable(YUIDimension.YD_VERT))
-            try:
-                hexpand_flag = bool(self.stretchable(YUIDimension.YD_HORIZ)) or bool(int(self.weight(YUIDimension.YD_HORIZ)))
-            except Exception:
-                hexpand_flag = bool(self.stretchable(YUIDimension.YD_HORIZ))
-            listbox.set_vexpand(vexpand_flag)
-            listbox.set_hexpand(hexpand_flag)
-        except Exception:
-            pass
-        # populate rows
-        self._rows = []
-        for it in self._items:
-            row = Gtk.ListBoxRow()
-            # build a horizontal container to hold optional icon + label
-            try:
-                widget_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
-            except Exception:
-                widget_box = Gtk.Box()
-
-            # try to resolve icon for this item
-            icon_name = None
-            try:
-                fn = getattr(it, 'iconName', None)
-                if callable(fn):
-                    icon_name = fn()
-                else:
-                    icon_name = fn
-            except Exception:
-                icon_name = None
-
-            img = None
-            try:
-                img = _resolve_icon(icon_name, size=16)
-            except Exception:
-                img = None
-
-            lbl = Gtk.Label(label=it.label() or "")
-            try:
-                if hasattr(lbl, "set_xalign"):
-                    lbl.set_xalign(0.0)
+                model.set_autoselect(False)
+                model.set_can_unselect(True)
             except Exception:
                 pass
+        self._selection_model = model
+        self._selection_handler = model.connect("selection-changed", self._on_selection_changed)
+        return model
 
+    def _create_backend_widget(self):
+        vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        if self._label:
+            lbl = Gtk.Label(label=self._label)
             try:
-                if img is not None:
-                    try:
-                        widget_box.append(img)
-                    except Exception:
-                        try:
-                            widget_box.add(img)
-                        except Exception:
-                            pass
-                # append label after icon (or alone)
-                try:
-                    widget_box.append(lbl)
-                except Exception:
-                    try:
-                        widget_box.add(lbl)
-                    except Exception:
-                        pass
-            except Exception:
-                # worst case: fall back to label only on the row
-                try:
-                    row.set_child(lbl)
-                except Exception:
-                    try:
-                        row.add(lbl)
-                    except Exception:
-                        pass
-
-            # attach widget_box into the row if not already attached
-            try:
-                row.set_child(widget_box)
-            except Exception:
-                try:
-                    row.add(widget_box)
-                except Exception:
-                    # if that fails, ensure label at least
-                    try:
-                        row.set_child(lbl)
-                    except Exception:
-                        try:
-                            row.add(lbl)
-                        except Exception:
-                            pass
-
-            # Make every row selectable so users can multi-select if mode allows.
-            try:
-                row.set_selectable(True)
-            except Exception:
-                pass
-            
-            # If this item matches current value, mark selected
-            try:
-                if self._value and it.label() == self._value:
-                    row.set_selectable(True)
-                    row.set_selected(True)
+                lbl.set_xalign(0.0)
             except Exception:
                 pass
-            self._rows.append(row)
-            listbox.append(row)
+            vbox.append(lbl)
 
-        # Reflect items' selected flags into the view/model.
-        try:
-            if self._multi_selection:
-                for idx, it in enumerate(self._items):
-                    try:
-                        if it.selected():
-                            try:
-                                listbox.select_row( self._rows[idx] )                                
-                            except Exception:
-                                pass
-                            if it not in self._selected_items:
-                                self._selected_items.append(it)
-                            if not self._value:
-                                self._value = it.label()
-                    except Exception:
-                        pass
-            else:
-                last_selected_idx = None
-                for idx, it in enumerate(self._items):
-                    try:
-                        if it.selected():
-                            last_selected_idx = idx
-                    except Exception:
-                        pass
-                if last_selected_idx is not None:
-                    try:
-                        for i, r in enumerate(self._rows):
-                            try:
-                                if i == last_selected_idx:
-                                    listbox.select_row( r )                                
-                            except Exception:
-                                try:
-                                    setattr(r, '_selected_flag', (i == last_selected_idx))
-                                except Exception:
-                                    pass
-                        try:
-                            for i, it in enumerate(self._items):
-                                try:
-                                    it.setSelected(i == last_selected_idx)
-                                except Exception:
-                                    pass
-                        except Exception:
-                            pass
-                        self._selected_items = [self._items[last_selected_idx]]
-                        self._value = self._items[last_selected_idx].label()
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+        self._store = Gio.ListStore.new(_ItemObject)
+        factory = Gtk.SignalListItemFactory.new()
+        factory.connect("setup", lambda f, li: self._factory_setup(li))
+        factory.connect("bind", lambda f, li: self._factory_bind(li))
+        factory.connect("unbind", lambda f, li: self._factory_unbind(li))
+        factory.connect("teardown", lambda f, li: self._factory_teardown(li))
 
-        sw = Gtk.ScrolledWindow()
-        # allow scrolled window to expand vertically and horizontally only when allowed
+        listview = Gtk.ListView.new(self._new_selection_model(), factory)
+        # allow the list to expand if parent allocates more space (only when logical stretch/weight allows)
         try:
-            sw.set_vexpand(vexpand_flag)
-            sw.set_hexpand(hexpand_flag)
-            # give a reasonable minimum content height so layout initially shows several rows;
-            # Gtk4 expects pixels — try a conservative estimate (rows * ~20px)
-            min_h = int(getattr(self, "_preferred_rows", 6) * 20)
-            try:
-                sw.set_min_content_height(min_h)
-            except Exception:
-                pass
+            vexpand_flag = bool(self.stretchable(YUIDimension.YD_VERT)) or bool(int(self.weight(YUIDimension.YD_VERT)))
         except Exception:
-            pass
-        # policy APIs changed in Gtk4: use set_overlay_scrolling and set_min_content_height if needed
+            vexpand_flag = bool(self.stretchable(YUIDimension.YD_VERT))
         try:
-            sw.set_child(listbox)
+            hexpand_flag = bool(self.stretchable(YUIDimension.YD_HORIZ)) or bool(int(self.weight(YUIDimension.YD_HORIZ)))
         except Exception:
-            try:
-                sw.add(listbox)
-            except Exception:
-                pass
-
-        # also request vexpand on the outer vbox so parent layout sees it can grow
+            hexpand_flag = bool(self.stretchable(YUIDimension.YD_HORIZ))
+        listview.set_vexpand(vexpand_flag)
+        listview.set_hexpand(hexpand_flag)
         try:
-            vbox.set_vexpand(vexpand_flag)
-            vbox.set_hexpand(hexpand_flag)
+            listview.connect("activate", self._on_activate)
         except Exception:
             pass
 
+        sw = Gtk.ScrolledWindow()
+        sw.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        sw.set_vexpand(vexpand_flag)
+        sw.set_hexpand(hexpand_flag)
+        # give a reasonable minimum content height so layout initially shows several rows;
+        # Gtk4 expects pixels — try a conservative estimate (rows * ~20px)
         try:
-            vbox.append(sw)
+            sw.set_min_content_height(int(getattr(self, "_preferred_rows", 6) * 20))
         except Exception:
-            vbox.add(sw)
-        
+            pass
+        sw.set_child(listview)
+
+        # also request vexpand on the outer vbox so parent layout sees it can grow
+        vbox.set_vexpand(vexpand_flag)
+        vbox.set_hexpand(hexpand_flag)
+        vbox.append(sw)
+
         self._backend_widget = vbox
-        self._listbox = listbox
-        # connect selection signal: choose appropriate signal per selection mode
-        # if multi-selection has been set before widget creation, ensure correct mode
-        self.setMultiSelection( self._multi_selection )
+        self._listview = listview
+
+        # populate the store with items added before the widget existed
+        self._splice_items(0, list(self._items))
+        self._normalize_initial_selection()
+        self._apply_selection_from_items()
+
         self._backend_widget.set_sensitive(self._enabled)
         self._backend_widget.set_visible(bool(self._visible))
         if self._help_text:
-            listbox.set_tooltip_text(self._help_text)
+            listview.set_tooltip_text(self._help_text)
         self._logger.debug("_create_backend_widget: <%s>", self.debugLabel())
 
-    def setHelpText(self, help_text: str):
-        super().setHelpText(help_text)
-        try:
-            if getattr(self, "_listbox", None) is not None:
-                self._listbox.set_tooltip_text(help_text)
-        except Exception:
-            self._logger.exception("setHelpText failed", exc_info=True)
-
-    def _set_backend_enabled(self, enabled):
-        """Enable/disable the selection box and its listbox/rows."""
+    # ------------------------------------------------------------------
+    # SignalListItemFactory callbacks (called only for visible rows)
+    # ------------------------------------------------------------------
+
+    def _factory_setup(self, list_item):
+        """Create the recyclable row widget: optional icon + label."""
+        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+        img = Gtk.Image()
+        img.set_visible(False)
+        lbl = Gtk.Label()
+        lbl.set_xalign(0.0)
+        lbl.set_hexpand(True)
+        lbl.set_ellipsize(Pango.EllipsizeMode.END)
+        box.append(img)
+        box.append(lbl)
+        box._img = img
+        box._lbl = lbl
         try:
-            if getattr(self, "_listbox", None) is not None:
-                try:
-                    self._listbox.set_sensitive(enabled)
-                except Exception:
-                    pass
+            click = Gtk.GestureClick()
+            click.set_button(Gdk.BUTTON_PRIMARY)
+            click.connect("pressed", self._on_row_pressed, list_item)
+            box.add_controller(click)
         except Exception:
-            pass
+            self._logger.debug("Failed to add row click controller", exc_info=True)
+        list_item.set_child(box)
+
+    def _factory_bind(self, list_item):
+        """Fill the recycled row widget with the bound item's data."""
+        obj = list_item.get_item()
+        box = list_item.get_child()
+        if obj is None or box is None:
+            return
+        obj.list_item = list_item
+        item = obj.item
+        box._lbl.set_text(item.label() or "")
+        img = box._img
+        icon = None
         try:
-            if self._backend_widget is not None:
-                try:
-                    self._backend_widget.set_sensitive(enabled)
-                except Exception:
-                    pass
+            if item.hasIconName():
+                icon = _resolve_icon(item.iconName(), size=16)
         except Exception:
-            pass
-        # propagate logical enabled state to child items/widgets
+            icon = None
+        if icon is None:
+            img.clear()
+            img.set_visible(False)
+            return
         try:
-            for c in list(getattr(self, "_rows", []) or []):
-                try:
-                    c.set_sensitive(enabled)
-                except Exception:
-                    pass
+            paintable = icon.get_paintable()
+            if paintable is not None:
+                img.set_from_paintable(paintable)
+            else:
+                img.set_from_icon_name(icon.get_icon_name())
+            img.set_pixel_size(16)
+            img.set_visible(True)
         except Exception:
-            pass
+            img.set_visible(False)
 
-    def setVisible(self, visible: bool = True):
-        """Show/hide the widget's GTK container."""
-        super().setVisible(visible)
-        if self._backend_widget is not None:
-            try:
-                self._backend_widget.set_visible(bool(visible))
-            except Exception:
-                pass
+    def _factory_unbind(self, list_item):
+        obj = list_item.get_item()
+        if obj is not None and obj.list_item is list_item:
+            obj.list_item = None
 
-    def _row_is_selected(self, r):
-        """Robust helper to detect whether a ListBoxRow is selected."""
+    def _factory_teardown(self, list_item):
         try:
-            return bool(r.get_selected())
+            list_item.set_child(None)
         except Exception:
             pass
+
+    # ------------------------------------------------------------------
+    # Selection handling
+    # ------------------------------------------------------------------
+
+    def _normalize_initial_selection(self):
+        """Rebuild _selected_items from the items' selected() flags.
+
+        In single-selection mode the last selected item wins, as with
+        the other backends.
+        """
+        selected = [it for it in self._items if it.selected()]
+        if not self._multi_selection and len(selected) > 1:
+            for it in selected[:-1]:
+                it.setSelected(False)
+            selected = selected[-1:]
+        self._selected_items = selected
+        self._update_value()
+
+    def _apply_selection_from_items(self):
+        """Push _selected_items into the GTK selection model without notifying."""
+        if self._selection_model is None:
+            return
+        self._suppress_selection = True
         try:
-            props = getattr(r, "props", None)
-            if props and hasattr(props, "selected"):
-                return bool(getattr(props, "selected"))
+            self._selection_model.unselect_all()
+            for it in self._selected_items:
+                pos = self._item_to_pos.get(it)
+                if pos is not None:
+                    self._selection_model.select_item(pos, False)
         except Exception:
-            pass
-        return bool(getattr(r, "_selected_flag", False))
+            self._logger.exception("_apply_selection_from_items failed")
+        finally:
+            self._suppress_selection = False
 
-    def _on_row_selected(self, listbox, row):
-        """
-        Handler for row selection. In single-selection mode behaves as before
-        (select provided row and deselect others). In multi-selection mode toggles
-        the provided row and rebuilds the selected items list.
-        """
+    def _on_selection_changed(self, sel_model, position, n_items):
+        """Update the logical selection for the changed range only."""
+        if self._suppress_selection:
+            return
         try:
-            # rebuild selected_items scanning cached rows (works for both modes)
-            old_item = self._selected_items[0] if self._selected_items else None
-            if old_item:
-                old_item.setSelected( False )
-            idx = self._rows.index(row)            
-            self._selected_items = []
-            self._selected_items.append(self._items[idx])
-            self._items[idx].setSelected( True )
-            self._value = self._selected_items[0].label() if self._selected_items else None
+            if not self._multi_selection:
+                old = self._selected_items[0] if self._selected_items else None
+                pos = sel_model.get_selected()
+                new = None
+                if pos != Gtk.INVALID_LIST_POSITION and 0 <= pos < len(self._items):
+                    new = self._items[pos]
+                if old is not None and old is not new:
+                    old.setSelected(False)
+                if new is not None:
+                    new.setSelected(True)
+                self._selected_items = [new] if new is not None else []
+            else:
+                added = []
+                removed = False
+                end = min(position + n_items, len(self._items))
+                for i in range(position, end):
+                    it = self._items[i]
+                    sel = bool(sel_model.is_selected(i))
+                    if sel and not it.selected():
+                        it.setSelected(True)
+                        added.append(it)
+                    elif not sel and it.selected():
+                        it.setSelected(False)
+                        removed = True
+                if removed:
+                    self._selected_items = [it for it in self._selected_items if it.selected()]
+                for it in added:
+                    if it not in self._selected_items:
+                        self._selected_items.append(it)
+            self._update_value()
         except Exception:
-            try:
-                self._logger.error("SelectionBoxGTK: failed to process row-selected event", exc_info=True)
-            except Exception:
-                pass
-            # be defensive
+            self._logger.error("SelectionBoxGTK: failed to process selection change", exc_info=True)
             self._selected_items = []
-            self._value = None
+            self._value = ""
 
         if self.notify():
             dlg = self.findDialog()
             if dlg is not None:
                 dlg._post_event(YWidgetEvent(self, YEventReason.SelectionChanged))
 
-    def _on_row_selected_for_multi(self, listbox, row):
-        """
-        Handler for row selection in multi-selection mode: for de-selection.
-        """
-        sel_rows = listbox.get_selected_rows()
-        idx = self._rows.index(row)
-        if self._items[idx] in self._old_selected_items:
-            self._listbox.unselect_row( row )
-            self._items[idx].setSelected( False )
-            self._on_selected_rows_changed(listbox)
-        else:
-            self._old_selected_items = self._selected_items
+    def _on_row_pressed(self, gesture, n_press, x, y, list_item):
+        """A plain click toggles the row in multi-selection mode.
 
-
-    def _on_selected_rows_changed(self, listbox):
-        """
-        Handler for multi-selection (or bulk selection change). Rebuild selected list
-        using either ListBox APIs (if available) or by scanning cached rows.
+        Gtk.MultiSelection would replace the selection with the clicked row;
+        claiming the click keeps the list view from doing so.
         """
+        if not self._multi_selection or self._selection_model is None:
+            return
         try:
-            # Try to use any available API that returns selected rows
-            sel_rows = None
-            try:
-                # Some bindings may provide get_selected_rows()
-                sel_rows = listbox.get_selected_rows()
-                try:
-                    self._logger.debug("Using get_selected_rows() API, count=%d", len(sel_rows))
-                except Exception:
-                    pass
-            except Exception:
-                sel_rows = None
+            mods = gesture.get_current_event_state()
+            if mods & (Gdk.ModifierType.CONTROL_MASK | Gdk.ModifierType.SHIFT_MASK):
+                return
+            position = list_item.get_position()
+            if position == Gtk.INVALID_LIST_POSITION:
+                return
+            gesture.set_state(Gtk.EventSequenceState.CLAIMED)
+            self._toggle_row(position)
+        except Exception:
+            self._logger.exception("_on_row_pressed failed")
 
-            self._old_selected_items = self._selected_items
-            self._selected_items = []
-            if sel_rows:
-                # sel_rows may be list of Row objects or Paths; try to match by identity
-                for r in sel_rows:
-                    try:
-                        # if r is a ListBoxRow already
-                        if isinstance(r, type(self._rows[0])) if self._rows else False:
-                            try:
-                                idx = self._rows.index(r)
-                                if idx < len(self._items):
-                                    self._selected_items.append(self._items[idx])
-                                    self._items[idx].setSelected( True )
-                            except Exception:
-                                pass
-                        else:
-                            # fallback: scan cached rows to find selected ones
-                            for i, cr in enumerate(getattr(self, "_rows", [])):
-                                try:
-                                    if self._row_is_selected(cr) and i < len(self._items):
-                                        self._selected_items.append(self._items[i])
-                                        self._items[i].setSelected( True )
-                                except Exception:
-                                    pass
-                    except Exception:
-                        pass
+    def _on_activate(self, listview, position):
+        """Enter toggles the activated row in multi-selection mode."""
+        if not self._multi_selection or self._selection_model is None:
+            return
+        self._toggle_row(position)
+
+    def _toggle_row(self, position):
+        try:
+            if self._selection_model.is_selected(position):
+                self._selection_model.unselect_item(position)
             else:
-                # Generic fallback: scan cached rows and collect selected ones
-                for i, r in enumerate(getattr(self, "_rows", [])):
-                    try:
-                        if self._row_is_selected(r) and i < len(self._items):
-                            self._selected_items.append(self._items[i])
-                    except Exception:
-                        pass
-
-            self._value = self._selected_items[0].label() if self._selected_items else None
+                self._selection_model.select_item(position, False)
         except Exception:
-            self._selected_items = []
-            self._value = None
+            self._logger.exception("_toggle_row failed")
 
-        if self.notify():
-            dlg = self.findDialog()
-            if dlg is not None:
-                dlg._post_event(YWidgetEvent(self, YEventReason.SelectionChanged))
+    # ------------------------------------------------------------------
+    # Item management
+    # ------------------------------------------------------------------
 
+    def _splice_items(self, start, items):
+        """Insert *items* at *start* in the store with one splice() call."""
+        for offset, it in enumerate(items):
+            self._item_to_pos[it] = start + offset
+        if self._store is None or not items:
+            return
+        self._suppress_selection = True
+        try:
+            self._store.splice(start, 0, [_ItemObject(it) for it in items])
+        finally:
+            self._suppress_selection = False
+
+    def _apply_item_diff(self, diff):
+        """Apply setItems() changes with one splice() per changed run of rows."""
+        if self._store is not None:
+            self._suppress_selection = True
+            try:
+                for row, count in diff.removed:
+                    self._store.splice(row, count, [])
+                for row, new_items in diff.inserted:
+                    self._store.splice(row, 0, [_ItemObject(it) for it in new_items])
+                for row, _old, new, changed in diff.kept:
+                    if changed:
+                        # replacing the object rebinds just this row
+                        self._store.splice(row, 1, [_ItemObject(new)])
+                    else:
+                        self._store.get_item(row).item = new
+            except Exception:
+                self._logger.exception("_apply_item_diff: store update failed")
+            finally:
+                self._suppress_selection = False
+        self._replace_items(diff)
+        self._item_to_pos = {it: pos for pos, it in enumerate(self._items)}
+        self._normalize_initial_selection()
+        self._apply_selection_from_items()
+
+    def _item_rows(self, items):
+        """Return {item: row} for *items* in the box, via _item_to_pos."""
+        rows = {}
+        for it in items:
+            pos = self._item_to_pos.get(it)
+            if pos is not None:
+                rows[it] = pos
+        return rows
+
+    def _remove_rows(self, row, count):
+        """Drop a run of rows with one store.splice(); the selection model
+        drops their selection by itself."""
+        if self._store is not None:
+            self._suppress_selection = True
+            try:
+                self._store.splice(row, count, [])
+            except Exception:
+                self._logger.exception("_remove_rows: store update failed")
+            finally:
+                self._suppress_selection = False
+        self._delete_run(None, row, count)
+
+    def _rows_removed(self, first, gone):
+        """Renumber _item_to_pos from the first removed row on only."""
+        for it in gone:
+            self._item_to_pos.pop(it, None)
+        for pos in range(first, len(self._items)):
+            it = self._items[pos]
+            self._item_to_pos[it] = pos
+            it.setIndex(pos)
+        self._update_value()
+
+    def _refresh_item(self, item, what):
+        """Rebind the row of an item whose label or icon changed.
+
+        Rows scrolled out of view are left alone: bind reads the item again
+        when they come back.
+        """
+        self._update_value()
+        pos = self._item_to_pos.get(item)
+        if self._store is None or pos is None:
+            return
+        obj = self._store.get_item(pos)
+        if obj is not None and obj.list_item is not None:
+            self._factory_bind(obj.list_item)
 
     def deleteAllItems(self):
         """Remove all items from the selection box (model + GTK view)."""
-        # Clear internal model
         super().deleteAllItems()
         self._value = ""
         self._selected_items = []
-
-        # Clear GTK rows/listbox
-        try:
-            rows = list(getattr(self, '_rows', []) or [])
-            for r in rows:
-                try:
-                    if getattr(self, '_listbox', None) is not None:
-                        try:
-                            self._listbox.remove(r)
-                        except Exception:
-                            try:
-                                # fallback: unparent the row
-                                r.unparent()
-                            except Exception:
-                                pass
-                except Exception:
-                    pass
-            self._rows = []
-        except Exception:
-            pass
+        self._item_to_pos.clear()
+        if self._store is not None:
+            self._suppress_selection = True
+            try:
+                self._store.remove_all()
+            except Exception:
+                self._logger.exception("deleteAllItems: remove_all failed")
+            finally:
+                self._suppress_selection = False
 
     def addItem(self, item):
         """Add a single item to the selection box (model + GTK view)."""
-        super().addItem(item)
+        self.addItems([item])
+
+    def addItems(self, items):
+        """Add multiple items with a single Gio.ListStore.splice() call."""
+        start = len(self._items)
+        for it in items:
+            YSelectionWidget.addItem(self, it)
+        new_items = self._items[start:]
+        if not new_items:
+            return
+        for offset, it in enumerate(new_items):
+            try:
+                it.setIndex(start + offset)
+            except Exception:
+                pass
+        self._splice_items(start, new_items)
+
+        # reflect selected state (no notification on add)
+        pre_selected = [it for it in new_items if it.selected()]
+        if not pre_selected:
+            return
+        if self._multi_selection:
+            for it in pre_selected:
+                if it not in self._selected_items:
+                    self._selected_items.append(it)
+        else:
+            for it in self._selected_items + pre_selected[:-1]:
+                it.setSelected(False)
+            self._selected_items = [pre_selected[-1]]
+        self._update_value()
+        if self._selection_model is not None:
+            self._apply_selection_from_items()
+
+    # ------------------------------------------------------------------
+    # YWidget overrides
+    # ------------------------------------------------------------------
+
+    def setHelpText(self, help_text: str):
+        super().setHelpText(help_text)
         try:
-            new_item = self._items[-1]
+            if getattr(self, "_listview", None) is not None:
+                self._listview.set_tooltip_text(help_text)
         except Exception:
-            return
+            self._logger.exception("setHelpText failed", exc_info=True)
 
+    def _set_backend_enabled(self, enabled):
+        """Enable/disable the selection box and its list view."""
         try:
-            new_item.setIndex(len(self._items) - 1)
+            if getattr(self, "_listview", None) is not None:
+                self._listview.set_sensitive(enabled)
         except Exception:
             pass
-
-        # If listbox exists, create a new row and append
         try:
-            if getattr(self, '_listbox', None) is not None:
-                row = Gtk.ListBoxRow()
-                # build widget with optional icon + label
-                try:
-                    widget_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
-                except Exception:
-                    widget_box = Gtk.Box()
-
-                icon_name = None
-                try:
-                    fn = getattr(new_item, 'iconName', None)
-                    if callable(fn):
-                        icon_name = fn()
-                    else:
-                        icon_name = fn
-                except Exception:
-                    icon_name = None
-
-                img = None
-                try:
-                    img = _resolve_icon(icon_name, size=16)
-                except Exception:
-                    img = None
-
-                lbl = Gtk.Label(label=new_item.label() or "")
-                try:
-                    if hasattr(lbl, "set_xalign"):
-                        lbl.set_xalign(0.0)
-                except Exception:
-                    pass
-
-                try:
-                    if img is not None:
-                        try:
-                            widget_box.append(img)
-                        except Exception:
-                            try:
-                                widget_box.add(img)
-                            except Exception:
-                                pass
-                    try:
-                        widget_box.append(lbl)
-                    except Exception:
-                        try:
-                            widget_box.add(lbl)
-                        except Exception:
-                            pass
-                except Exception:
-                    try:
-                        row.set_child(lbl)
-                    except Exception:
-                        try:
-                            row.add(lbl)
-                        except Exception:
-                            pass
-
-                try:
-                    row.set_child(widget_box)
-                except Exception:
-                    try:
-                        row.add(widget_box)
-                    except Exception:
-                        try:
-                            row.set_child(lbl)
-                        except Exception:
-                            try:
-                                row.add(lbl)
-                            except Exception:
-                                pass
-
-                try:
-                    row.set_selectable(True)
-                except Exception:
-                    pass
-
-                # append the row first so selection APIs operate on attached rows
-                try:
-                    try:
-                        self._listbox.append(row)
-                    except Exception:
-                        try:
-                            self._listbox.add(row)
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                try:
-                    self._rows.append(row)
-                except Exception:
-                    pass
-
-                # reflect selected state (no notification on add)
-                try:
-                    if new_item.selected():
-                        # single-selection: clear previous selections
-                        if not self._multi_selection:
-                            try:
-                                for r in getattr(self, '_rows', []):
-                                    try:
-                                        self._listbox.unselect_row( r )
-                                        #r.set_selected(False)
-                                    except Exception:
-                                        try:
-                                            self._logger.error("Failed to deselect row", exc_info=True)
-                                        except Exception:
-                                            pass
-                                        try:
-                                            setattr(r, '_selected_flag', False)
-                                        except Exception:
-                                            pass
-                            except Exception:
-                                pass
-                            try:
-                                for it in self._items[:-1]:
-                                    try:
-                                        it.setSelected(False)
-                                    except Exception:
-                                        pass
-                            except Exception:
-                                pass
-
-                        try:
-                            self._listbox.select_row( row )
-                        except Exception:
-                            try:
-                                setattr(row, '_selected_flag', True)
-                            except Exception:
-                                pass
-
-                        try:
-                            new_item.setSelected(True)
-                        except Exception:
-                            pass
-
-                        if new_item not in self._selected_items:
-                            self._selected_items.append(new_item)
-                        if not self._value:
-                            self._value = new_item.label()
-                except Exception:
-                    pass
+            if self._backend_widget is not None:
+                self._backend_widget.set_sensitive(enabled)
         except Exception:
             pass
 
+    def setVisible(self, visible: bool = True):
+        """Show/hide the widget's GTK container."""
+        super().setVisible(visible)
+        if self._backend_widget is not None:
+            try:
+                self._backend_widget.set_visible(bool(visible))
+            except Exception:
+                pass
@@ -18,7 +18,7 @@ Pipeline
   Gio.ListStore[_RowObject]           -- data store,  O(1) append / O(N) splice
       |
       v
-  Gtk.SortListModel                   -- sorting layer driven by header clicks
+  Gtk.FilterListModel                 -- setFilter() layer, pass-through when unset
       |
       v
   Gtk.SingleSelection / MultiSelection -- selection model
@@ -37,13 +37,36 @@ Complexity comparison
   rebuildTable()  O(N x cols) widgets     O(N) _RowObject alloc + splice()
   addItem()       O(N x cols)             O(1) store.append()
   addItems(N)     O(N x cols)             O(N) store.splice()
+  removeItems()   --                      one store.splice() per contiguous run
   scroll repaint  O(visible x cols)       O(visible x cols)  -- same
 
 Sorting
 -------
-Clicking a column header toggles Ascending / Descending / None via
-Gtk.ColumnViewSorter.  Sort key is cell.sortKey() if set, else cell.label().
-Checkbox columns sort by checked state (False < True).
+Clicking a column header toggles Ascending / Descending via
+Gtk.ColumnViewSorter, which also remembers the previously clicked columns.
+The sorter only drives the header indicators: on its "changed" signal the
+shared YTableSort reorders _items with cached typed keys
+(YTableCell.sortValue()) and the store is refilled with one splice(), so
+no Python compare callback runs per pair of rows.  The store order thus
+always equals the _items order.
+
+Filtering
+---------
+setFilter() installs a Gtk.CustomFilter on the FilterListModel; each row is
+tested against the shared YTableFilter text index.  Typing more characters
+reports Gtk.FilterChange.MORE_STRICT so GTK only re-tests the rows still
+shown.
+
+Selection
+---------
+_item_to_pos maps each item to its store row and is adjusted in place on
+append, splice and removal; _item_to_obj maps it to its _RowObject, so
+sorting and row refreshes never read the store back row by row.  The
+selection model indexes the filter model, so selected rows are translated
+lazily through a bisect over the shown store rows (identity when no filter
+is set); syncing the selection after adding, sorting or filtering costs
+O(selected), not O(N).  rebuildTable() and setItems() hand over the
+flagged items they collect while walking the rows anyway.
 
 Preserved features
 ------------------
@@ -60,6 +83,7 @@ import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('Gdk', '4.0')
 from gi.repository import Gtk, GLib, Gdk, GObject, Gio, Pango
+import bisect
 import logging
 from ...yui_common import *
 
@@ -80,6 +104,10 @@ class _RowObject(GObject.Object):
     def __init__(self, item: YTableItem):
         super().__init__()
         self.item = item
+        # column -> cell slot currently showing this row (see _factory_bind)
+        self.bound = {}
+        # last result of the row filter (see YTableGtk._filter_row)
+        self.shown = True
 
 
 class YTableGtk(YSelectionWidget):
@@ -94,7 +122,7 @@ class YTableGtk(YSelectionWidget):
     Features
     --------
     - Virtual rendering: ~20-40 row widgets allocated regardless of total rows
-    - Sortable columns via clickable column headers (Gtk.SortListModel)
+    - Multi-column sort via clickable column headers or sortByColumns()
     - Resizable columns via Gtk.ColumnViewColumn.set_resizable(True)
     - Checkbox column support with alignment
     - Single / multi selection
@@ -124,11 +152,21 @@ class YTableGtk(YSelectionWidget):
         self._backend_widget = None   # outer Gtk.ScrolledWindow
         self._column_view = None      # Gtk.ColumnView
         self._store = None            # Gio.ListStore[_RowObject]
-        self._sort_model = None       # Gtk.SortListModel
+        self._filter_model = None     # Gtk.FilterListModel
+        self._row_filter = None       # Gtk.CustomFilter used while filtering
         self._selection_model = None  # Single / MultiSelection
+        self._filter = YTableFilter()
+        self._sort = YTableSort()
+        self._columns = []            # Gtk.ColumnViewColumn per header column
+        self._updating_sort_indicator = False
 
-        # item -> position in _store (before sorting)
+        # item -> position in _items / _store, kept up to date incrementally
         self._item_to_pos: dict = {}
+        # item -> its _RowObject in _store
+        self._item_to_obj: dict = {}
+        # store positions the filter shows, ascending; built lazily by
+        # _view_pos() and dropped (None) when rows move or the filter changes
+        self._shown_pos = None
         self._suppress_selection = False
         self._changed_item = None
 
@@ -227,7 +265,7 @@ class YTableGtk(YSelectionWidget):
         Gtk.ScrolledWindow
           +-- Gtk.ColumnView  (virtual, one column per YTableHeader column)
                 model: Gtk.SingleSelection | Gtk.MultiSelection
-                         +-- Gtk.SortListModel
+                         +-- Gtk.FilterListModel
                                +-- Gio.ListStore[_RowObject]
         """
         self._install_css()
@@ -235,14 +273,18 @@ class YTableGtk(YSelectionWidget):
         # Data store
         self._store = Gio.ListStore.new(_RowObject)
 
-        # Sorting layer -- driven by ColumnView header clicks automatically.
-        self._sort_model = Gtk.SortListModel.new(self._store, None)
+        # Filter layer -- no filter (pass-through) until setFilter().
+        self._row_filter = Gtk.CustomFilter.new(self._filter_row, None)
+        self._filter_model = Gtk.FilterListModel.new(
+            self._store,
+            self._row_filter if self._filter.isActive() else None,
+        )
 
         # Selection model
         if self._multi:
-            self._selection_model = Gtk.MultiSelection.new(self._sort_model)
+            self._selection_model = Gtk.MultiSelection.new(self._filter_model)
         else:
-            self._selection_model = Gtk.SingleSelection.new(self._sort_model)
+            self._selection_model = Gtk.SingleSelection.new(self._filter_model)
             try:
                 self._selection_model.set_autoselect(False)
             except Exception:
@@ -259,12 +301,12 @@ class YTableGtk(YSelectionWidget):
         except Exception:
             pass
 
-        # Wire the ColumnView's built-in sorter to SortListModel so that
-        # clicking a header automatically sorts the model.
+        # Header clicks update the ColumnView's sorter; the rows are
+        # reordered by _on_sort_changed().
         try:
-            self._sort_model.set_sorter(self._column_view.get_sorter())
+            self._column_view.get_sorter().connect("changed", self._on_sort_changed)
         except Exception as exc:
-            self._logger.debug("set_sorter failed: %s", exc)
+            self._logger.debug("sorter changed connect failed: %s", exc)
 
         # Build one column per header entry.
         self._build_columns()
@@ -334,42 +376,15 @@ class YTableGtk(YSelectionWidget):
             # Checkbox columns are narrow; text columns expand to fill space.
             column.set_expand(not is_cb)
 
-            # Attach a CustomSorter so the column is sortable.
+            # The column sorter only makes the header clickable: it is never
+            # attached to a model, rows are sorted by _on_sort_changed().
             try:
-                sorter = Gtk.CustomSorter.new(
-                    self._make_sort_func(col), None
-                )
-                column.set_sorter(sorter)
+                column.set_sorter(Gtk.StringSorter.new(None))
             except Exception as exc:
                 self._logger.debug("column %d sorter failed: %s", col, exc)
 
             self._column_view.append_column(column)
-
-    def _make_sort_func(self, col: int):
-        """Return a GtkCustomSorterFunc for column *col*."""
-        is_cb = self._header_is_checkbox(col)
-
-        def _sort(a: GObject.Object, b: GObject.Object, _user_data) -> int:
-            def _key(obj):
-                try:
-                    cell = obj.item.cell(col)
-                    if cell is None:
-                        return ""
-                    if is_cb:
-                        return 0 if not cell.checked() else 1
-                    if hasattr(cell, 'hasSortKey') and cell.hasSortKey():
-                        return str(cell.sortKey())
-                    return cell.label() or ""
-                except Exception:
-                    return ""
-
-            ka, kb = _key(a), _key(b)
-            if ka < kb:
-                return -1
-            if ka > kb:
-                return 1
-            return 0
-        return _sort
+            self._columns.append(column)
 
     # ------------------------------------------------------------------
     # SignalListItemFactory callbacks  (called only for visible rows)
@@ -442,6 +457,7 @@ class YTableGtk(YSelectionWidget):
         child = list_item.get_child()
         if child is None:
             return
+        row_obj.bound[col] = list_item
 
         if self._header_is_checkbox(col):
             chk = getattr(child, '_chk', None)
@@ -465,8 +481,10 @@ class YTableGtk(YSelectionWidget):
 
             chk.set_active(checked)
 
-            def _on_toggled(btn, _item=item, _col=col):
+            def _on_toggled(btn, _row=row_obj, _col=col):
                 try:
+                    # read the item at toggle time: setItems() may swap it
+                    _item = _row.item
                     c = _item.cell(_col)
                     if c is not None:
                         c.setChecked(bool(btn.get_active()))
@@ -495,6 +513,9 @@ class YTableGtk(YSelectionWidget):
 
         Prevents stale item references from leaking into the recycled widget.
         """
+        row_obj = list_item.get_item()
+        if row_obj is not None and row_obj.bound.get(col) is list_item:
+            del row_obj.bound[col]
         if not self._header_is_checkbox(col):
             return
         child = list_item.get_child()
@@ -528,17 +549,19 @@ class YTableGtk(YSelectionWidget):
                            position, n_items)
         try:
             new_selected = []
-            n = self._sort_model.get_n_items()
-            for i in range(n):
-                if sel_model.is_selected(i):
-                    row_obj = self._sort_model.get_item(i)
-                    if row_obj is not None:
-                        new_selected.append(row_obj.item)
+            for i in self._selected_positions(sel_model):
+                row_obj = self._filter_model.get_item(i)
+                if row_obj is not None:
+                    new_selected.append(row_obj.item)
 
             if not self._multi and len(new_selected) > 1:
                 new_selected = [new_selected[-1]]
+            elif self._multi and self._filter.isActive():
+                # rows hidden by the filter keep their selection
+                new_selected += [it for it in self._selected_items
+                                 if not self._filter.matches(it)]
 
-            for it in list(getattr(self, '_items', []) or []):
+            for it in self._selected_items:
                 try:
                     it.setSelected(False)
                 except Exception:
@@ -568,51 +591,83 @@ class YTableGtk(YSelectionWidget):
     # ------------------------------------------------------------------
 
     def _rebuild_index(self):
-        """Rebuild _item_to_pos from the current _store contents."""
-        self._item_to_pos.clear()
-        n = self._store.get_n_items()
-        for i in range(n):
-            obj = self._store.get_item(i)
-            if obj is not None:
-                self._item_to_pos[obj.item] = i
+        """Rebuild _item_to_pos from _items (the store holds the same order)."""
+        self._item_to_pos = {it: pos for pos, it in enumerate(self._items)}
+        self._shown_pos = None
+
+    def _selected_positions(self, sel_model):
+        """Return the selected filter-model positions, O(selected)."""
+        try:
+            bitset = sel_model.get_selection()
+            return [bitset.get_nth(i) for i in range(bitset.get_size())]
+        except Exception:
+            return [i for i in range(self._filter_model.get_n_items())
+                    if sel_model.is_selected(i)]
 
-    def _apply_selection_from_model(self):
+    def _view_pos(self, item):
         """
-        Apply YTableItem.selected() flags to the GtkSelectionModel.
+        Return the position of *item* in the filter model, or None when it
+        is not in the table or the filter hides it.
 
-        Called after rebuildTable() / addItems().  Positions are looked up in
-        the sort model (which may reorder rows) rather than the raw store.
+        Without a filter this is the store position.  With one, the shown
+        store positions are collected once and then searched with bisect,
+        so only the rows actually being selected are translated.
+        """
+        pos = self._item_to_pos.get(item)
+        if pos is None or not self._filter.isActive():
+            return pos
+        if self._shown_pos is None:
+            matches = self._filter.matches
+            self._shown_pos = [p for p, it in enumerate(self._items) if matches(it)]
+        i = bisect.bisect_left(self._shown_pos, pos)
+        if i < len(self._shown_pos) and self._shown_pos[i] == pos:
+            return i
+        return None
+
+    def _apply_selection_from_model(self, flagged):
+        """
+        Apply the selection of *flagged*, the items whose selected() flag is
+        set in row order, to the GtkSelectionModel.
+
+        Called after rebuildTable() and setItems(), which collect the flagged
+        items while walking the rows anyway; this pass is O(selected), each
+        row being translated to its filter-model position by _view_pos().
         """
         if self._selection_model is None:
             return
         self._suppress_selection = True
         try:
             self._selection_model.unselect_all()
-            n = self._sort_model.get_n_items()
-            selected_positions = []
-            for i in range(n):
-                obj = self._sort_model.get_item(i)
-                if obj is not None:
-                    try:
-                        if obj.item.selected():
-                            selected_positions.append(i)
-                    except Exception:
-                        pass
-
-            if not self._multi and len(selected_positions) > 1:
-                selected_positions = [selected_positions[0]]
-
-            for pos in selected_positions:
+            shown = []
+            hidden = []
+            for it in flagged:
+                pos = self._view_pos(it)
+                if pos is None:
+                    hidden.append(it)
+                else:
+                    shown.append((pos, it))
+
+            extra = []
+            if not self._multi and len(shown) > 1:
+                shown, extra = shown[:1], shown[1:]
+
+            for pos, _it in shown:
                 try:
                     self._selection_model.select_item(pos, False)
                 except Exception:
                     pass
 
-            self._selected_items = []
-            for pos in selected_positions:
-                obj = self._sort_model.get_item(pos)
-                if obj is not None:
-                    self._selected_items.append(obj.item)
+            # rows hidden by the filter keep their selection
+            self._selected_items = [it for _pos, it in shown]
+            if self._multi:
+                self._selected_items += hidden
+            elif not self._selected_items:
+                self._selected_items = hidden[:1]
+            if not self._multi:
+                # single selection: only the kept row stays flagged
+                for it in [it for _pos, it in extra] + hidden:
+                    if it not in self._selected_items:
+                        it.setSelected(False)
         except Exception as exc:
             self._logger.debug("_apply_selection_from_model: %s", exc)
         finally:
@@ -661,15 +716,16 @@ class YTableGtk(YSelectionWidget):
         self._suppress_selection = True
         try:
             new_objects = [_RowObject(it) for it in items]
+            self._item_to_obj = dict(zip(items, new_objects))
             # splice(pos, n_remove, additions) replaces everything atomically.
             self._store.splice(0, self._store.get_n_items(), new_objects)
-            self._rebuild_index()
         except Exception as exc:
             self._logger.debug("rebuildTable: splice failed: %s", exc)
         finally:
             self._suppress_selection = False
+        self._rebuild_index()
 
-        self._apply_selection_from_model()
+        self._apply_selection_from_model([it for it in items if it.selected()])
         self._logger.debug("rebuildTable: done")
 
     def addItem(self, item):
@@ -681,50 +737,35 @@ class YTableGtk(YSelectionWidget):
         if not isinstance(item, YTableItem):
             raise TypeError("YTableGtk.addItem expects a YTableItem or str")
         super().addItem(item)
-        item.setIndex(len(self._items) - 1)
+        pos = len(self._items) - 1
+        item.setIndex(pos)
+        self._item_to_pos[item] = pos
 
         if self._store is None:
+            self._sort_in()
             return  # will be populated on first _create_backend_widget
 
-        pos = self._store.get_n_items()
-        self._item_to_pos[item] = pos
-        self._store.append(_RowObject(item))
+        obj = _RowObject(item)
+        self._item_to_obj[item] = obj
+        self._store.append(obj)
+        self._note_appended(pos)
+        self._sort_in()
 
         # Apply pre-selection if item arrives pre-marked.
         if getattr(item, 'selected', lambda: False)():
-            self._suppress_selection = True
             try:
-                n = self._sort_model.get_n_items()
-                for i in range(n):
-                    obj = self._sort_model.get_item(i)
-                    if obj is not None and obj.item is item:
-                        if not self._multi:
-                            self._selection_model.unselect_all()
-                            for prev in list(self._selected_items):
-                                try:
-                                    prev.setSelected(False)
-                                except Exception:
-                                    pass
-                            self._selected_items = []
-                        self._selection_model.select_item(i, False)
-                        item.setSelected(True)
-                        if not self._multi:
-                            self._selected_items = [item]
-                        elif item not in self._selected_items:
-                            self._selected_items.append(item)
-                        break
+                self.selectItem(item, True)
             except Exception as exc:
                 self._logger.debug("addItem: pre-selection failed: %s", exc)
-            finally:
-                self._suppress_selection = False
 
     def addItems(self, items):
         """
         Add multiple items in a single batch.
 
-        O(N): wraps items in _RowObject then calls one store.splice() at the
-        tail.  GtkColumnView receives a single items-changed notification and
-        repaints the visible viewport only once.
+        O(k) for k new items: wraps them in _RowObject then calls one
+        store.splice() at the tail.  GtkColumnView receives a single
+        items-changed notification and repaints the visible viewport only
+        once; only the new pre-selected rows touch the selection model.
         """
         items = list(items)
         if not items:
@@ -741,19 +782,38 @@ class YTableGtk(YSelectionWidget):
             else:
                 raise TypeError("YTableGtk.addItems expects YTableItem or str")
             item.setIndex(len(self._items) - 1)
+            self._item_to_pos[item] = len(self._items) - 1
             new_objs.append((item, _RowObject(item)))
 
         if self._store is None:
+            self._sort_in()
             return  # will be populated in _create_backend_widget
 
         self._store.splice(
             start_pos, 0,
             [obj for _, obj in new_objs]
         )
-        for idx, (item, _) in enumerate(new_objs):
-            self._item_to_pos[item] = start_pos + idx
+        self._item_to_obj.update(new_objs)
+        self._note_appended(start_pos)
+        self._sort_in()
 
-        self._apply_selection_from_model()
+        # the existing selection is already applied: only new pre-selected
+        # rows need a pass (keeps chunked addItemsAsync() linear)
+        for item, _ in new_objs:
+            try:
+                if item.selected():
+                    self.selectItem(item, True)
+            except Exception as exc:
+                self._logger.debug("addItems: pre-selection failed: %s", exc)
+
+    def _note_appended(self, start_pos: int):
+        """Extend the cached shown positions with the rows from *start_pos* on."""
+        if self._shown_pos is None or not self._filter.isActive():
+            return
+        matches = self._filter.matches
+        self._shown_pos.extend(
+            p for p in range(start_pos, len(self._items)) if matches(self._items[p])
+        )
 
     def selectItem(self, item, selected: bool = True):
         """Select or deselect *item* in both model and view."""
@@ -776,15 +836,11 @@ class YTableGtk(YSelectionWidget):
                     pass
             return
 
-        # Find position in sort model.
-        n = self._sort_model.get_n_items()
-        pos = None
-        for i in range(n):
-            obj = self._sort_model.get_item(i)
-            if obj is not None and obj.item is item:
-                pos = i
-                break
+        pos = self._view_pos(item)
         if pos is None:
+            if item in self._item_to_pos:
+                # row hidden by the filter: only the model selection changes
+                self._select_hidden(item, selected)
             return
 
         self._suppress_selection = True
@@ -815,6 +871,143 @@ class YTableGtk(YSelectionWidget):
         finally:
             self._suppress_selection = False
 
+    def _select_hidden(self, item, selected: bool):
+        """Update the selection for a row the filter currently hides."""
+        if selected:
+            if not self._multi:
+                self._suppress_selection = True
+                try:
+                    self._selection_model.unselect_all()
+                finally:
+                    self._suppress_selection = False
+                for prev in list(self._selected_items):
+                    if prev is not item:
+                        try:
+                            prev.setSelected(False)
+                        except Exception:
+                            pass
+                self._selected_items = [item]
+            elif item not in self._selected_items:
+                self._selected_items.append(item)
+        else:
+            try:
+                self._selected_items.remove(item)
+            except ValueError:
+                pass
+
+    def _apply_item_diff(self, diff):
+        """
+        Apply setItems() changes to the Gio.ListStore.
+
+        One splice() per removed or inserted run of rows; kept rows whose
+        cells changed are replaced individually so only they are rebound,
+        unchanged rows just get the new item swapped into their _RowObject.
+        """
+        self._filter.carryOver(diff)
+        if self._store is not None:
+            old_objs = self._item_to_obj
+            self._item_to_obj = {}
+            self._suppress_selection = True
+            try:
+                for row, count in diff.removed:
+                    self._store.splice(row, count, [])
+                for row, new_items in diff.inserted:
+                    objs = [_RowObject(it) for it in new_items]
+                    self._item_to_obj.update(zip(new_items, objs))
+                    self._store.splice(row, 0, objs)
+                for row, old, new, changed in diff.kept:
+                    obj = old_objs.get(old)
+                    if changed or obj is None:
+                        obj = _RowObject(new)
+                        self._store.splice(row, 1, [obj])
+                    else:
+                        obj.item = new
+                    self._item_to_obj[new] = obj
+            except Exception as exc:
+                self._logger.debug("_apply_item_diff: store update failed: %s", exc)
+            finally:
+                self._suppress_selection = False
+        selected = self._replace_items(diff)
+        self._rebuild_index()
+        if self._changed_item is not None:
+            self._changed_item = dict(diff.pairs).get(self._changed_item)
+        if self._selection_model is not None:
+            self._apply_selection_from_model(selected)
+        else:
+            self._selected_items = selected if self._multi else selected[:1]
+        self._sort_in()
+
+    def _refresh_item(self, item, what):
+        """
+        Rebind the visible cells of one row after its cells changed.
+
+        The cell widgets are updated in place, so the row keeps its selection
+        and focus; rows outside the viewport are refreshed by bind() when
+        they scroll in.  A row whose filter match changed is spliced back
+        into the store so the FilterListModel re-tests it, and with an active
+        sort the rows are re-sorted.
+        """
+        self._filter.invalidate(item)
+        if ("cell" in what or "label" in what) and self._sort.keys():
+            self._apply_sort()
+            return
+        pos = self._item_to_pos.get(item)
+        row_obj = self._item_to_obj.get(item)
+        if self._store is None or pos is None or row_obj is None:
+            return
+        if self._filter.isActive() and row_obj.shown != self._filter.matches(item):
+            self._shown_pos = None
+            self._suppress_selection = True
+            try:
+                self._store.splice(pos, 1, [row_obj])
+            finally:
+                self._suppress_selection = False
+            if item in self._selected_items:
+                self.selectItem(item, True)
+            return
+        for col, list_item in list(row_obj.bound.items()):
+            self._factory_bind(list_item, col)
+
+    def _item_rows(self, items):
+        """Return {item: row} for *items* in the table, via _item_to_pos."""
+        rows = {}
+        for it in items:
+            pos = self._item_to_pos.get(it)
+            if pos is not None:
+                rows[it] = pos
+        return rows
+
+    def _remove_item_runs(self, runs, gone):
+        """
+        Remove each contiguous run of rows with one store.splice().
+
+        The selection model drops removed rows by itself; the other rows
+        keep their selection.  _item_to_pos is renumbered from the first
+        removed row on only.
+        """
+        self._suppress_selection = True
+        try:
+            for row, count in runs.get(None, []):
+                if self._store is not None:
+                    self._store.splice(row, count, [])
+                self._delete_run(None, row, count)
+        except Exception as exc:
+            self._logger.debug("_remove_item_runs failed: %s", exc)
+        finally:
+            self._suppress_selection = False
+        self._shown_pos = None
+        for it in gone:
+            self._item_to_pos.pop(it, None)
+            self._item_to_obj.pop(it, None)
+            self._filter.invalidate(it)
+        first = min((row for row, _count in runs.get(None, [])), default=len(self._items))
+        for pos in range(first, len(self._items)):
+            it = self._items[pos]
+            self._item_to_pos[it] = pos
+            it.setIndex(pos)
+        if self._changed_item in gone:
+            self._changed_item = None
+
     def deleteAllItems(self):
         """Clear all items from the table."""
         try:
@@ -824,6 +1017,9 @@ class YTableGtk(YSelectionWidget):
         self._selected_items = []
         self._changed_item = None
         self._item_to_pos.clear()
+        self._item_to_obj.clear()
+        self._shown_pos = None
+        self._filter.invalidate()
         if self._store is not None:
             self._suppress_selection = True
             try:
@@ -833,6 +1029,156 @@ class YTableGtk(YSelectionWidget):
             finally:
                 self._suppress_selection = False
 
+    # ------------------------------------------------------------------
+    # Filtering
+    # ------------------------------------------------------------------
+
+    def _filter_row(self, row_obj: GObject.Object, _user_data) -> bool:
+        """GtkCustomFilterFunc: test one row against the YTableFilter."""
+        try:
+            shown = self._filter.matches(row_obj.item)
+        except Exception:
+            shown = True
+        row_obj.shown = shown
+        return shown
+
+    def setFilter(self, text="", columns=None, mode="substring"):
+        """
+        Show only the rows matching *text*; an empty text shows all rows.
+
+        *columns* restricts matching to the given column numbers and *mode*
+        is "substring", "prefix" or "regex" (see YTableFilter).  Rows hidden
+        by the filter keep their selection.  Raises ValueError for an
+        unknown mode or an invalid regular expression.
+        """
+        change = self._filter.setFilter(text, columns, mode)
+        if change == YTableFilter.UNCHANGED:
+            return
+        self._shown_pos = None
+        if self._filter_model is None:
+            return
+        self._suppress_selection = True
+        try:
+            if not self._filter.isActive():
+                self._filter_model.set_filter(None)
+            elif self._filter_model.get_filter() is None:
+                self._filter_model.set_filter(self._row_filter)
+            else:
+                self._row_filter.changed({
+                    YTableFilter.STRICTER: Gtk.FilterChange.MORE_STRICT,
+                    YTableFilter.LOOSER: Gtk.FilterChange.LESS_STRICT,
+                }.get(change, Gtk.FilterChange.DIFFERENT))
+        except Exception as exc:
+            self._logger.debug("setFilter: filter update failed: %s", exc)
+        finally:
+            self._suppress_selection = False
+        self._select_in_view()
+
+    def filterText(self) -> str:
+        return self._filter.text()
+
+    # ------------------------------------------------------------------
+    # Sorting
+    # ------------------------------------------------------------------
+
+    def _on_sort_changed(self, sorter, _change=None):
+        """Sort the rows after a header click (ColumnViewSorter::changed)."""
+        if self._updating_sort_indicator:
+            return
+        keys = []
+        try:
+            for i in range(sorter.get_n_sort_columns()):
+                column, order = sorter.get_nth_sort_column(i)
+                if column in self._columns:
+                    keys.append((self._columns.index(column),
+                                 order == Gtk.SortType.ASCENDING))
+        except Exception as exc:
+            self._logger.debug("_on_sort_changed: cannot read sort columns: %s", exc)
+            return
+        if keys:
+            self._sort.setKeys(keys)
+            self._apply_sort()
+
+    def sortByColumns(self, keys):
+        """
+        Sort rows by several columns: *keys* lists column numbers or
+        (column, ascending) pairs, primary first.  The header shows the
+        primary column; an empty list keeps the current order.
+        """
+        self._sort.setKeys(keys)
+        keys = self._sort.keys()
+        if not keys:
+            return
+        self._apply_sort()
+        if self._column_view is None:
+            return
+        column, ascending = keys[0]
+        if column >= len(self._columns):
+            return
+        self._updating_sort_indicator = True
+        try:
+            self._column_view.sort_by_column(
+                self._columns[column],
+                Gtk.SortType.ASCENDING if ascending else Gtk.SortType.DESCENDING,
+            )
+        except Exception as exc:
+            self._logger.debug("sortByColumns: sort indicator failed: %s", exc)
+        finally:
+            self._updating_sort_indicator = False
+
+    def sortColumns(self) -> list:
+        """Return the current sort columns as [(column, ascending)], primary first."""
+        return self._sort.keys()
+
+    def _sort_in(self):
+        """Move added rows to their place while a sort is active."""
+        if self._sort.keys():
+            self._apply_sort()
+
+    def _apply_sort(self):
+        """
+        Reorder _items by the current sort keys and the store to match.
+
+        The existing _RowObject wrappers (from _item_to_obj) are reused, so
+        rows keep their cached filter result; the selection is re-applied
+        afterwards.
+        """
+        self._items[:] = self._sort.sorted(self._items)
+        self._rebuild_index()
+        if self._store is None:
+            return
+        objs = self._item_to_obj
+        for it in self._items:
+            if it not in objs:
+                objs[it] = _RowObject(it)
+        self._suppress_selection = True
+        try:
+            self._store.splice(
+                0, self._store.get_n_items(),
+                [objs[it] for it in self._items],
+            )
+        except Exception as exc:
+            self._logger.debug("_apply_sort: splice failed: %s", exc)
+        finally:
+            self._suppress_selection = False
+        self._select_in_view()
+
+    def _select_in_view(self):
+        """Re-select the rows of _selected_items that the filter shows, O(selected)."""
+        if self._selection_model is None:
+            return
+        self._suppress_selection = True
+        try:
+            self._selection_model.unselect_all()
+            for it in self._selected_items:
+                pos = self._view_pos(it)
+                if pos is not None:
+                    self._selection_model.select_item(pos, False)
+        except Exception as exc:
+            self._logger.debug("_select_in_view: %s", exc)
+        finally:
+            self._suppress_selection = False
+
     def changedItem(self):
         """Return the most recently changed item (last checkbox toggle)."""
         return self._changed_item
@@ -1013,7 +1013,8 @@ class YTreeGtk(YSelectionWidget):
         except Exception:
             pass
         try:
-            if getattr(self, '_listbox', None) is not None:
+            # inside batchUpdate() the rebuild runs once when the batch ends
+            if getattr(self, '_listbox', None) is not None and not self._defer_to_batch_end(self._rebuildTree):
                 try:
                     self._rebuildTree()
                 except Exception:
@@ -1031,12 +1032,85 @@ class YTreeGtk(YSelectionWidget):
                 super().addItem(item)
             item.setIndex(len(self._items) - 1)        
         try:
-            if getattr(self, '_listbox', None) is not None:
+            if getattr(self, '_listbox', None) is not None and not self._defer_to_batch_end(self._rebuildTree):
                 self._rebuildTree()
         except Exception:
             pass
 
 
+    def _append_items(self, items):
+        """Append one addItemsAsync() chunk.
+
+        New roots come last in the flattened tree, so their visible rows are
+        appended to the ListBox instead of rebuilding it; a chunk carrying
+        selected nodes goes through _rebuildTree(), which also opens their
+        ancestors.
+        """
+        if getattr(self, '_listbox', None) is None:
+            self.addItems(items)
+            return
+        new_items = []
+        for item in items:
+            if isinstance(item, str):
+                item = YTreeItem(item)
+            super().addItem(item)
+            item.setIndex(len(self._items) - 1)
+            new_items.append(item)
+        has_selected = False
+        stack = list(new_items)
+        while stack and not has_selected:
+            n = stack.pop()
+            has_selected = n.selected()
+            stack.extend(getattr(n, "_children", []) or [])
+        if has_selected:
+            self._rebuildTree()
+            return
+        visible = []
+
+        def _visit(nodes, depth):
+            for n in nodes:
+                visible.append((n, depth))
+                if getattr(n, "_is_open", False):
+                    _visit(getattr(n, "_children", []) or [], depth + 1)
+        _visit(new_items, 0)
+        self._suppress_selection_handler = True
+        try:
+            for item, depth in visible:
+                row = self._make_row(item, depth)
+                self._listbox.append(row)
+                self._rows.append(row)
+                self._row_to_item[row] = item
+                self._item_to_row[item] = row
+            self._visible_items.extend(visible)
+        finally:
+            self._suppress_selection_handler = False
+
+    def _remove_item_runs(self, runs, gone):
+        """Remove the ListBox rows of the removed subtrees; the other rows
+        and their selection are left untouched (no rebuild)."""
+        self._delete_runs(runs)
+        first = min((row for row, _count in runs.get(None, [])), default=len(self._items))
+        for row in range(first, len(self._items)):
+            self._items[row].setIndex(row)
+        self._last_selected_ids = set(id(i) for i in self._selected_items)
+        if getattr(self, '_listbox', None) is None:
+            return
+        self._suppress_selection_handler = True
+        try:
+            for node in gone:
+                row = self._item_to_row.pop(node, None)
+                if row is None:
+                    continue
+                self._row_to_item.pop(row, None)
+                self._listbox.remove(row)
+            self._rows = [r for r in self._rows if r in self._row_to_item]
+            self._visible_items = [(n, d) for n, d in self._visible_items if n not in gone]
+        except Exception:
+            self._logger.error("_remove_item_runs failed, rebuilding tree", exc_info=True)
+            self._rebuildTree()
+        finally:
+            self._suppress_selection_handler = False
+
     def selectItem(self, item, selected=True):
         """Select/deselect a logical YTreeItem and reflect changes in the Gtk.ListBox."""
         try:
@@ -1064,6 +1138,55 @@ class YTreeGtk(YSelectionWidget):
         except Exception:
             pass
 
+    def _apply_item_diff(self, diff):
+        """Swap in the setItems() result with a single row rebuild.
+
+        The Gtk.ListBox holds one row per visible node and its row widgets
+        capture their items, so changes are applied with one _rebuildTree()
+        instead of a clear plus one rebuild per added item; selection and
+        open state were carried over by the diff.
+        """
+        self._replace_items(diff)
+        self._last_selected_ids = set()
+        if getattr(self, '_listbox', None) is not None:
+            self._rebuildTree()
+            return
+        selected = []
+
+        def _visit(nodes):
+            for n in nodes:
+                if n.selected():
+                    selected.append(n)
+                _visit(getattr(n, "_children", []) or [])
+        _visit(self._items)
+        self._selected_items = selected if self._multi else selected[:1]
+
+    def _refresh_item(self, item, what):
+        """Update the ListBox row of one node.
+
+        A label or icon change swaps the content of the existing row, so it
+        keeps its selection; new children change the visible rows and go
+        through _rebuildTree().
+        """
+        if getattr(self, '_listbox', None) is None:
+            return
+        if "children" in what:
+            self._last_selected_ids = set(id(i) for i in self._selected_items)
+            self._rebuildTree()
+            return
+        row = self._item_to_row.get(item)
+        if row is None:
+            return
+        depth = 0
+        parent = getattr(item, "_parent_item", None)
+        while parent is not None:
+            depth += 1
+            parent = getattr(parent, "_parent_item", None)
+        fresh = self._make_row(item, depth)
+        content = fresh.get_child()
+        fresh.set_child(None)
+        row.set_child(content)
+
     def deleteAllItems(self):
         """Clear model and view rows for this tree."""
         self._suppress_selection_handler = True
@@ -271,11 +271,26 @@ class YComboBoxQt(YSelectionWidget):
             except Exception:
                 pass
 
+    def selectItem(self, item, selected=True):
+        """Make *item* the current entry (no event posted), or drop its selection."""
+        if selected:
+            combo = getattr(self, "_combo_widget", None)
+            if combo is not None:
+                combo.blockSignals(True)
+            try:
+                self.setValue(item.label())
+            finally:
+                if combo is not None:
+                    combo.blockSignals(False)
+        else:
+            item.setSelected(False)
+            if item in self._selected_items:
+                self._selected_items.remove(item)
+
     # New: delete all items at runtime
     def deleteAllItems(self):
         try:
-            self._items = []
-            self._selected_items = []
+            super().deleteAllItems()
             self._value = ""
         except Exception:
             pass
@@ -296,6 +311,100 @@ class YComboBoxQt(YSelectionWidget):
                 except Exception:
                     pass
 
+    def _apply_item_diff(self, diff):
+        """Apply setItems() changes with per-row insert/remove/update calls.
+
+        Signals are blocked meanwhile, so removing or inserting rows around
+        the current one does not post spurious SelectionChanged events.
+        """
+        combo = getattr(self, "_combo_widget", None)
+
+        def _qicon(item):
+            try:
+                return _qt_resolve_icon(item.iconName()) if item.iconName() else None
+            except Exception:
+                return None
+
+        if combo is not None:
+            combo.blockSignals(True)
+            try:
+                for row, count in diff.removed:
+                    for _ in range(count):
+                        combo.removeItem(row)
+                for row, new_items in diff.inserted:
+                    for offset, it in enumerate(new_items):
+                        qicon = _qicon(it)
+                        if qicon is not None:
+                            combo.insertItem(row + offset, qicon, it.label())
+                        else:
+                            combo.insertItem(row + offset, it.label())
+                for row, _old, new, changed in diff.kept:
+                    if changed:
+                        combo.setItemText(row, new.label())
+                        combo.setItemIcon(row, _qicon(new) or QtGui.QIcon())
+            except Exception:
+                self._logger.exception("_apply_item_diff: combo update failed")
+            finally:
+                combo.blockSignals(False)
+        selected = self._replace_items(diff)
+        for it in selected[:-1]:
+            it.setSelected(False)
+        self._selected_items = selected[-1:]
+        if self._selected_items:
+            self._value = self._selected_items[0].label()
+            if combo is not None:
+                combo.blockSignals(True)
+                try:
+                    combo.setCurrentIndex(self._items.index(self._selected_items[0]))
+                finally:
+                    combo.blockSignals(False)
+        elif combo is not None and not self._editable:
+            self._value = combo.currentText()
+
+    def _remove_rows(self, row, count):
+        """Drop a run of entries with one removeRows() on the combo model."""
+        combo = getattr(self, "_combo_widget", None)
+        if combo is not None:
+            combo.blockSignals(True)
+            try:
+                combo.model().removeRows(row, count)
+            except Exception:
+                self._logger.exception("_remove_rows: combo update failed")
+            finally:
+                combo.blockSignals(False)
+        self._delete_run(None, row, count)
+
+    def _rows_removed(self, first, gone):
+        """Follow the entry the combo shows once the current one is gone."""
+        super()._rows_removed(first, gone)
+        combo = getattr(self, "_combo_widget", None)
+        if not self._selected_items and combo is not None and not self._editable:
+            self._value = combo.currentText()
+
+    def _refresh_item(self, item, what):
+        """Update the text and icon of one entry in place."""
+        try:
+            row = self._items.index(item)
+        except ValueError:
+            return
+        if item in self._selected_items:
+            self._value = item.label()
+        combo = getattr(self, "_combo_widget", None)
+        if combo is None:
+            return
+        combo.blockSignals(True)
+        try:
+            combo.setItemText(row, item.label())
+            icon = None
+            if item.iconName():
+                try:
+                    icon = _qt_resolve_icon(item.iconName())
+                except Exception:
+                    icon = None
+            combo.setItemIcon(row, icon or QtGui.QIcon())
+        finally:
+            combo.blockSignals(False)
+
     def _on_text_changed(self, text):
         # keep previous behaviour, but update model selection flags robustly
         try:
@@ -15,10 +15,48 @@ import logging
 from ...yui_common import *
 
 
-__all__ = ["_resolve_icon"]
+__all__ = ["_resolve_icon", "_invalidate_icon_cache", "_watch_icon_theme"]
+
 
 def _resolve_icon(icon_name):
-    """Resolve an icon name to a QtGui.QIcon or None.
+    """Resolve an icon name to a QtGui.QIcon or None, using the shared icon cache.
+
+    Results (including failures) are cached per icon name and theme in
+    YIconCache, so only the first lookup hits the filesystem and the theme.
+    QIcon is implicitly shared, so handing the same instance to several
+    widgets is safe.
+    """
+    if not icon_name:
+        return None
+    try:
+        theme = QtGui.QIcon.themeName()
+    except Exception:
+        theme = ""
+    key = ("qicon", str(icon_name), 0, 1, theme)
+    return YIconCache.shared().lookup(key, lambda: _load_icon(icon_name))
+
+
+def _invalidate_icon_cache():
+    """Forget all cached icons, e.g. after an icon theme change."""
+    YIconCache.shared().invalidate()
+
+
+def _watch_icon_theme(app):
+    """Invalidate the icon cache when the platform color scheme changes.
+
+    Desktops usually switch icon theme together with the color scheme
+    (e.g. breeze / breeze-dark); explicit QIcon.setThemeName() changes are
+    already covered by the theme name in the cache key.
+    """
+    try:
+        app.styleHints().colorSchemeChanged.connect(lambda *_: _invalidate_icon_cache())
+    except Exception:
+        logging.getLogger("manatools.aui.qt.common").debug(
+            "colorSchemeChanged not available; icon cache keyed by theme name only")
+
+
+def _load_icon(icon_name):
+    """Resolve an icon name to a QtGui.QIcon or None (uncached).
 
     - If icon_name is an existing absolute or relative path -> load from path.
     - If icon_name contains a path separator or exists on filesystem -> treat as path.
@@ -498,6 +498,14 @@ class YDialogQt(YSingleChildContainerWidget):
         # responsible for invoking destroy()/close() once the event loop exits.
         event.accept()
     
+    def _call_when_idle(self, callback):
+        """Run *callback* once the event loop has processed pending events."""
+        QtCore.QTimer.singleShot(0, callback)
+
+    def _queue_item_flush(self, widget):
+        """Apply *widget*'s pending item changes from the event loop."""
+        QtCore.QTimer.singleShot(0, widget._flush_item_changes)
+
     def _post_event(self, event):
         """Internal: post an event to this dialog and quit local event loop if running."""
         self._event_result = event
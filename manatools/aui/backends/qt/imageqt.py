@@ -10,22 +10,106 @@ Author:  Angelo Naselli <anaselli@linux.it>
 @package manatools.aui.backends.qt
 """
 from PySide6 import QtWidgets, QtGui, QtCore
+from collections import OrderedDict
 import logging
 import os
 from ...yui_common import *
 from .commonqt import _resolve_icon as _qt_resolve_icon
 
 
+# Longest side kept for the source QImage; bigger images are reduced once on load.
+_SOURCE_MAX_DIM = 4096
+# Smoothly scaled pixmaps kept per image, keyed by target size and aspect mode.
+_SCALED_CACHE_SIZE = 8
+# Delay before the smooth rescale once interactive resizing has stopped (ms).
+_SMOOTH_DELAY_MS = 150
+
+
+class _ImageDecodeSignals(QtCore.QObject):
+    """Carries decoded images from the worker thread back to the GUI thread."""
+    # (serial, QImage or None, natural QSize)
+    decoded = QtCore.Signal(int, object, object)
+
+
+class _ImageDecodeTask(QtCore.QRunnable):
+    """Decode an image file with QImageReader on a QThreadPool thread.
+
+    QImage, unlike QPixmap, may be built outside the GUI thread.  When a
+    target size is given the reader down-scales while decoding if the image
+    plugin supports it (JPEG decodes at 1/2, 1/4, 1/8 natively, SVG renders
+    at the requested size); other formats are decoded and then scaled here,
+    still off the GUI thread.
+    """
+
+    def __init__(self, signals, serial, path, target=None):
+        super().__init__()
+        self.setAutoDelete(True)
+        self._signals = signals
+        self._serial = serial
+        self._path = path
+        self._target = target
+
+    def run(self):
+        logger = logging.getLogger("manatools.aui.qt.YImageQt")
+        image = None
+        natural = QtCore.QSize()
+        try:
+            reader = QtGui.QImageReader(self._path)
+            reader.setAutoTransform(True)
+            natural = reader.size()
+            try:
+                rotated = bool(reader.transformation() & QtGui.QImageIOHandler.Transformation.TransformationRotate90)
+            except Exception:
+                rotated = False
+            if rotated and natural.isValid():
+                natural = natural.transposed()
+            target = self._target
+            wanted = None
+            if target is not None and natural.isValid() and (
+                    natural.width() > target.width() or natural.height() > target.height()):
+                wanted = natural.scaled(target, QtCore.Qt.KeepAspectRatio)
+                if reader.supportsOption(QtGui.QImageIOHandler.ImageOption.ScaledSize):
+                    reader.setScaledSize(wanted.transposed() if rotated else wanted)
+                    wanted = None
+            image = reader.read()
+            if image.isNull():
+                logger.error("async decode failed for %s: %s", self._path, reader.errorString())
+                image = None
+            elif wanted is not None and wanted.isValid():
+                image = image.scaled(wanted, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+            if image is not None and not natural.isValid():
+                natural = image.size()
+        except Exception:
+            logger.exception("async decode failed for %s", self._path)
+            image = None
+        try:
+            self._signals.decoded.emit(self._serial, image, natural)
+        except Exception:
+            # receiver went away together with the widget
+            pass
+
+
 class YImageQt(YWidget):
     def __init__(self, parent=None, imageFileName="", fallBackName=None):
         super().__init__(parent)
         self._imageFileName = imageFileName
-        # fallBackName is reserved for text-mode backends; ignored here.
+        # fallBackName is drawn by text-mode backends; here it is only shown
+        # as placeholder text while an asynchronous decode is in progress.
         self._fallback_name = fallBackName
         self._auto_scale = False
         self._zero_size = {YUIDimension.YD_HORIZ: False, YUIDimension.YD_VERT: False}
-        self._pixmap = None
+        # source image (QImage, bounded to _SOURCE_MAX_DIM) or theme icon
+        self._source_image = None
         self._qicon = None
+        self._scaled_cache = OrderedDict()
+        self._smooth_timer = None
+        # asynchronous decoding state
+        self._async_loading = False
+        self._load_serial = 0
+        self._loading = False
+        self._decode_signals = None
+        # size of the image file, the source image may be smaller
+        self._natural_size = None
         # aspect ratio tracking (w/h). default 1.0
         self._aspect_ratio = 1.0
         self._logger = logging.getLogger(f"manatools.aui.qt.{self.__class__.__name__}")
@@ -37,10 +121,31 @@ class YImageQt(YWidget):
     def imageFileName(self):
         return self._imageFileName
 
+    def asyncLoading(self):
+        return bool(self._async_loading)
+
+    def setAsyncLoading(self, on=True):
+        """Decode image files on a worker thread instead of the GUI thread.
+
+        Affects the next setImage() call, and the initial image when enabled
+        before the dialog is built.  Theme icons are always resolved
+        synchronously, they are small and already cached.
+        """
+        self._async_loading = bool(on)
+
     def setImage(self, imageFileName):
         try:
             self._imageFileName = imageFileName
+            # drop any decode still in flight for the previous image
+            self._load_serial += 1
+            self._loading = False
+            self._natural_size = None
             if getattr(self, '_backend_widget', None) is not None:
+                if self._async_loading:
+                    path = YIconCache.imageFilePath(imageFileName)
+                    if path is not None:
+                        self._start_async_load(path)
+                        return
                 # Try resolving via common Qt helper (theme icon or filesystem)
                 try:
                     ico = _qt_resolve_icon(imageFileName)
@@ -48,8 +153,8 @@ class YImageQt(YWidget):
                     ico = None
                 if ico is not None:
                     try:
+                        self._set_source(None)
                         self._qicon = ico
-                        self._pixmap = None
                         # update aspect ratio from icon's largest available size
                         try:
                             sizes = ico.availableSizes()
@@ -67,28 +172,142 @@ class YImageQt(YWidget):
                     except Exception:
                         pass
 
-                # Fallback: try loading as pixmap from filesystem
+                # Fallback: try loading as image from filesystem
                 if os.path.exists(imageFileName):
                     try:
-                        self._pixmap = QtGui.QPixmap(imageFileName)
-                        # update aspect ratio from pixmap
-                        try:
-                            w = self._pixmap.width()
-                            h = self._pixmap.height()
-                            if w > 0 and h > 0:
-                                self._aspect_ratio = max(0.0001, float(w) / float(h))
-                        except Exception:
-                            pass
+                        self._set_source(QtGui.QImage(imageFileName))
                         # re-apply constraints and redraw
                         self._apply_size_policy()
                         self._apply_pixmap()
                     except Exception:
-                        self._logger.exception("setImage: failed to load QPixmap %s", imageFileName)
+                        self._logger.exception("setImage: failed to load QImage %s", imageFileName)
                 else:
                     self._logger.error("setImage: file not found: %s", imageFileName)
         except Exception:
             self._logger.exception("setImage failed")
 
+    def _decode_target_size(self):
+        """Return the size to decode at, or None for the natural size.
+
+        Only auto-scaled images of a visible widget are down-scaled: before
+        the first layout the label size is meaningless.
+        """
+        try:
+            w = self._backend_widget
+            if not self._auto_scale or not w.isVisible():
+                return None
+            size = w.size()
+            if size.width() <= 1 or size.height() <= 1:
+                return None
+            return size
+        except Exception:
+            return None
+
+    def _start_async_load(self, path, placeholder=True):
+        """Queue *path* for decoding on the global QThreadPool."""
+        self._load_serial += 1
+        self._loading = True
+        if self._decode_signals is None:
+            self._decode_signals = _ImageDecodeSignals()
+            self._decode_signals.decoded.connect(self._on_image_decoded)
+        if placeholder:
+            self._set_source(None)
+            try:
+                if self._fallback_name:
+                    self._backend_widget.setText(str(self._fallback_name))
+                else:
+                    self._backend_widget.clear()
+            except Exception:
+                pass
+        task = _ImageDecodeTask(self._decode_signals, self._load_serial, path, self._decode_target_size())
+        QtCore.QThreadPool.globalInstance().start(task)
+        self._logger.debug("_start_async_load: %s serial=%d", path, self._load_serial)
+
+    def _on_image_decoded(self, serial, image, natural):
+        """Swap in a decoded image (runs in the GUI thread)."""
+        if serial != self._load_serial:
+            # superseded by a later setImage()
+            return
+        self._loading = False
+        if getattr(self, '_backend_widget', None) is None:
+            return
+        if image is None:
+            self._logger.error("setImage: could not decode %s", self._imageFileName)
+            return
+        try:
+            self._set_source(image, natural)
+            self._apply_size_policy()
+            self._apply_pixmap()
+        except Exception:
+            self._logger.exception("_on_image_decoded failed")
+
+    def _maybe_redecode(self, need_w, need_h):
+        """Decode again when a down-scaled pixmap is too small for the widget."""
+        try:
+            if not self._async_loading or self._loading or self._natural_size is None:
+                return
+            pm = self._source_image
+            nat = self._natural_size
+            if pm is None or (pm.width() >= nat.width() and pm.height() >= nat.height()):
+                return
+            need_w = min(need_w, nat.width(), _SOURCE_MAX_DIM)
+            need_h = min(need_h, nat.height(), _SOURCE_MAX_DIM)
+            # some slack so small resizes do not trigger a decode each
+            if need_w > pm.width() * 1.25 or need_h > pm.height() * 1.25:
+                path = YIconCache.imageFilePath(self._imageFileName)
+                if path is not None:
+                    self._start_async_load(path, placeholder=False)
+        except Exception:
+            self._logger.exception("_maybe_redecode failed")
+
+    def _set_source(self, image, natural=None):
+        """Store *image* (QImage or None) as the source and drop scaled pixmaps.
+
+        Images larger than _SOURCE_MAX_DIM are reduced once here, so later
+        rescales never touch more pixels than a large screen can show.
+        *natural* is the size of the image file when *image* was decoded
+        down-scaled.
+        """
+        self._scaled_cache.clear()
+        self._qicon = None
+        if image is None or image.isNull():
+            self._source_image = None
+            self._natural_size = None
+            return
+        if natural is None or not natural.isValid():
+            natural = image.size()
+        if image.width() > _SOURCE_MAX_DIM or image.height() > _SOURCE_MAX_DIM:
+            image = image.scaled(QtCore.QSize(_SOURCE_MAX_DIM, _SOURCE_MAX_DIM),
+                                 QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        self._source_image = image
+        self._natural_size = QtCore.QSize(natural)
+        if natural.width() > 0 and natural.height() > 0:
+            self._aspect_ratio = max(0.0001, float(natural.width()) / float(natural.height()))
+
+    def _scaled_pixmap(self, size, aspect_mode, fast=False):
+        """Return the source image scaled to *size* as a QPixmap.
+
+        Smooth results are kept in a small LRU keyed by (width, height,
+        aspect mode).  With *fast* set (interactive resize) a cache miss is
+        served with a cheap FastTransformation scale and a smooth pass is
+        scheduled for when the size stops changing.
+        """
+        key = (size.width(), size.height(), aspect_mode)
+        pm = self._scaled_cache.get(key)
+        if pm is not None:
+            self._scaled_cache.move_to_end(key)
+            return pm
+        if fast and self._smooth_timer is not None:
+            self._smooth_timer.start()
+            return QtGui.QPixmap.fromImage(
+                self._source_image.scaled(size, aspect_mode, QtCore.Qt.FastTransformation))
+        pm = QtGui.QPixmap.fromImage(
+            self._source_image.scaled(size, aspect_mode, QtCore.Qt.SmoothTransformation))
+        self._scaled_cache[key] = pm
+        while len(self._scaled_cache) > _SCALED_CACHE_SIZE:
+            self._scaled_cache.popitem(last=False)
+        return pm
+
     def autoScale(self):
         return bool(self._auto_scale)
 
@@ -122,7 +341,7 @@ class YImageQt(YWidget):
                 def resizeEvent(self, ev):
                     super().resizeEvent(ev)
                     try:
-                        self._owner._apply_pixmap()
+                        self._owner._apply_pixmap(fast=True)
                     except Exception:
                         pass
 
@@ -153,13 +372,18 @@ class YImageQt(YWidget):
 
             self._backend_widget = _ImageLabel(self)
             self._backend_widget.setAlignment(QtCore.Qt.AlignCenter)
+            # smooth rescale once interactive resizing settles
+            self._smooth_timer = QtCore.QTimer(self._backend_widget)
+            self._smooth_timer.setSingleShot(True)
+            self._smooth_timer.setInterval(_SMOOTH_DELAY_MS)
+            self._smooth_timer.timeout.connect(self._apply_pixmap)
             if self._imageFileName:
                 try:
                     self.setImage(self._imageFileName)
                 except Exception:
                     try:
                         if os.path.exists(self._imageFileName):
-                            self._pixmap = QtGui.QPixmap(self._imageFileName)
+                            self._set_source(QtGui.QImage(self._imageFileName))
                             self._apply_size_policy()
                             self._apply_pixmap()
                     except Exception:
@@ -201,8 +425,10 @@ class YImageQt(YWidget):
                     else:
                         # Non-autoscale: cap non-stretch axes to source size or a sane default
                         pm_w = pm_h = None
-                        if isinstance(getattr(self, "_pixmap", None), QtGui.QPixmap) and not self._pixmap.isNull():
-                            pm_w, pm_h = self._pixmap.width(), self._pixmap.height()
+                        if self._natural_size is not None:
+                            pm_w, pm_h = self._natural_size.width(), self._natural_size.height()
+                        elif self._source_image is not None:
+                            pm_w, pm_h = self._source_image.width(), self._source_image.height()
                         elif getattr(self, "_qicon", None) is not None:
                             # Derive natural size from the icon's available sizes
                             pm_w, pm_h = 32, 32
@@ -228,7 +454,8 @@ class YImageQt(YWidget):
         except Exception:
             self._logger.exception("_apply_size_policy failed")
 
-    def _apply_pixmap(self):
+    def _apply_pixmap(self, fast=False):
+        """Render the source at the label size; *fast* is set during resizes."""
         try:
             if getattr(self, '_backend_widget', None) is None:
                 return
@@ -239,7 +466,7 @@ class YImageQt(YWidget):
                 size = QtCore.QSize(1, 1)
 
             src_icon = self._qicon
-            src_pm = self._pixmap if isinstance(self._pixmap, QtGui.QPixmap) and not self._pixmap.isNull() else None
+            src_pm = self._source_image
 
             # AutoScale ON => keep aspect ratio to widget size (height-for-width will grow height as width grows)
             if self._auto_scale:
@@ -258,9 +485,10 @@ class YImageQt(YWidget):
                         self._backend_widget.setPixmap(pm)
                         return
                 if src_pm is not None:
-                    scaled = src_pm.scaled(QtCore.QSize(target_w, target_h), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+                    scaled = self._scaled_pixmap(QtCore.QSize(target_w, target_h), QtCore.Qt.KeepAspectRatio, fast)
                     self._backend_widget.setPixmap(scaled)
-                else:
+                    self._maybe_redecode(scaled.width(), scaled.height())
+                elif not self._loading:
                     self._backend_widget.clear()
                 return
 
@@ -268,7 +496,9 @@ class YImageQt(YWidget):
             # For non-stretchable axes use the source's natural size.
             # If the source is a theme icon (no pixmap), query available sizes; default 32px.
             nat_w = nat_h = 32
-            if src_pm is not None:
+            if src_pm is not None and self._natural_size is not None:
+                nat_w, nat_h = self._natural_size.width(), self._natural_size.height()
+            elif src_pm is not None:
                 nat_w, nat_h = src_pm.width(), src_pm.height()
             elif src_icon is not None:
                 try:
@@ -290,9 +520,10 @@ class YImageQt(YWidget):
                     return
 
             if src_pm is not None:
-                scaled = src_pm.scaled(target_w, target_h, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+                scaled = self._scaled_pixmap(QtCore.QSize(target_w, target_h), QtCore.Qt.IgnoreAspectRatio, fast)
                 self._backend_widget.setPixmap(scaled)
-            else:
+                self._maybe_redecode(target_w, target_h)
+            elif not self._loading:
                 self._backend_widget.clear()
         except Exception:
             self._logger.exception("_apply_pixmap failed")
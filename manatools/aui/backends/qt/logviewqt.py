@@ -9,7 +9,7 @@ Author:  Angelo Naselli <anaselli@linux.it>
 
 @package manatools.aui.backends.qt
 '''
-from PySide6 import QtWidgets, QtCore
+from PySide6 import QtWidgets, QtCore, QtGui
 import logging
 from ...yui_common import *
 
@@ -40,21 +40,34 @@ class YLogViewQt(YWidget):
         recently appended appears at the *top* of the widget and older
         lines are pushed downward.  ``False`` (default) keeps the natural
         insertion order (oldest at top, newest at bottom).
+    compression : str, optional
+        ``None`` (default) keeps every retained line as a plain string.
+        ``"zlib"`` or ``"lzma"`` enables tiered storage: recent lines stay
+        plain while older ones are packed into compressed chunks that are
+        decoded on demand (see :class:`YLogLineStore`).  The QPlainTextEdit then
+        holds only the newest ``2 * chunkLines`` lines so memory stays
+        bounded; :meth:`logText` still returns the whole history.
     """
     def __init__(self, parent=None, label: str = "", visibleLines: int = 10,
                  storedLines: int = 0, focus: 'YLogViewFocus' = None,
-                 reverse: bool = False):
+                 reverse: bool = False, compression: str = None):
         super().__init__(parent)
         self._logger = logging.getLogger(f"manatools.aui.qt.{self.__class__.__name__}")
         self._label = label or ""
         self._visible = max(1, int(visibleLines or 10))
         self._max_lines = max(0, int(storedLines or 0))
-        self._lines = []
+        self._lines = YLogLineStore(self._max_lines, compression)
         # Resolve focus default lazily to avoid a circular import at module level.
         if focus is None:
             focus = YLogViewFocus.HEAD
         self._focus = focus
         self._reverse = bool(reverse)
+        # scroll request of display refreshes postponed by batchUpdate()
+        self._scroll_after_batch = False
+        self._rebuild_after_batch = False
+        # lines in the QPlainTextEdit and the appendedCount() they reflect
+        self._shown = 0
+        self._shown_upto = 0
         self._logger.debug(
             "YLogViewQt init: focus=%s reverse=%s", self._focus, self._reverse)
         try:
@@ -94,22 +107,23 @@ class YLogViewQt(YWidget):
     def setMaxLines(self, newMaxLines: int):
         self._max_lines = max(0, int(newMaxLines or 0))
         self._trim_if_needed()
-        self._update_display()
+        self._update_display(incremental=True)
 
     def logText(self) -> str:
-        return "\n".join(self._lines)
+        return self._lines.text()
 
     def setLogText(self, text: str):
         try:
             raw = [] if text is None else str(text).splitlines()
-            self._lines = raw
+            self._lines.clear()
+            self._lines.extend(raw)
             self._trim_if_needed()
             self._update_display()
         except Exception:
             self._logger.exception("setLogText failed")
 
     def lastLine(self) -> str:
-        return self._lines[-1] if self._lines else ""
+        return self._lines.last()
 
     def appendLines(self, text: str):
         """Append one or more lines to the log.
@@ -134,22 +148,38 @@ class YLogViewQt(YWidget):
             scroll_end = (self._focus == YLogViewFocus.TAIL)
             self._logger.debug(
                 "appendLines: added %d line(s), scroll_end=%s", len(new_lines), scroll_end)
-            self._update_display(scroll_end=scroll_end)
+            self._update_display(scroll_end=scroll_end, incremental=True)
         except Exception:
             self._logger.exception("appendLines failed")
 
     def clearText(self):
-        self._lines = []
+        self._lines.clear()
         self._update_display()
 
     def lines(self) -> int:
         return len(self._lines)
 
+    def historyCompression(self):
+        """Return the codec used for older log lines, or None if disabled."""
+        return self._lines.compression()
+
+    def setHistoryCompression(self, codec: str = "zlib", chunkLines: int = 1000):
+        """Enable (``"zlib"``/``"lzma"``) or disable (``None``) compressed
+        storage of older lines, packing them in chunks of *chunkLines*.
+
+        Retained lines are re-packed and the view is rebuilt, as it holds
+        fewer lines while compression is enabled.
+        """
+        try:
+            self._lines.setCompression(codec, chunkLines)
+            self._update_display()
+        except Exception:
+            self._logger.exception("setHistoryCompression failed")
+
     # Internals
     def _trim_if_needed(self):
         try:
-            if self._max_lines > 0 and len(self._lines) > self._max_lines:
-                self._lines = self._lines[-self._max_lines:]
+            self._lines.setMaxLines(self._max_lines)
         except Exception:
             self._logger.exception("trim failed")
 
@@ -185,7 +215,7 @@ class YLogViewQt(YWidget):
         self._logger.debug("setReverse: %s", self._reverse)
         self._update_display()
 
-    def _update_display(self, scroll_end: bool = False):
+    def _update_display(self, scroll_end: bool = False, incremental: bool = False):
         """Refresh the backend QPlainTextEdit from ``self._lines``.
 
         ``self._lines`` is always chronological (oldest first).  When
@@ -193,6 +223,10 @@ class YLogViewQt(YWidget):
         ``reversed(self._lines)`` so the newest line appears at the **top**
         of the QPlainTextEdit and the oldest at the **bottom**.
 
+        With *incremental* only the lines appended or trimmed since the last
+        refresh are inserted or removed (see :meth:`_sync_display`); the whole
+        text is rebuilt otherwise, e.g. after setReverse() or setLogText().
+
         When *scroll_end* is ``True`` the vertical scrollbar is moved to
         ``maximum()`` — i.e. the **bottom of the rendered text** — regardless
         of *reverse*:
@@ -200,25 +234,68 @@ class YLogViewQt(YWidget):
         * **normal order** — bottom = newest line (TAIL follows new events).
         * **reverse order** — bottom = oldest line (TAIL keeps the oldest
           content visible; this is the geometrical mirror of HEAD+normal).
-
-        The scrollbar is manipulated directly (``verticalScrollBar()``) rather
-        than via ``moveCursor`` because ``QTextCursor`` lives in ``QtGui``,
-        not ``QtCore``.
         """
+        if self._defer_to_batch_end(self._update_display_after_batch):
+            # many appends in one batch: refresh the text once at its end
+            self._scroll_after_batch = self._scroll_after_batch or scroll_end
+            self._rebuild_after_batch = self._rebuild_after_batch or not incremental
+            return
         try:
             if getattr(self, "_text", None) is not None:
-                text = (
-                    "\n".join(reversed(self._lines))
-                    if self._reverse
-                    else "\n".join(self._lines)
-                )
-                self._text.setPlainText(text)
+                if not (incremental and self._sync_display()):
+                    shown = self._lines.viewLines()
+                    text = self._lines.text(reverse=self._reverse,
+                                            start=len(self._lines) - shown)
+                    self._text.setPlainText(text)
+                    self._shown = shown
+                    self._shown_upto = self._lines.appendedCount()
                 if scroll_end:
                     sb = self._text.verticalScrollBar()
                     sb.setValue(sb.maximum())
         except Exception:
             self._logger.exception("update_display failed")
 
+    def _update_display_after_batch(self):
+        scroll_end, self._scroll_after_batch = self._scroll_after_batch, False
+        rebuild, self._rebuild_after_batch = self._rebuild_after_batch, False
+        self._update_display(scroll_end=scroll_end, incremental=not rebuild)
+
+    def _sync_display(self) -> bool:
+        """Remove the trimmed lines from the far end of the text and insert
+        the new ones at the near end, without reading older lines.
+
+        Returns ``False`` when the text has to be rebuilt instead.
+        """
+        total = self._lines.viewLines()
+        new = min(self._lines.appendedCount() - self._shown_upto, total)
+        drop = self._shown + new - total
+        keep = self._shown - drop
+        if new < 0 or drop < 0 or keep <= 0:
+            return False
+        doc = self._text.document()
+        cursor = QtGui.QTextCursor(doc)
+        if drop:
+            if self._reverse:
+                # oldest lines are at the bottom: cut from the end of the last kept one
+                block = doc.findBlockByNumber(keep - 1)
+                cursor.setPosition(block.position() + block.length() - 1)
+                cursor.movePosition(QtGui.QTextCursor.End, QtGui.QTextCursor.KeepAnchor)
+            else:
+                cursor.setPosition(doc.findBlockByNumber(drop).position(),
+                                   QtGui.QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        if new:
+            lines = list(self._lines.iterLines(len(self._lines) - new))
+            if self._reverse:
+                cursor.movePosition(QtGui.QTextCursor.Start)
+                cursor.insertText("\n".join(reversed(lines)) + "\n")
+            else:
+                cursor.movePosition(QtGui.QTextCursor.End)
+                cursor.insertText("\n" + "\n".join(lines))
+        self._shown = total
+        self._shown_upto = self._lines.appendedCount()
+        return True
+
     def _create_backend_widget(self):
         container = QtWidgets.QWidget()
         lay = QtWidgets.QVBoxLayout(container)
@@ -66,6 +66,30 @@ class YRichTextQt(YWidget):
         except Exception:
             pass
 
+    def appendValue(self, fragment: str):
+        """Append *fragment* to the content, inserting it at the end of the
+        existing document instead of rebuilding it."""
+        fragment = fragment or ""
+        if not fragment:
+            return
+        self._text += fragment
+        try:
+            if getattr(self, "_backend_widget", None) is not None:
+                cursor = QtGui.QTextCursor(self._backend_widget.document())
+                cursor.movePosition(QtGui.QTextCursor.End)
+                if self._plain:
+                    cursor.insertText(fragment)
+                else:
+                    cursor.insertHtml(fragment)
+                if self._auto_scroll:
+                    try:
+                        self._backend_widget.setTextCursor(cursor)
+                        self._backend_widget.ensureCursorVisible()
+                    except Exception:
+                        pass
+        except Exception:
+            self._logger.exception("appendValue failed", exc_info=True)
+
     def value(self) -> str:
         return self._text
 
@@ -3,19 +3,74 @@
 '''
 Python manatools.aui.backends.qt contains all Qt backend classes
 
+Qt backend for YSelectionBox using QListView + QAbstractListModel.
+
+The model exposes ``owner._items`` directly, so rows are delivered on
+demand and icons are resolved (through the shared icon cache) only for
+rows that get painted.  An item -> row dict gives O(1) lookups in
+selectItem(), and selection changes are applied from the ranges reported
+by QItemSelectionModel.selectionChanged instead of rescanning every row.
+
+Complexity comparison:
+                  QListWidget (old)        QListView + model (new)
+  addItem()       O(1) + icon lookup       O(1) - insertRows signal only
+  addItems(N)     O(N) widget items        O(N) index, single insertRows
+  selectItem()    O(N) scan                O(1) via _item_to_row
+  selection diff  O(N x K)                 O(changed rows)
+
 License: LGPLv2+
 
 Author:  Angelo Naselli <anaselli@linux.it>
 
 @package manatools.aui.backends.qt
 '''
-from PySide6 import QtWidgets
+from PySide6 import QtWidgets, QtCore
 import logging
-import os
 from typing import Optional
 from ...yui_common import *
 from .commonqt import _resolve_icon
 
+
+class _YSelectionBoxModel(QtCore.QAbstractListModel):
+    """QAbstractListModel backed by the owner's list of YItems."""
+
+    def __init__(self, owner: 'YSelectionBoxQt', parent=None):
+        super().__init__(parent)
+        self._owner = owner
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._owner._items)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        """Return item data for *role*.  Called by Qt only for visible rows."""
+        if not index.isValid():
+            return None
+        items = self._owner._items
+        row = index.row()
+        if row < 0 or row >= len(items):
+            return None
+        it = items[row]
+        if role == QtCore.Qt.DisplayRole:
+            try:
+                return it.label()
+            except Exception:
+                return str(it)
+        if role == QtCore.Qt.DecorationRole:
+            try:
+                name = it.iconName()
+            except Exception:
+                name = None
+            return _resolve_icon(name) if name else None
+        return None
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlags:
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+
 class YSelectionBoxQt(YSelectionWidget):
     def __init__(self, parent=None, label="", multi_selection: Optional[bool] = False):
         super().__init__(parent)
@@ -25,12 +80,15 @@ class YSelectionBoxQt(YSelectionWidget):
         self._multi_selection = multi_selection
         self.setStretchable(YUIDimension.YD_HORIZ, True)
         self.setStretchable(YUIDimension.YD_VERT, True)
-        self._list_widget = None
+        self._list_widget = None   # QListView
+        self._model = None         # _YSelectionBoxModel
+        self._item_to_row = {}
+        self._suppress_selection_handler = False
         self._logger = logging.getLogger(f"manatools.aui.qt.{self.__class__.__name__}")
-    
+
     def widgetClass(self):
         return "YSelectionBox"
-    
+
     def value(self):
         return self._value
 
@@ -40,165 +98,138 @@ class YSelectionBoxQt(YSelectionWidget):
     def selectedItems(self):
         """Get list of selected items"""
         return self._selected_items
-    
+
+    def _update_value(self):
+        self._value = self._selected_items[0].label() if self._selected_items else ""
+
+    def _select_row(self, row, selected=True, clear=False):
+        """Update the view selection for *row* without notifying the application."""
+        sel_model = self._list_widget.selectionModel()
+        idx = self._model.index(row, 0)
+        flags = QtCore.QItemSelectionModel.Select if selected else QtCore.QItemSelectionModel.Deselect
+        if clear:
+            flags |= QtCore.QItemSelectionModel.Clear
+        self._suppress_selection_handler = True
+        try:
+            sel_model.select(idx, flags)
+            if selected:
+                sel_model.setCurrentIndex(idx, QtCore.QItemSelectionModel.NoUpdate)
+        finally:
+            self._suppress_selection_handler = False
+
     def selectItem(self, item, selected=True):
         """Select or deselect a specific item"""
-        if hasattr(self, '_list_widget') and self._list_widget:
-            for idx, it in enumerate(self._items):
-                if it is item:
-                    if self.multiSelection():
-                        if selected:
-                            if item not in self._selected_items:
-                                self._selected_items.append(item)
-                        else:
-                            if item in self._selected_items:
-                                self._selected_items.remove(item)
-                    else:
-                        old_selected = self._selected_items[0] if self._selected_items else None
-                        self._list_widget.clearSelection()
-                        if selected:
-                            if old_selected is not None:
-                                old_selected.setSelected(False)
-                            self._selected_items = [item]                            
-                        else:
-                            self._selected_items = []
-                    #fix item selection in the view and YItem
-                    if selected:
-                        self._list_widget.setCurrentItem(self._list_widget.item(idx))
-                    self._list_widget.item(idx).setSelected(bool(selected))
-                    item.setSelected(bool(selected))
-                    self._value = self._selected_items[0].label() if self._selected_items else ""
-                    break
+        row = self._item_to_row.get(item)
+        if row is None:
+            return
+        if self.multiSelection():
+            if selected:
+                if item not in self._selected_items:
+                    self._selected_items.append(item)
+            else:
+                if item in self._selected_items:
+                    self._selected_items.remove(item)
+        else:
+            old_selected = self._selected_items[0] if self._selected_items else None
+            if selected:
+                if old_selected is not None and old_selected is not item:
+                    old_selected.setSelected(False)
+                self._selected_items = [item]
+            elif old_selected is item:
+                self._selected_items = []
+        item.setSelected(bool(selected))
+        self._update_value()
+        if self._list_widget is not None:
+            try:
+                self._select_row(row, selected, clear=(selected and not self._multi_selection))
+            except Exception:
+                self._logger.exception("selectItem: failed to update view")
 
     def setMultiSelection(self, enabled):
         """Enable or disable multi-selection."""
         self._multi_selection = bool(enabled)
-        if hasattr(self, '_list_widget') and self._list_widget:
+        if not self._multi_selection and len(self._selected_items) > 1:
+            # collapse to the first selected item
+            for it in self._selected_items[1:]:
+                it.setSelected(False)
+            self._selected_items = self._selected_items[:1]
+            self._update_value()
+        if self._list_widget is not None:
             mode = QtWidgets.QAbstractItemView.MultiSelection if self._multi_selection else QtWidgets.QAbstractItemView.SingleSelection
             self._list_widget.setSelectionMode(mode)
-            # if disabling multi-selection, collapse to the first selected item
-            if not self._multi_selection:
-                selected = self._list_widget.selectedItems()
-                if len(selected) > 1:
-                    first = selected[0]
-                    self._list_widget.clearSelection()
-                    first.setSelected(True)
-                    self._list_widget.setCurrentItem(first)
-                    selected_indices = [index.row() for index in self._list_widget.selectedIndexes()]
-                    new_selected = []
-                    for idx, it in enumerate(self._items):                
-                        if idx in selected_indices:
-                            it.setSelected(True)
-                            new_selected.append(it)
-                        else:
-                            it.setSelected(False)
-                    self._selected_items = new_selected
-                    self._value = self._selected_items[0].label() if self._selected_items else ""
+            self._apply_selection_from_items()
 
     def multiSelection(self):
         """Return whether multi-selection is enabled."""
         return bool(self._multi_selection)
-    
+
     def _create_backend_widget(self):
         container = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout(container)
         layout.setContentsMargins(0, 0, 0, 0)
-        
+
         if self._label:
             label = QtWidgets.QLabel(self._label)
             layout.addWidget(label)
-        
-        list_widget = QtWidgets.QListWidget()
+
+        model = _YSelectionBoxModel(self)
+        list_view = QtWidgets.QListView()
+        list_view.setModel(model)
+        # all rows share the same height: lets the view skip per-row size hints
+        list_view.setUniformItemSizes(True)
+        list_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         mode = QtWidgets.QAbstractItemView.MultiSelection if self._multi_selection else QtWidgets.QAbstractItemView.SingleSelection
-        list_widget.setSelectionMode(mode)
-        
-        # Add items to list widget (use QListWidgetItem to support icons)
-        for item in self._items:
-            try:
-                text = item.label() if hasattr(item, 'label') else str(item)
-            except Exception:
-                try:
-                    text = str(item)
-                except Exception:
-                    text = ""
-            try:
-                li = QtWidgets.QListWidgetItem(text)
-                icon_name = None
-                try:
-                    fn = getattr(item, 'iconName', None)
-                    if callable(fn):
-                        icon_name = fn()
-                    else:
-                        icon_name = fn
-                except Exception:
-                    icon_name = None
-                icon = _resolve_icon(icon_name)
-                if icon is not None:
-                    try:
-                        li.setIcon(icon)
-                    except Exception:
-                        pass
-                list_widget.addItem(li)
-            except Exception:
-                try:
-                    list_widget.addItem(item.label())
-                except Exception:
-                    try:
-                        list_widget.addItem(str(item))
-                    except Exception:
-                        pass
+        list_view.setSelectionMode(mode)
+        layout.addWidget(list_view)
+
+        self._model = model
+        self._list_widget = list_view
+        self._item_to_row = {it: row for row, it in enumerate(self._items)}
 
         # Reflect model's selected flags into the view.
         # If multi-selection is enabled, select all items flagged selected.
         # If single-selection, only the last item with selected()==True should be selected.
-        try:
-            if self._multi_selection:
-                for idx, item in enumerate(self._items):
-                    try:
-                        if item.selected():
-                            li = list_widget.item(idx)
-                            if li is not None:
-                                li.setSelected(True)
-                                if item not in self._selected_items:
-                                    self._selected_items.append(item)
-                    except Exception:
-                        pass
-            else:
-                last_selected_idx = None
-                for idx, item in enumerate(self._items):
-                    try:
-                        if item.selected():
-                            if last_selected_idx is not None:
-                                # clear previous selection in model
-                                self._items[last_selected_idx].setSelected(False)
-                            last_selected_idx = idx
-                    except Exception:
-                        pass
-                if last_selected_idx is not None:
-                    li = list_widget.item(last_selected_idx)
-                    if li is not None:
-                        list_widget.setCurrentItem(li)
-                        li.setSelected(True)
-                        # update model internal selection list and value
-                        self._selected_items = [self._items[last_selected_idx]]
-        except Exception:
-            pass
+        selected = [it for it in self._items if it.selected()]
+        if not self._multi_selection and len(selected) > 1:
+            for it in selected[:-1]:
+                it.setSelected(False)
+            selected = selected[-1:]
+        self._selected_items = selected
+        self._apply_selection_from_items()
+        list_view.selectionModel().selectionChanged.connect(self._on_selection_changed)
 
-        list_widget.itemSelectionChanged.connect(self._on_selection_changed)
-        layout.addWidget(list_widget)
-        
         self._backend_widget = container
         self._backend_widget.setEnabled(bool(self._enabled))
         self._backend_widget.setVisible(bool(self._visible))
-        self._list_widget = list_widget
-        self._value = self._selected_items[0].label() if self._selected_items else ""
+        self._update_value()
         if self._help_text:
-            list_widget.setToolTip(self._help_text)
+            list_view.setToolTip(self._help_text)
         try:
             self._logger.debug("_create_backend_widget: <%s>", self.debugLabel())
         except Exception:
             pass
 
+    def _apply_selection_from_items(self):
+        """Push _selected_items into the view's selection model in one call."""
+        if self._list_widget is None:
+            return
+        sel_model = self._list_widget.selectionModel()
+        selection = QtCore.QItemSelection()
+        for it in self._selected_items:
+            row = self._item_to_row.get(it)
+            if row is not None:
+                idx = self._model.index(row, 0)
+                selection.select(idx, idx)
+        self._suppress_selection_handler = True
+        try:
+            sel_model.select(selection, QtCore.QItemSelectionModel.ClearAndSelect)
+            if self._selected_items:
+                row = self._item_to_row.get(self._selected_items[-1])
+                if row is not None:
+                    sel_model.setCurrentIndex(self._model.index(row, 0), QtCore.QItemSelectionModel.NoUpdate)
+        finally:
+            self._suppress_selection_handler = False
+
     def setHelpText(self, help_text: str):
         super().setHelpText(help_text)
         try:
@@ -208,21 +239,15 @@ class YSelectionBoxQt(YSelectionWidget):
             self._logger.exception("setHelpText failed", exc_info=True)
 
     def _set_backend_enabled(self, enabled):
-        """Enable/disable the selection box and its list widget; propagate where applicable."""
+        """Enable/disable the selection box and its list view; propagate where applicable."""
         try:
             if getattr(self, "_list_widget", None) is not None:
-                try:
-                    self._list_widget.setEnabled(bool(enabled))
-                except Exception:
-                    pass
+                self._list_widget.setEnabled(bool(enabled))
         except Exception:
             pass
         try:
             if getattr(self, "_backend_widget", None) is not None:
-                try:
-                    self._backend_widget.setEnabled(bool(enabled))
-                except Exception:
-                    pass
+                self._backend_widget.setEnabled(bool(enabled))
         except Exception:
             pass
 
@@ -237,137 +262,183 @@ class YSelectionBoxQt(YSelectionWidget):
 
     def addItem(self, item):
         """Add a single item to the selection box (model + Qt view)."""
-        # Let base class normalize strings to YItem and append to _items
-        super().addItem(item)
+        self.addItems([item])
 
-        # The newly added item is the last in the model list
+    def addItems(self, items):
+        """Add multiple items with a single beginInsertRows/endInsertRows."""
+        start = len(self._items)
+        if self._model is not None:
+            items = list(items)
+            if not items:
+                return
+            self._model.beginInsertRows(QtCore.QModelIndex(), start, start + len(items) - 1)
         try:
-            new_item = self._items[-1]
-        except Exception:
+            for it in items:
+                YSelectionWidget.addItem(self, it)
+        finally:
+            if self._model is not None:
+                self._model.endInsertRows()
+        new_items = self._items[start:]
+        for offset, it in enumerate(new_items):
+            row = start + offset
+            self._item_to_row[it] = row
+            try:
+                it.setIndex(row)
+            except Exception:
+                pass
+
+        # If items are marked selected in the model, reflect them.
+        pre_selected = [it for it in new_items if it.selected()]
+        if not pre_selected:
             return
+        if self._multi_selection:
+            for it in pre_selected:
+                if it not in self._selected_items:
+                    self._selected_items.append(it)
+        else:
+            # For single-selection only the last newly-added selected item remains selected.
+            for it in self._selected_items + pre_selected[:-1]:
+                it.setSelected(False)
+            self._selected_items = [pre_selected[-1]]
+        self._value = pre_selected[-1].label()
+        self._apply_selection_from_items()
 
-        # Ensure index is set
-        try:
-            new_item.setIndex(len(self._items) - 1)
-        except Exception:
-            pass
+    def _on_selection_changed(self, selected: QtCore.QItemSelection,
+                              deselected: QtCore.QItemSelection):
+        """Apply the selection delta reported by the view's selection model."""
+        if self._suppress_selection_handler:
+            return
+        items = self._items
+        removed = False
+        for rng in deselected:
+            for row in range(rng.top(), min(rng.bottom() + 1, len(items))):
+                it = items[row]
+                if it.selected():
+                    it.setSelected(False)
+                    removed = True
+        if removed:
+            self._selected_items = [it for it in self._selected_items if it.selected()]
+        added = []
+        for rng in selected:
+            for row in range(rng.top(), min(rng.bottom() + 1, len(items))):
+                it = items[row]
+                if not it.selected():
+                    it.setSelected(True)
+                    added.append(it)
+        self._selected_items.extend(added)
 
-        # If the backend list widget exists, append a visual entry
-        try:
-            if getattr(self, '_list_widget', None) is not None:
-                try:
-                    try:
-                        text = new_item.label() if hasattr(new_item, 'label') else str(new_item)
-                    except Exception:
-                        text = str(new_item)
-                    try:
-                        li = QtWidgets.QListWidgetItem(text)
-                        icon_name = None
-                        try:
-                            fn = getattr(new_item, 'iconName', None)
-                            if callable(fn):
-                                icon_name = fn()
-                            else:
-                                icon_name = fn
-                        except Exception:
-                            icon_name = None
-                        icon = _resolve_icon(icon_name)
-                        if icon is not None:
-                            try:
-                                li.setIcon(icon)
-                            except Exception:
-                                pass
-                        self._list_widget.addItem(li)
-                    except Exception:
-                        try:
-                            self._list_widget.addItem(new_item.label())
-                        except Exception:
-                            try:
-                                self._list_widget.addItem(str(new_item))
-                            except Exception:
-                                pass
-                    # If the item is marked selected in the model, reflect it.
-                    if new_item.selected():
-                        idx = self._list_widget.count() - 1
-                        list_item = self._list_widget.item(idx)
-                        if list_item is not None:
-                            # For single-selection, clear previous selections so
-                            # only the newly-added selected item remains selected.
-                            if not self._multi_selection:
-                                try:
-                                    self._list_widget.clearSelection()
-                                except Exception:
-                                    pass
-                                # Also clear model-side selected flags for other items
-                                for it in self._items[:-1]:
-                                    try:
-                                        it.setSelected(False)
-                                    except Exception:
-                                        pass
-                                self._selected_items = []
-
-                            list_item.setSelected(True)
-                        if new_item not in self._selected_items:
-                            self._selected_items.append(new_item)
-                        # Update value to the newly selected item (single or last)
-                        try:
-                            self._value = new_item.label()
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        # In single-selection mode ensure only one model item remains selected
+        if not self._multi_selection and len(self._selected_items) > 1:
+            last = self._selected_items[-1]
+            for it in self._selected_items[:-1]:
+                it.setSelected(False)
+            self._selected_items = [last]
 
-    def _on_selection_changed(self):
-        """Handle selection change in the list widget"""
-        if hasattr(self, '_list_widget') and self._list_widget:
-            # Update model.selected flags and selected items list
-            selected_indices = [index.row() for index in self._list_widget.selectedIndexes()]
-            new_selected = []
-            for idx, it in enumerate(self._items):                
-                if idx in selected_indices:
-                    it.setSelected(True)
-                    new_selected.append(it)
-                else:
-                    it.setSelected(False)
-           
-            # In single-selection mode ensure only one model item remains selected
-            if not self._multi_selection and len(new_selected) > 1:
-                # Keep only the last selected (mimic addItem logic and selection expectations)
-                last = new_selected[-1]
-                for it in list(new_selected)[:-1]:
+        self._update_value()
+
+        # Post selection-changed event to containing dialog
+        if self.notify():
+            dlg = self.findDialog()
+            if dlg is not None:
+                dlg._post_event(YWidgetEvent(self, YEventReason.SelectionChanged))
+
+    def _apply_item_diff(self, diff):
+        """Apply setItems() changes as row removes/inserts and dataChanged."""
+        if self._model is None:
+            self._selected_items = self._replace_items(diff)
+            self._item_to_row = {it: row for row, it in enumerate(self._items)}
+            if not self._multi_selection and len(self._selected_items) > 1:
+                for it in self._selected_items[:-1]:
                     it.setSelected(False)
-                new_selected = [last]
+                self._selected_items = self._selected_items[-1:]
+            self._update_value()
+            return
+        outgoing = list(self._items)
+        root = QtCore.QModelIndex()
+        self._suppress_selection_handler = True
+        try:
+            for row, count in diff.removed:
+                self._model.beginRemoveRows(root, row, row + count - 1)
+                del self._items[row:row + count]
+                self._model.endRemoveRows()
+            for row, new_items in diff.inserted:
+                self._model.beginInsertRows(root, row, row + len(new_items) - 1)
+                self._items[row:row] = new_items
+                self._model.endInsertRows()
+            # kept rows still hold the old objects: swap in the new ones
+            for row, _old, new, changed in diff.kept:
+                self._items[row] = new
+                if changed:
+                    idx = self._model.index(row, 0)
+                    self._model.dataChanged.emit(idx, idx)
+        finally:
+            self._suppress_selection_handler = False
+        self._adopt_items(outgoing)
+        self._item_to_row = {it: row for row, it in enumerate(self._items)}
+        selected = [it for it in self._items if it.selected()]
+        if not self._multi_selection and len(selected) > 1:
+            for it in selected[:-1]:
+                it.setSelected(False)
+            selected = selected[-1:]
+        self._selected_items = selected
+        self._update_value()
+        self._apply_selection_from_items()
 
-            self._selected_items = new_selected
+    def _item_rows(self, items):
+        """Return {item: row} for *items* in the box, via _item_to_row."""
+        rows = {}
+        for it in items:
+            row = self._item_to_row.get(it)
+            if row is not None:
+                rows[it] = row
+        return rows
 
-            # Update value to first selected item
-            if self._selected_items:
-                self._value = self._selected_items[0].label()
-            else:
-                self._value = ""
-            
-            # Post selection-changed event to containing dialog
-            if self.notify():
-                dlg = self.findDialog()
-                if dlg is not None:
-                    dlg._post_event(YWidgetEvent(self, YEventReason.SelectionChanged))
+    def _remove_rows(self, row, count):
+        """Drop a run of rows with one beginRemoveRows range; the view
+        drops their selection by itself."""
+        if self._model is None:
+            self._delete_run(None, row, count)
+            return
+        self._suppress_selection_handler = True
+        try:
+            self._model.beginRemoveRows(QtCore.QModelIndex(), row, row + count - 1)
+            try:
+                self._delete_run(None, row, count)
+            finally:
+                self._model.endRemoveRows()
+        finally:
+            self._suppress_selection_handler = False
+
+    def _rows_removed(self, first, gone):
+        """Renumber _item_to_row from the first removed row on only."""
+        for it in gone:
+            self._item_to_row.pop(it, None)
+        for row in range(first, len(self._items)):
+            it = self._items[row]
+            self._item_to_row[it] = row
+            it.setIndex(row)
+        self._update_value()
+
+    def _refresh_item(self, item, what):
+        """Repaint the row of an item whose label or icon changed."""
+        row = self._item_to_row.get(item)
+        if row is None or self._model is None:
+            return
+        idx = self._model.index(row, 0)
+        self._model.dataChanged.emit(idx, idx)
+        self._update_value()
 
     def deleteAllItems(self):
         """Remove all items from the selection box, both in the model and the Qt view."""
-        # Clear internal model state
-        super().deleteAllItems()
-        self._value = ""
-        self._selected_items = []
-
-        # Clear Qt list widget if present
+        if self._model is not None:
+            self._suppress_selection_handler = True
+            self._model.beginResetModel()
         try:
-            if getattr(self, '_list_widget', None) is not None:
-                try:
-                    self._list_widget.clear()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
+            super().deleteAllItems()
+            self._value = ""
+            self._selected_items = []
+            self._item_to_row.clear()
+        finally:
+            if self._model is not None:
+                self._model.endResetModel()
+                self._suppress_selection_handler = False
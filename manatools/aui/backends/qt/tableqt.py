@@ -17,7 +17,14 @@ Complexity comparison:
 Checkbox columns are rendered natively via Qt.CheckStateRole /
 Qt.ItemIsUserCheckable: no QCheckBox widget is created per cell.
 
-Sorting is handled inside _YTableModel.sort(), triggered by a header click.
+Sorting is handled inside _YTableModel.sort(), triggered by a header click
+or YTableQt.sortByColumns(): the shared YTableSort reorders the item list
+with cached typed keys (YTableCell.sortValue()), and the previous sort
+columns break ties, so clicking B then A sorts by A, then B.
+
+setFilter() hides rows through _YTableFilterProxy, a QSortFilterProxyModel
+between the model and the view; view indexes are proxy indexes and are
+mapped back with mapToSource() before looking up items.
 """
 from PySide6 import QtWidgets, QtCore, QtGui
 import logging
@@ -202,44 +209,79 @@ class _YTableModel(QtCore.QAbstractTableModel):
     def sort(self, column: int,
              order: QtCore.Qt.SortOrder = QtCore.Qt.AscendingOrder):
         """
-        Sort items in-place by *column*.
+        Sort items by *column*, keeping the previous sort columns as
+        tie-breakers.
 
         Triggered by a user click on a horizontal header section when
-        setSortingEnabled(True) is set on the view.  O(N log N) but only
-        called on explicit user interaction, not during populate.
+        setSortingEnabled(True) is set on the view.  A column of -1 (no
+        sort indicator) leaves the order unchanged.
         """
-        self.layoutAboutToBeChanged.emit()
-        try:
-            items = list(getattr(self._owner, '_items', []) or [])
+        if column < 0:
+            return
+        self._owner._sort.clickColumn(column, order == QtCore.Qt.AscendingOrder)
+        self.applySort()
 
-            def _key(it):
-                cell = None
-                try:
-                    cell = it.cell(column)
-                except Exception:
-                    pass
-                if cell is not None:
-                    try:
-                        if hasattr(cell, 'hasSortKey') and cell.hasSortKey():
-                            return str(cell.sortKey())
-                        return cell.label() or ""
-                    except Exception:
-                        pass
-                return ""
+    def applySort(self):
+        """
+        Reorder owner._items by owner._sort and remap persistent indexes,
+        so the selection and current row follow their items.
 
-            reverse = (order == QtCore.Qt.DescendingOrder)
-            items.sort(key=_key, reverse=reverse)
-            # Update owner's list in place and rebuild index map.
-            self._owner._items[:] = items
-            self._owner._item_to_row.clear()
-            for i, it in enumerate(items):
-                self._owner._item_to_row[it] = i
+        O(N log N) C-level comparisons on cached keys; one key lookup per
+        row and sort column in Python.
+        """
+        owner = self._owner
+        self.layoutAboutToBeChanged.emit()
+        try:
+            items = owner._items
+            persistent = self.persistentIndexList()
+            tracked = [items[idx.row()] if 0 <= idx.row() < len(items) else None
+                       for idx in persistent]
+            items[:] = owner._sort.sorted(items)
+            owner._item_to_row = {it: i for i, it in enumerate(items)}
+            moved = []
+            for idx, it in zip(persistent, tracked):
+                row = owner._item_to_row.get(it) if it is not None else None
+                moved.append(self.index(row, idx.column())
+                             if row is not None else QtCore.QModelIndex())
+            self.changePersistentIndexList(persistent, moved)
         except Exception as exc:
-            self._owner._logger.debug("sort: failed col=%d: %s", column, exc)
+            owner._logger.debug("applySort failed: %s", exc)
         finally:
             self.layoutChanged.emit()
 
 
+class _YTableFilterProxy(QtCore.QSortFilterProxyModel):
+    """
+    Filter layer for YTable.setFilter().
+
+    Rows are accepted by the owner's YTableFilter, whose per-row text index
+    makes each test a single string search.  Sorting stays in
+    _YTableModel.sort(): the proxy forwards header-click sorts to it and
+    never reorders rows itself.
+    """
+
+    def __init__(self, owner: 'YTableQt', parent=None):
+        super().__init__(parent)
+        self._owner = owner
+
+    def filterAcceptsRow(self, source_row: int,
+                         source_parent: QtCore.QModelIndex) -> bool:
+        items = self._owner._items
+        if 0 <= source_row < len(items):
+            return self._owner._filter.matches(items[source_row])
+        return True
+
+    def sort(self, column: int,
+             order: QtCore.Qt.SortOrder = QtCore.Qt.AscendingOrder):
+        source = self.sourceModel()
+        if source is not None:
+            source.sort(column, order)
+
+    def refilter(self):
+        """Re-run filterAcceptsRow() for all rows after the filter changed."""
+        self.invalidateFilter()
+
+
 class _CheckBoxColumnDelegate(QtWidgets.QStyledItemDelegate):
     """
     Per-column delegate for checkbox columns.
@@ -311,10 +353,9 @@ class _CheckBoxColumnDelegate(QtWidgets.QStyledItemDelegate):
             # converts Qt.CheckState enums to plain ints, breaking == comparisons.
             is_checked = False
             try:
-                items = getattr(self._owner, '_items', []) or []
-                row = index.row()
-                if 0 <= row < len(items):
-                    cell = items[row].cell(index.column())
+                it = self._owner._item_at(index)
+                if it is not None:
+                    cell = it.cell(index.column())
                     if cell is not None:
                         is_checked = bool(cell.checked())
             except Exception:
@@ -356,10 +397,9 @@ class _CheckBoxColumnDelegate(QtWidgets.QStyledItemDelegate):
         # QVariant C++ round-trip that corrupts enum comparisons.
         new_checked = True
         try:
-            items = getattr(self._owner, '_items', []) or []
-            row = index.row()
-            if 0 <= row < len(items):
-                cell = items[row].cell(index.column())
+            it = self._owner._item_at(index)
+            if it is not None:
+                cell = it.cell(index.column())
                 if cell is not None:
                     new_checked = not bool(cell.checked())  # toggle
         except Exception:
@@ -380,6 +420,9 @@ class YTableQt(YSelectionWidget):
       addItem()       O(1) via beginInsertRows/endInsertRows
       addItems(N)     O(N) index rebuild; single repaint
       selectItem()    O(1) via _item_to_row dict
+      setFilter()     O(N) string tests on a cached per-row text index
+      removeItems()   one beginRemoveRows range per contiguous run;
+                      _item_to_row renumbered from the first removed row on
     """
 
     def __init__(self, parent, header: YTableHeader, multiSelection=False):
@@ -400,6 +443,9 @@ class YTableQt(YSelectionWidget):
 
         self._view = None    # QTableView
         self._model = None   # _YTableModel
+        self._proxy = None   # _YTableFilterProxy (view model)
+        self._filter = YTableFilter()
+        self._sort = YTableSort()
         # Backward-compat alias: some code may reference self._table.
         self._table = None
         self._item_to_row: dict = {}
@@ -419,6 +465,23 @@ class YTableQt(YSelectionWidget):
         except Exception:
             return False
 
+    def _item_at(self, index: QtCore.QModelIndex):
+        """Return the YTableItem shown at view (proxy) *index*, or None."""
+        if self._proxy is not None and index.model() is self._proxy:
+            index = self._proxy.mapToSource(index)
+        row = index.row()
+        items = getattr(self, '_items', []) or []
+        if 0 <= row < len(items):
+            return items[row]
+        return None
+
+    def _view_index(self, row: int) -> QtCore.QModelIndex:
+        """Map source *row* to a view index (invalid when filtered out)."""
+        idx = self._model.index(row, 0)
+        if self._proxy is not None:
+            idx = self._proxy.mapFromSource(idx)
+        return idx
+
     # ------------------------------------------------------------------
     # Widget creation
     # ------------------------------------------------------------------
@@ -431,8 +494,10 @@ class YTableQt(YSelectionWidget):
         Checkbox clicks call model.setData(CheckStateRole) directly.
         """
         model = _YTableModel(self)
+        proxy = _YTableFilterProxy(self)
+        proxy.setSourceModel(model)
         view = QtWidgets.QTableView()
-        view.setModel(model)
+        view.setModel(proxy)
 
         view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         mode = (QtWidgets.QAbstractItemView.MultiSelection
@@ -467,6 +532,7 @@ class YTableQt(YSelectionWidget):
             self._logger.debug("_create_backend_widget: delegate setup failed: %s", exc)
 
         self._model = model
+        self._proxy = proxy
         self._view = view
         self._table = view          # backward-compat alias
         self._backend_widget = view
@@ -557,7 +623,7 @@ class YTableQt(YSelectionWidget):
                     if it.selected():
                         row = self._item_to_row.get(it)
                         if row is not None:
-                            idx = self._model.index(row, 0)
+                            idx = self._view_index(row)
                             sel_model.select(
                                 idx,
                                 QtCore.QItemSelectionModel.Select
@@ -571,7 +637,7 @@ class YTableQt(YSelectionWidget):
                 for it in new_selected[1:]:
                     row = self._item_to_row.get(it)
                     if row is not None:
-                        idx = self._model.index(row, 0)
+                        idx = self._view_index(row)
                         sel_model.select(
                             idx,
                             QtCore.QItemSelectionModel.Deselect
@@ -596,15 +662,18 @@ class YTableQt(YSelectionWidget):
         self._logger.debug("_on_selection_changed")
         try:
             sel_rows = self._view.selectionModel().selectedRows()
-            items = getattr(self, '_items', []) or []
             new_selected = []
             for idx in sel_rows:
-                row = idx.row()
-                if 0 <= row < len(items):
-                    new_selected.append(items[row])
+                it = self._item_at(idx)
+                if it is not None:
+                    new_selected.append(it)
 
             if not self._multi and len(new_selected) > 1:
                 new_selected = [new_selected[-1]]
+            elif self._multi and self._filter.isActive():
+                # rows hidden by the filter keep their selection
+                new_selected += [it for it in self._selected_items
+                                 if not self._filter.matches(it)]
 
             # Update .selected() flags.
             try:
@@ -671,7 +740,7 @@ class YTableQt(YSelectionWidget):
                                 except Exception:
                                     pass
                             self._selected_items = []
-                        idx = self._model.index(row, 0)
+                        idx = self._view_index(row)
                         sel_model.select(
                             idx,
                             QtCore.QItemSelectionModel.Select
@@ -688,6 +757,7 @@ class YTableQt(YSelectionWidget):
                         self._suppress_selection_handler = False
             except Exception:
                 pass
+        self._sort_in()
 
     def addItems(self, items):
         """
@@ -699,29 +769,34 @@ class YTableQt(YSelectionWidget):
         items = list(items)
         if not items:
             return
-        start_row = len(getattr(self, '_items', []) or [])
+        new_items = []
         for item in items:
             if isinstance(item, str):
                 item = YTableItem(item)
-                super().addItem(item)
-            elif isinstance(item, YTableItem):
-                super().addItem(item)
-            else:
+            elif not isinstance(item, YTableItem):
                 self._logger.error("YTable.addItems: invalid item type %s", type(item))
                 raise TypeError("YTable.addItems expects YTableItem or str")
-        end_row = len(self._items) - 1
+            new_items.append(item)
+        start_row = len(getattr(self, '_items', []) or [])
+        end_row = start_row + len(new_items) - 1
+        if self._model is not None:
+            self._model.beginInsertRows(QtCore.QModelIndex(), start_row, end_row)
+        try:
+            for item in new_items:
+                super().addItem(item)
+        finally:
+            if self._model is not None:
+                self._model.endInsertRows()
         # Build index for newly added items.
-        for i, it in enumerate(self._items[start_row:]):
+        for i, it in enumerate(new_items):
             row = start_row + i
             it.setIndex(row)
             self._item_to_row[it] = row
-        if self._model is not None and end_row >= start_row:
-            try:
-                self._model.beginInsertRows(QtCore.QModelIndex(), start_row, end_row)
-                self._model.endInsertRows()
-            except Exception as exc:
-                self._logger.debug("addItems: beginInsertRows failed: %s", exc)
-        self._apply_selection_from_model()
+        # the existing selection is already applied: only new pre-selected
+        # rows need a pass (keeps chunked addItemsAsync() linear)
+        if any(it.selected() for it in new_items):
+            self._apply_selection_from_model()
+        self._sort_in()
 
     def selectItem(self, item, selected=True):
         """Select or deselect *item* in both model and view."""
@@ -760,7 +835,7 @@ class YTableQt(YSelectionWidget):
                         except Exception:
                             pass
                     self._selected_items = []
-                idx = self._model.index(row, 0)
+                idx = self._view_index(row)
                 sel_model.select(
                     idx,
                     QtCore.QItemSelectionModel.Select
@@ -771,7 +846,7 @@ class YTableQt(YSelectionWidget):
                 elif item not in self._selected_items:
                     self._selected_items.append(item)
             else:
-                idx = self._model.index(row, 0)
+                idx = self._view_index(row)
                 sel_model.select(
                     idx,
                     QtCore.QItemSelectionModel.Deselect
@@ -786,6 +861,112 @@ class YTableQt(YSelectionWidget):
         finally:
             self._suppress_selection_handler = False
 
+    def _apply_item_diff(self, diff):
+        """
+        Apply setItems() changes with row-range inserts/removes.
+
+        Only rows whose cells changed get a dataChanged signal; the view
+        keeps its scroll position and repaints the affected rows only.
+        """
+        if self._model is None:
+            self._filter.carryOver(diff)
+            self._replace_items(diff)
+            self._item_to_row = {it: i for i, it in enumerate(self._items)}
+            selected = [it for it in self._items if it.selected()]
+            self._selected_items = selected if self._multi else selected[:1]
+            self._sort_in()
+            return
+        outgoing = list(self._items)
+        root = QtCore.QModelIndex()
+        last_col = max(0, self._model.columnCount() - 1)
+        self._filter.carryOver(diff)
+        self._suppress_selection_handler = True
+        try:
+            for row, count in diff.removed:
+                self._model.beginRemoveRows(root, row, row + count - 1)
+                del self._items[row:row + count]
+                self._model.endRemoveRows()
+            for row, new_items in diff.inserted:
+                self._model.beginInsertRows(root, row, row + len(new_items) - 1)
+                self._items[row:row] = new_items
+                self._model.endInsertRows()
+            for row, _old, new, changed in diff.kept:
+                self._items[row] = new
+                if changed:
+                    self._model.dataChanged.emit(self._model.index(row, 0),
+                                                 self._model.index(row, last_col))
+        except Exception as exc:
+            self._logger.debug("_apply_item_diff failed: %s", exc)
+        finally:
+            self._suppress_selection_handler = False
+        self._adopt_items(outgoing)
+        self._item_to_row = {it: i for i, it in enumerate(self._items)}
+        if self._changed_item is not None:
+            self._changed_item = dict(diff.pairs).get(self._changed_item)
+        self._apply_selection_from_model()
+        self._sort_in()
+
+    def _refresh_item(self, item, what):
+        """Repaint the row of an item whose cells changed (one dataChanged).
+
+        The row's filter key is dropped first, so the proxy re-tests it
+        against the current filter on dataChanged; with an active sort the
+        rows are re-sorted.
+        """
+        self._filter.invalidate(item)
+        row = self._item_to_row.get(item)
+        if row is None:
+            return
+        if self._model is not None:
+            last_col = max(0, self._model.columnCount() - 1)
+            self._model.dataChanged.emit(self._model.index(row, 0),
+                                         self._model.index(row, last_col))
+        if "cell" in what or "label" in what:
+            self._sort_in()
+
+    def _item_rows(self, items):
+        """Return {item: row} for *items* in the table, via _item_to_row."""
+        rows = {}
+        for it in items:
+            row = self._item_to_row.get(it)
+            if row is not None:
+                rows[it] = row
+        return rows
+
+    def _remove_item_runs(self, runs, gone):
+        """
+        Remove each contiguous run of rows with one beginRemoveRows range.
+
+        The view drops the selection of removed rows by itself; the other
+        rows keep it.  _item_to_row is renumbered from the first removed
+        row on only.
+        """
+        root = QtCore.QModelIndex()
+        self._suppress_selection_handler = True
+        try:
+            for row, count in runs.get(None, []):
+                if self._model is not None:
+                    self._model.beginRemoveRows(root, row, row + count - 1)
+                try:
+                    self._delete_run(None, row, count)
+                finally:
+                    if self._model is not None:
+                        self._model.endRemoveRows()
+        except Exception as exc:
+            self._logger.debug("_remove_item_runs failed: %s", exc)
+        finally:
+            self._suppress_selection_handler = False
+        for it in gone:
+            self._item_to_row.pop(it, None)
+            self._filter.invalidate(it)
+        first = min((row for row, _count in runs.get(None, [])), default=len(self._items))
+        for row in range(first, len(self._items)):
+            it = self._items[row]
+            self._item_to_row[it] = row
+            it.setIndex(row)
+        if self._changed_item in gone:
+            self._changed_item = None
+
     def deleteAllItems(self):
         """Clear all items from the table."""
         try:
@@ -795,6 +976,7 @@ class YTableQt(YSelectionWidget):
             self._items = []
             self._selected_items = []
         self._item_to_row.clear()
+        self._filter.invalidate()
         if self._model is not None:
             self._suppress_selection_handler = True
             try:
@@ -805,6 +987,99 @@ class YTableQt(YSelectionWidget):
             finally:
                 self._suppress_selection_handler = False
 
+    def setFilter(self, text="", columns=None, mode="substring"):
+        """
+        Show only the rows matching *text*; an empty text shows all rows.
+
+        *columns* restricts matching to the given column numbers and *mode*
+        is "substring", "prefix" or "regex" (see YTableFilter).  Rows hidden
+        by the filter keep their selection.  Raises ValueError for an
+        unknown mode or an invalid regular expression.
+        """
+        change = self._filter.setFilter(text, columns, mode)
+        if change == YTableFilter.UNCHANGED or self._proxy is None:
+            return
+        self._suppress_selection_handler = True
+        try:
+            self._proxy.refilter()
+        except Exception as exc:
+            self._logger.debug("setFilter: refilter failed: %s", exc)
+        finally:
+            self._suppress_selection_handler = False
+        self._select_in_view()
+
+    def filterText(self) -> str:
+        return self._filter.text()
+
+    def sortByColumns(self, keys):
+        """
+        Sort rows by several columns: *keys* lists column numbers or
+        (column, ascending) pairs, primary first.  The header shows the
+        primary column; an empty list keeps the current order.
+        """
+        self._sort.setKeys(keys)
+        keys = self._sort.keys()
+        if not keys:
+            return
+        if self._model is None:
+            self._items[:] = self._sort.sorted(self._items)
+            self._item_to_row = {it: i for i, it in enumerate(self._items)}
+            return
+        self._model.applySort()
+        try:
+            column, ascending = keys[0]
+            hdr = self._view.horizontalHeader()
+            hdr.blockSignals(True)
+            try:
+                hdr.setSortIndicator(
+                    column,
+                    QtCore.Qt.AscendingOrder if ascending else QtCore.Qt.DescendingOrder,
+                )
+            finally:
+                hdr.blockSignals(False)
+            hdr.viewport().update()
+        except Exception as exc:
+            self._logger.debug("sortByColumns: sort indicator failed: %s", exc)
+
+    def sortColumns(self) -> list:
+        """Return the current sort columns as [(column, ascending)], primary first."""
+        return self._sort.keys()
+
+    def _sort_in(self):
+        """Move added or edited rows to their place while a sort is active."""
+        if not self._sort.keys():
+            return
+        if self._model is None:
+            self._items[:] = self._sort.sorted(self._items)
+            self._item_to_row = {it: i for i, it in enumerate(self._items)}
+            return
+        self._model.applySort()
+
+        """Re-select the rows of _selected_items that the filter shows."""
+        if self._view is None:
+            return
+        sel_model = self._view.selectionModel()
+        if sel_model is None:
+            return
+        self._suppress_selection_handler = True
+        try:
+            sel_model.clearSelection()
+            for it in self._selected_items:
+                row = self._item_to_row.get(it)
+                if row is None:
+                    continue
+                idx = self._view_index(row)
+                if idx.isValid():
+                    sel_model.select(
+                        idx,
+                        QtCore.QItemSelectionModel.Select
+                        | QtCore.QItemSelectionModel.Rows,
+                    )
+        except Exception as exc:
+            self._logger.debug("_select_in_view failed: %s", exc)
+        finally:
+            self._suppress_selection_handler = False
+
     def changedItem(self):
         """Return the most recently changed item (last checkbox toggle)."""
         return self._changed_item
@@ -9,7 +9,7 @@ Author:  Angelo Naselli <anaselli@linux.it>
 
 @package manatools.aui.backends.qt
 '''
-from PySide6 import QtWidgets, QtGui
+from PySide6 import QtWidgets, QtCore, QtGui
 import logging
 from ...yui_common import *
 from .commonqt import _resolve_icon
@@ -512,10 +512,12 @@ class YTreeQt(YSelectionWidget):
             item.setIndex(len(self._items) - 1)
         except Exception:
             pass
-        # if backend exists, refresh tree to reflect new item (including icon/selection)
+        # if backend exists, refresh tree to reflect new item (including icon/selection);
+        # inside batchUpdate() the rebuild runs once when the batch ends
         try:
             if getattr(self, '_tree_widget', None) is not None:
-               self._rebuildTree()
+                if not self._defer_to_batch_end(self._rebuildTree):
+                    self._rebuildTree()
         except Exception:
             pass
 
@@ -532,13 +534,48 @@ class YTreeQt(YSelectionWidget):
                 raise TypeError("YTree.addItem expects a YTreeItem or string label")
             # ensure index set
             item.setIndex(len(self._items) - 1)
-        # if backend exists, refresh tree to reflect new item (including icon/selection)
+        # if backend exists, refresh tree to reflect new item (including icon/selection);
+        # inside batchUpdate() the rebuild runs once when the batch ends
         try:
             if getattr(self, '_tree_widget', None) is not None:
-               self._rebuildTree()
+                if not self._defer_to_batch_end(self._rebuildTree):
+                    self._rebuildTree()
         except Exception:
             pass
 
+    def _append_items(self, items):
+        """Append one addItemsAsync() chunk, building QTreeWidgetItems for the
+        new subtrees only instead of rebuilding the whole tree."""
+        if getattr(self, '_tree_widget', None) is None:
+            self.addItems(items)
+            return
+        new_items = []
+        for item in items:
+            if isinstance(item, str):
+                item = YTreeItem(item)
+            elif not isinstance(item, YTreeItem):
+                self._logger.error("YTree.addItem: invalid item type %s", type(item))
+                raise TypeError("YTree.addItem expects a YTreeItem or string label")
+            super().addItem(item)
+            item.setIndex(len(self._items) - 1)
+            new_items.append(item)
+        self._suppress_selection_handler = True
+        try:
+            qitems = [self._make_qitem(it) for it in new_items]
+            self._tree_widget.addTopLevelItems(qitems)
+            for q in qitems:
+                self._expand_from_items(q)
+            has_selected = False
+            stack = list(new_items)
+            while stack and not has_selected:
+                n = stack.pop()
+                has_selected = n.selected()
+                stack.extend(getattr(n, "_children", []) or [])
+            if has_selected:
+                self._apply_selection_from_items()
+        finally:
+            self._suppress_selection_handler = False
+
     # property API hooks (minimal implementation)
     def setProperty(self, propertyName, val):
         try:
@@ -698,6 +735,189 @@ class YTreeQt(YSelectionWidget):
         except Exception:
             pass
 
+    def _apply_item_diff(self, diff):
+        """Apply setItems() changes level by level on the QTreeWidget.
+
+        Only removed and inserted subtrees are destroyed or built; kept nodes
+        keep their QTreeWidgetItem, hence their expansion state and the
+        scroll position, and are relabelled only when label or icon changed.
+        """
+        if getattr(self, '_tree_widget', None) is None:
+            self._replace_items(diff)
+            self._selected_items = self._collect_selected_nodes()
+            return
+        self._suppress_selection_handler = True
+        try:
+            self._sync_children(None, diff)
+            self._replace_items(diff)
+            self._apply_selection_from_items()
+        except Exception:
+            self._logger.error("_apply_item_diff failed, rebuilding tree", exc_info=True)
+            self._replace_items(diff)
+            self._rebuildTree()
+        finally:
+            self._suppress_selection_handler = False
+
+    def _refresh_item(self, item, what):
+        """Update the QTreeWidgetItem of one node: text, icon and appended children."""
+        if getattr(self, '_tree_widget', None) is None:
+            return
+        q = self._item_to_qitem.get(item)
+        if q is None:
+            return
+        if "label" in what or "icon" in what:
+            q.setText(0, item.label())
+            ico = _resolve_icon(item.iconName()) if item.iconName() else None
+            q.setIcon(0, ico if ico is not None else QtGui.QIcon())
+        if "children" in what:
+            kids = list(getattr(item, "_children", []) or [])
+            if q.childCount() > len(kids):
+                self._rebuildTree()
+                return
+            # YTreeItem.addChild() only appends: build the missing tail
+            for child in kids[q.childCount():]:
+                cq = self._make_qitem(child)
+                q.addChild(cq)
+                self._expand_from_items(cq)
+
+    def _remove_item_runs(self, runs, gone):
+        """Take the QTreeWidgetItems of the removed nodes out of the tree.
+
+        A top-level run goes with one model removeRows() range; child runs
+        are taken one by one (QTreeWidgetItem has no range removal).  Other
+        nodes keep their QTreeWidgetItem, selection and expansion.
+        """
+        tw = getattr(self, '_tree_widget', None)
+        if tw is None:
+            self._delete_runs(runs)
+            return
+        self._suppress_selection_handler = True
+        try:
+            for parent, parent_runs in runs.items():
+                pq = None if parent is None else self._item_to_qitem.get(parent)
+                for row, count in parent_runs:
+                    if parent is None:
+                        for i in range(row, row + count):
+                            self._forget_qitem(tw.topLevelItem(i))
+                        tw.model().removeRows(row, count, QtCore.QModelIndex())
+                    elif pq is not None:
+                        for _ in range(count):
+                            self._forget_qitem(pq.takeChild(row))
+                    self._delete_run(parent, row, count)
+        except Exception:
+            self._logger.error("_remove_item_runs failed, rebuilding tree", exc_info=True)
+            self._rebuildTree()
+        finally:
+            self._suppress_selection_handler = False
+        first = min((row for row, _count in runs.get(None, [])), default=len(self._items))
+        for row in range(first, len(self._items)):
+            self._items[row].setIndex(row)
+        self._last_selected_ids = set(id(i) for i in self._selected_items)
+        self._last_selected_qitems = set(tw.selectedItems())
+
+    def _sync_children(self, parent_qitem, diff):
+        """Apply one level of a YItemDiff below *parent_qitem* (None: top level)."""
+        tw = self._tree_widget
+        for row, count in diff.removed:
+            for _ in range(count):
+                if parent_qitem is None:
+                    q = tw.takeTopLevelItem(row)
+                else:
+                    q = parent_qitem.takeChild(row)
+                self._forget_qitem(q)
+        for row, new_items in diff.inserted:
+            for offset, it in enumerate(new_items):
+                q = self._make_qitem(it)
+                if parent_qitem is None:
+                    tw.insertTopLevelItem(row + offset, q)
+                else:
+                    parent_qitem.insertChild(row + offset, q)
+                # expansion only sticks once the item is part of the tree
+                self._expand_from_items(q)
+        for row, old, new, changed in diff.kept:
+            q = self._item_to_qitem.pop(old, None)
+            if q is None:
+                continue
+            self._qitem_to_item[q] = new
+            self._item_to_qitem[new] = q
+            if changed:
+                q.setText(0, new.label())
+                ico = _resolve_icon(new.iconName()) if new.iconName() else None
+                q.setIcon(0, ico if ico is not None else QtGui.QIcon())
+            sub = diff.children.get(new)
+            if sub is not None:
+                self._sync_children(q, sub)
+
+    def _make_qitem(self, item):
+        """Build the QTreeWidgetItem subtree for *item* and register mappings."""
+        qitem = QtWidgets.QTreeWidgetItem([item.label()])
+        self._qitem_to_item[qitem] = item
+        self._item_to_qitem[item] = qitem
+        try:
+            if item.iconName():
+                ico = _resolve_icon(item.iconName())
+                if ico is not None:
+                    qitem.setIcon(0, ico)
+        except Exception:
+            self._logger.error("Error setting icon for tree item %s", item.label(), exc_info=True)
+        for c in getattr(item, "_children", []) or []:
+            qitem.addChild(self._make_qitem(c))
+        return qitem
+
+    def _expand_from_items(self, qitem):
+        """Apply the logical _is_open flags to *qitem* and its descendants."""
+        item = self._qitem_to_item.get(qitem)
+        if item is not None:
+            qitem.setExpanded(bool(getattr(item, "_is_open", False)))
+        for i in range(qitem.childCount()):
+            self._expand_from_items(qitem.child(i))
+
+    def _forget_qitem(self, qitem):
+        """Drop the mappings of a removed QTreeWidgetItem subtree."""
+        if qitem is None:
+            return
+        item = self._qitem_to_item.pop(qitem, None)
+        if item is not None:
+            self._item_to_qitem.pop(item, None)
+        for i in range(qitem.childCount()):
+            self._forget_qitem(qitem.child(i))
+
+    def _collect_selected_nodes(self):
+        """Return the selected logical nodes in pre-order, honouring single selection."""
+        selected = []
+
+        def _visit(nodes):
+            for n in nodes:
+                try:
+                    if n.selected():
+                        selected.append(n)
+                except Exception:
+                    pass
+                _visit(getattr(n, "_children", []) or [])
+        _visit(self._items)
+        if not self._multi and len(selected) > 1:
+            for it in selected[1:]:
+                it.setSelected(False)
+            selected = selected[:1]
+        return selected
+
+    def _apply_selection_from_items(self):
+        """Select the QTreeWidgetItems of selected logical nodes (no events)."""
+        selected = self._collect_selected_nodes()
+        self._tree_widget.clearSelection()
+        for it in selected:
+            q = self._item_to_qitem.get(it)
+            if q is None:
+                continue
+            q.setSelected(True)
+            pq = q.parent()
+            while pq is not None:
+                pq.setExpanded(True)
+                pq = pq.parent()
+        self._selected_items = selected
+        self._last_selected_ids = set(id(i) for i in selected)
+        self._last_selected_qitems = set(self._tree_widget.selectedItems())
+
     def deleteAllItems(self):
         """Remove all items from model and QTreeWidget view."""
         self._suppress_selection_handler = True
@@ -3,6 +3,17 @@ Common base classes and definitions shared across all backends
 """
 
 from enum import Enum
+from collections import OrderedDict
+import bisect
+import contextlib
+import datetime
+import html
+import itertools
+import locale
+import logging
+import os
+import re
+import threading
 import uuid
 from typing import Optional
 
@@ -146,6 +157,9 @@ class YCancelEvent(YEvent):
 # Base Widget Class
 class YWidget:
     _widget_counter = 0
+    # bumped when any widget tree gains or loses a widget (or a shortcut
+    # changes); backends rebuild caches derived from the tree when it moves
+    _structure_serial = 0
     
     def __init__(self, parent=None):
         YWidget._widget_counter += 1
@@ -165,6 +179,10 @@ class YWidget:
         self._notify = True
         self._auto_shortcut = False
         self._function_key = 0
+        # batchUpdate() nesting level and the work postponed to its end
+        self._batch_depth = 0
+        self._batch_deferred = {}
+        self._batch_suspended = None
         
         if parent and hasattr(parent, 'addChild'):
             parent.addChild(self)
@@ -215,11 +233,18 @@ class YWidget:
             child._parent = self
             if self.isEnabled() is False:
                 child._enabled = False
+            YWidget._structure_changed()
     
     def removeChild(self, child):
         if child in self._children:
             self._children.remove(child)
             child._parent = None
+            YWidget._structure_changed()
+
+    @staticmethod
+    def _structure_changed():
+        """Invalidate caches derived from widget trees (see _structure_serial)."""
+        YWidget._structure_serial += 1
 
     def deleteChildren(self):
         """
@@ -243,6 +268,7 @@ class YWidget:
                 self._children = []
             except Exception:
                 pass
+        YWidget._structure_changed()
     
     def parent(self):
         return self._parent
@@ -357,6 +383,107 @@ class YWidget:
     def setFunctionKey(self, fkey_no):
         self._function_key = fkey_no
     
+    @contextlib.contextmanager
+    def batchUpdate(self):
+        """Context manager grouping many changes into one update.
+
+        ::
+
+            with dialog.batchUpdate():
+                for row in rows:
+                    table.addItem(row)
+                log.appendLines(text)
+
+        While the outermost batch is open this widget and its descendants
+        postpone refreshes they would otherwise redo on every change (tree
+        rebuilds, log view text) to the end of the batch, where each one
+        runs once, and the backend holds what it can (see
+        _begin_batch_update()).  Batches nest; only the outermost one
+        applies the final update.
+        """
+        self._batch_depth += 1
+        if self._batch_depth == 1:
+            try:
+                self._begin_batch_update()
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    "batchUpdate: begin failed for %s", self.debugLabel())
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                deferred, self._batch_deferred = self._batch_deferred, {}
+                for callback in deferred.values():
+                    try:
+                        callback()
+                    except Exception:
+                        logging.getLogger(__name__).exception(
+                            "batchUpdate: deferred update failed for %s", self.debugLabel())
+                try:
+                    self._end_batch_update()
+                except Exception:
+                    logging.getLogger(__name__).exception(
+                        "batchUpdate: end failed for %s", self.debugLabel())
+
+    def inBatchUpdate(self) -> bool:
+        """Return True while this widget or one of its ancestors is in batchUpdate()."""
+        w = self
+        while w is not None:
+            if getattr(w, "_batch_depth", 0):
+                return True
+            w = getattr(w, "_parent", None)
+        return False
+
+    def _defer_to_batch_end(self, callback):
+        """Postpone *callback* to the end of the innermost enclosing batch.
+
+        Returns False, without calling anything, when no batch is open; the
+        caller then does the work right away.  A callback deferred several
+        times (e.g. the same bound method) runs only once.
+        """
+        w = self
+        while w is not None:
+            if getattr(w, "_batch_depth", 0):
+                w._batch_deferred[callback] = callback
+                return True
+            w = getattr(w, "_parent", None)
+        return False
+
+    def _begin_batch_update(self):
+        """Backend hook run when the outermost batchUpdate() opens.
+
+        The default suspends repaints of a Qt backend widget
+        (``setUpdatesEnabled``).  On GTK it only holds property
+        notifications (``freeze_notify``): layout and drawing are not
+        suspended, they just never run before control returns to the main
+        loop, and list models still get one change signal per mutation, so
+        GTK coalesces the deferred refreshes and notifications only.
+        Backends override it for anything else.
+        """
+        bw = self._backend_widget
+        if bw is None:
+            return
+        if hasattr(bw, "setUpdatesEnabled"):
+            if bw.updatesEnabled():
+                bw.setUpdatesEnabled(False)
+                self._batch_suspended = bw
+        elif hasattr(bw, "freeze_notify"):
+            bw.freeze_notify()
+            self._batch_suspended = bw
+
+    def _end_batch_update(self):
+        """Backend hook run after the outermost batchUpdate() closed and the
+        deferred work ran; undoes _begin_batch_update()."""
+        bw, self._batch_suspended = self._batch_suspended, None
+        if bw is None:
+            return
+        if hasattr(bw, "setUpdatesEnabled"):
+            # re-enabling schedules a single repaint of the whole subtree
+            bw.setUpdatesEnabled(True)
+        else:
+            bw.thaw_notify()
+
     # Backend-specific methods to be implemented by concrete classes
     def _set_backend_enabled(self, enabled):
         pass
@@ -391,6 +518,11 @@ class YSelectionWidget(YWidget):
         self._selected_items = []
         self._label = ""
         self._icon_base_path = ""
+        # item -> set of changed aspects, waiting for _flush_item_changes()
+        self._pending_item_changes = {}
+        self._item_flush_queued = False
+        # running addItemsAsync() loader, if any
+        self._item_loader = None
     
     def label(self):
         return self._label
@@ -401,6 +533,7 @@ class YSelectionWidget(YWidget):
     def addItem(self, item):
         if isinstance(item, str):
             item = YItem(item)
+        item._owner = self
         self._items.append(item)
 
     def addItems(self, items):
@@ -409,9 +542,159 @@ class YSelectionWidget(YWidget):
             self.addItem(it)
     
     def deleteAllItems(self):
+        if self._item_loader is not None:
+            self._item_loader.cancel()
+        for it in self._items:
+            if getattr(it, "_owner", None) is self:
+                it._owner = None
         self._items.clear()
         self._selected_items.clear()
+        self._pending_item_changes.clear()
     
+    def removeItem(self, item):
+        """Remove *item* (see removeItems())."""
+        self.removeItems([item])
+
+    def removeItems(self, items):
+        """Remove *items* from the widget; items it does not hold are ignored.
+
+        Tree nodes may be at any level and go with their subtree.  Each
+        contiguous run of sibling rows is removed from the view in one go,
+        the other items keep their rows, selection and (in trees) open state,
+        and removed items drop out of selectedItems().  No event is posted.
+        """
+        runs = self._removal_runs(items)
+        if not runs:
+            return
+        gone = set()
+        stack = []
+        for parent, parent_runs in runs.items():
+            siblings = self._items if parent is None else parent._children
+            for row, count in parent_runs:
+                stack.extend(siblings[row:row + count])
+        while stack:
+            node = stack.pop()
+            gone.add(node)
+            stack.extend(getattr(node, "_children", []) or [])
+        for it in gone:
+            self._pending_item_changes.pop(it, None)
+        self._selected_items = [it for it in self._selected_items if it not in gone]
+        self._remove_item_runs(runs, gone)
+        for it in gone:
+            if getattr(it, "_owner", None) is self:
+                it._owner = None
+
+    def _item_rows(self, items):
+        """Return {item: row} for the top-level *items* held by the widget.
+
+        Backends keeping an item -> row index override this with lookups.
+        """
+        wanted = set(items)
+        rows = {}
+        for row, it in enumerate(self._items):
+            if it in wanted:
+                rows[it] = row
+                if len(rows) == len(wanted):
+                    break
+        return rows
+
+    def _removal_runs(self, items):
+        """Group *items* into {parent: [(row, count)]} runs of sibling rows,
+        highest row first; parent None stands for the top level."""
+        items = list(dict.fromkeys(items))
+        wanted = set(items)
+        top = self._item_rows(items)
+        rows_by_parent = {None: sorted(top.values())} if top else {}
+        for it in items:
+            if it in top:
+                continue
+            parent = getattr(it, "_parent_item", None)
+            if parent is None or not self._holds_node(parent):
+                continue
+            ancestor = parent
+            while ancestor is not None and ancestor not in wanted:
+                ancestor = getattr(ancestor, "_parent_item", None)
+            if ancestor is not None:
+                continue   # goes with the removed ancestor's subtree
+            try:
+                row = parent._children.index(it)
+            except ValueError:
+                continue
+            rows_by_parent.setdefault(parent, []).append(row)
+        runs = {}
+        for parent, rows in rows_by_parent.items():
+            rows = sorted(set(rows))
+            parent_runs = []
+            for row in rows:
+                if parent_runs and parent_runs[-1][0] + parent_runs[-1][1] == row:
+                    parent_runs[-1][1] += 1
+                else:
+                    parent_runs.append([row, 1])
+            runs[parent] = [tuple(r) for r in reversed(parent_runs)]
+        return runs
+
+    def _holds_node(self, node):
+        """Tell whether tree *node* belongs to this widget."""
+        while node is not None:
+            if getattr(node, "_owner", None) is self:
+                return True
+            node = getattr(node, "_parent_item", None)
+        return False
+
+    def _remove_item_runs(self, runs, gone):
+        """Remove the rows of *runs* (see _removal_runs()) from the item
+        lists and the view.  *gone* holds every removed item, subtrees
+        included.
+
+        The default deletes nested runs from the item lists, hands each
+        top-level run to _remove_rows(), highest row first, and lets
+        _rows_removed() fix up what follows.  Trees and tables override it
+        as a whole.
+        """
+        self._delete_runs({p: r for p, r in runs.items() if p is not None})
+        top = runs.get(None)
+        if not top:
+            return
+        for row, count in top:
+            self._remove_rows(row, count)
+        self._rows_removed(top[-1][0], gone)
+
+    def _remove_rows(self, row, count):
+        """Delete *count* top-level items from *row* on, with their view rows.
+
+        Backends wrap _delete_run() in a single range removal of their view
+        (beginRemoveRows(), store.splice(), ...).  The default rebuilds the
+        widget through the public API, which suits widgets with a handful
+        of rows such as dumb tabs.
+        """
+        remaining = self._items[:row] + self._items[row + count:]
+        self.deleteAllItems()
+        self.addItems(remaining)
+
+    def _rows_removed(self, first, gone):
+        """Renumber the rows from *first* on after _remove_rows() calls.
+
+        Backends extend this to update their item -> row maps, hover and
+        scroll positions and the shown value.
+        """
+        for row in range(first, len(self._items)):
+            self._items[row].setIndex(row)
+
+    def _delete_runs(self, runs):
+        """Delete all *runs* from the item lists (no view update)."""
+        for parent, parent_runs in runs.items():
+            for row, count in parent_runs:
+                self._delete_run(parent, row, count)
+
+    def _delete_run(self, parent, row, count):
+        """Delete *count* sibling items from *row* on from the item lists."""
+        if parent is None:
+            del self._items[row:row + count]
+            return
+        for it in parent._children[row:row + count]:
+            it._parent_item = None
+        del parent._children[row:row + count]
+
     def itemsBegin(self):
         return iter(self._items)
     
@@ -439,6 +722,153 @@ class YSelectionWidget(YWidget):
         elif not selected and item in self._selected_items:
             self._selected_items.remove(item)
 
+    def addItemsAsync(self, items, chunk=2000, progress=None, done=None):
+        """Add *items* (any iterable, typically a generator) a chunk at a time.
+
+        The first chunk is added right away, the following ones whenever the
+        dialog event loop is idle, so the partial list can be scrolled and
+        selected while the rest is still being produced.  *progress* is
+        called with the loader after every chunk and *done* once at the end
+        (also after cancel()).  Starting a new load, deleteAllItems() or
+        YAsyncItemLoader.cancel() stop a running one.  Without a dialog
+        there is no event loop to wait for, and all items are added at once.
+
+        Returns the YAsyncItemLoader.
+        """
+        if self._item_loader is not None:
+            self._item_loader.cancel()
+        loader = YAsyncItemLoader(self, items, chunk, progress, done)
+        self._item_loader = loader
+        loader._start()
+        return loader
+
+    def _append_items(self, items):
+        """Append one addItemsAsync() chunk.
+
+        Backends whose addItems() refreshes the whole view (trees) override
+        this to build the view only for the new items.
+        """
+        self.addItems(items)
+
+    def setItems(self, new_items, key=None):
+        """Replace the items with *new_items*, touching only rows that differ.
+
+        Old and new items are matched by ``key(item)`` (default: the item
+        label); if keys repeat among the old or the new items, that level is
+        matched by identity.  A table row label is its first cell, often
+        empty or repeated, so tables should pass an explicit *key*.  Matched
+        items keep their selection (and, in trees, their open state);
+        unmatched old items are removed and unmatched new items inserted.  Backends translate the resulting YItemDiff into row
+        inserts, removes and per-row updates, so a periodic refresh of a
+        large list only touches the rows that changed and keeps the scroll
+        position.  Strings are wrapped like in addItem().
+        """
+        if key is None:
+            key = YItemDiff.labelKey
+        item_class = {"YTable": YTableItem, "YTree": YTreeItem}.get(self.widgetClass(), YItem)
+        items = [item_class(it) if isinstance(it, str) else it for it in new_items]
+        diff = YItemDiff.compute(self._items, items, key,
+                                 recursive=(self.widgetClass() == "YTree"))
+        diff.carryState()
+        for row, it in enumerate(items):
+            try:
+                it.setIndex(row)
+            except Exception:
+                pass
+        self._apply_item_diff(diff)
+
+    def _apply_item_diff(self, diff):
+        """Apply a YItemDiff to the backend.
+
+        Backends override this to mutate only the affected rows; the default
+        rebuilds through the public API.
+        """
+        self.deleteAllItems()
+        self.addItems(diff.items)
+
+    def _replace_items(self, diff):
+        """Install diff.items as the item list (model only) and return the
+        selected items, in row order."""
+        outgoing = list(self._items)
+        self._items[:] = diff.items
+        self._adopt_items(outgoing)
+        return [it for it in self._items if it.selected()]
+
+    def _adopt_items(self, outgoing):
+        """Hand item ownership over from *outgoing* to the current item list.
+
+        Backends that splice diff.items into self._items row by row call this
+        once the list is complete, so edits of the new items reach this widget
+        and removed items stop notifying it.
+        """
+        for it in outgoing:
+            if getattr(it, "_owner", None) is self:
+                it._owner = None
+        for it in self._items:
+            it._owner = self
+
+    def _item_changed(self, item, what):
+        """Observer hook called by an item of this widget when *what*
+        ("label", "icon", "selected", "cell" or "children") changed.
+
+        Changes are collected and applied by _flush_item_changes(), which the
+        dialog defers to its event loop: several edits of one row end up in a
+        single row update, and flags the backend itself sets while handling a
+        view signal are seen only once the view already agrees with them.
+        """
+        self._pending_item_changes.setdefault(item, set()).add(what)
+        if self._item_flush_queued:
+            return
+        dlg = None
+        try:
+            dlg = self.findDialog()
+        except Exception:
+            pass
+        # without a dialog there is no view yet: backend widgets are built
+        # from the items, and pending changes go with the next queued flush
+        if dlg is not None and hasattr(dlg, "_queue_item_flush"):
+            self._item_flush_queued = True
+            dlg._queue_item_flush(self)
+
+    def _flush_item_changes(self):
+        """Apply the pending item changes, one row at a time."""
+        self._item_flush_queued = False
+        pending = self._pending_item_changes
+        if not pending:
+            return
+        self._pending_item_changes = {}
+        # membership set built once per flush: a select-all must stay linear
+        selected = None
+        for item, what in pending.items():
+            if "selected" in what:
+                what = what - {"selected"}
+                if selected is None:
+                    selected = set(self._selected_items)
+                want = bool(item.selected())
+                if want != (item in selected):
+                    self.selectItem(item, want)
+                    if want:
+                        selected.add(item)
+                    else:
+                        selected.discard(item)
+                    # single selection or recursion changed other rows too
+                    if len(selected) != len(self._selected_items):
+                        selected = None
+            if what:
+                try:
+                    self._refresh_item(item, what)
+                except Exception:
+                    logging.getLogger(__name__).exception(
+                        "_refresh_item failed for %s", self.widgetClass())
+
+    def _refresh_item(self, item, what):
+        """Redraw the row of *item* after a label, icon, cell or children change.
+
+        Backends override this with a single-row update; the default does
+        nothing, which suits backends that draw straight from the items.
+        """
+        pass
+
 class YSimpleInputField(YWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -464,18 +894,25 @@ class YItem:
         self._icon_name = icon_name
         self._index = 0
         self._data = None
+        # selection widget showing this item (set by addItem()/setItems());
+        # tree children reach it through their parents
+        self._owner = None
     
     def label(self):
         return self._label
     
     def setLabel(self, new_label):
-        self._label = new_label
+        if new_label != self._label:
+            self._label = new_label
+            self._notify_changed("label")
     
     def selected(self):
         return self._selected
     
     def setSelected(self, selected=True):
-        self._selected = selected
+        if selected != self._selected:
+            self._selected = selected
+            self._notify_changed("selected")
     
     def iconName(self):
         return self._icon_name
@@ -484,7 +921,9 @@ class YItem:
         return bool(self._icon_name)
     
     def setIconName(self, new_icon_name):
-        self._icon_name = new_icon_name
+        if new_icon_name != self._icon_name:
+            self._icon_name = new_icon_name
+            self._notify_changed("icon")
     
     def index(self):
         return self._index
@@ -498,6 +937,17 @@ class YItem:
     def setData(self, new_data):
         self._data = new_data
 
+    def _notify_changed(self, what):
+        """Tell the owning widget that *what* ("label", "icon", "selected",
+        "cell" or "children") changed, so it can update just this row."""
+        node = self
+        while node is not None:
+            owner = getattr(node, "_owner", None)
+            if owner is not None:
+                owner._item_changed(self, what)
+                return
+            node = getattr(node, "_parent_item", None)
+
 class YMenuItem:
     """Lightweight menu item model for backend-agnostic use.
 
@@ -613,11 +1063,15 @@ class YTreeItem(YItem):
             item = YTreeItem(item)
         self._children.append(item)
         item._parent_item = self
+        self._notify_changed("children")
         return item
     
     def isOpen(self):
         return self._is_open
-    
+
+    def setOpen(self, open: bool = True):
+        self._is_open = bool(open)
+
 
 class YTableHeader:
     """Helper class for table column properties.
@@ -663,8 +1117,11 @@ class YTableCell:
     Supports label, optional icon name, optional sort key and an optional
     checkbox state. Cells can be created detached or with a parent/table
     assigned via `reparent()`.
+
+    The sort key may be a string or a typed value (int, float, date,
+    datetime); typed keys sort by value instead of by text.
     """
-    def __init__(self, label: str = "", icon_name: str = "", sort_key: str = "", parent: Optional["YTableItem"] = None, column: int = -1, checked: Optional[bool] = None):
+    def __init__(self, label: str = "", icon_name: str = "", sort_key="", parent: Optional["YTableItem"] = None, column: int = -1, checked: Optional[bool] = None):
         self._label = label
         self._icon_name = icon_name
         self._sort_key = sort_key
@@ -672,18 +1129,24 @@ class YTableCell:
         self._column = column
         # checked: None means not-a-checkbox column; True/False represent checkbox state
         self._checked = checked
+        self._sort_value = None   # cached sortValue(), dropped on change
 
     def label(self):
         return self._label
 
     def setLabel(self, new_label: str):
-        self._label = new_label
+        if new_label != self._label:
+            self._label = new_label
+            self._sort_value = None
+            self._notify_changed()
 
     def iconName(self):
         return self._icon_name
 
     def setIconName(self, new_icon_name: str):
-        self._icon_name = new_icon_name
+        if new_icon_name != self._icon_name:
+            self._icon_name = new_icon_name
+            self._notify_changed()
 
     def hasIconName(self):
         return bool(self._icon_name)
@@ -691,8 +1154,45 @@ class YTableCell:
     def sortKey(self):
         return self._sort_key
 
+    def setSortKey(self, sort_key):
+        if sort_key != self._sort_key:
+            self._sort_key = sort_key
+            self._sort_value = None
+            self._notify_changed()
+
     def hasSortKey(self):
-        return bool(self._sort_key)
+        return self._sort_key is not None and self._sort_key != ""
+
+    def sortValue(self):
+        """Comparable key used to sort rows by this cell.
+
+        Checkbox cells sort by state, typed sort keys by value and text
+        (the sort key, else the label) by locale collation.  Keys are
+        (rank, value) tuples so numbers, dates and text never get compared
+        with each other.  Computed once and cached until the cell changes.
+        """
+        value = self._sort_value
+        if value is None:
+            value = self._sort_value = self._make_sort_value()
+        return value
+
+    def _make_sort_value(self):
+        if self._checked is not None:
+            return (0, int(self._checked))
+        key = self._sort_key if self.hasSortKey() else self._label
+        if isinstance(key, (int, float)):
+            return (0, key)
+        if isinstance(key, datetime.datetime):
+            if key.tzinfo is not None:
+                key = key.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+            return (1, key)
+        if isinstance(key, datetime.date):
+            return (1, datetime.datetime(key.year, key.month, key.day))
+        text = "" if key is None else str(key)
+        try:
+            return (2, locale.strxfrm(text))
+        except Exception:
+            return (2, text)
 
     def parent(self):
         return self._parent
@@ -711,11 +1211,19 @@ class YTableCell:
 
     # checkbox API
     def setChecked(self, val: bool = True):
-        self._checked = bool(val)
+        if self._checked is None or bool(val) != self._checked:
+            self._checked = bool(val)
+            self._sort_value = None
+            self._notify_changed()
 
     def checked(self):
         return bool(self._checked) if self._checked is not None else False
 
+    def _notify_changed(self):
+        """Forward a cell change to the row, which notifies its widget."""
+        if self._parent is not None:
+            self._parent._notify_changed("cell")
+
 
 class YTableItem(YTreeItem):
     """Table item (one row). Each item may contain multiple `YTableCell`.
@@ -727,7 +1235,7 @@ class YTableItem(YTreeItem):
         super().__init__(label, parent, False, is_open, icon_name)
         self._cells = []  # list of YTableCell
 
-    def addCell(self, cell_or_label, icon_name: str = "", sort_key: str = ""):
+    def addCell(self, cell_or_label, icon_name: str = "", sort_key=""):
         """Add a cell instance or create one from label/icon/sort_key.
         If a boolean is passed as first arg, treat it as a checkbox cell value.
         """
@@ -747,6 +1255,7 @@ class YTableItem(YTreeItem):
             cell._column = len(self._cells)
             cell._parent = self
         self._cells.append(cell)
+        self._notify_changed("cell")
 
     def addCells(self, *labels):
         for lbl in labels:
@@ -754,6 +1263,7 @@ class YTableItem(YTreeItem):
 
     def deleteCells(self):
         self._cells = []
+        self._notify_changed("cell")
 
     def cellsBegin(self):
         return iter(self._cells)
@@ -798,6 +1308,1104 @@ class YTableItem(YTreeItem):
     def debugLabel(self):
         return f"{super().debugLabel()}[cells={self.cellCount()}]"
 
+class YAsyncItemLoader:
+    """Progressive population of a selection widget, returned by
+    YSelectionWidget.addItemsAsync()."""
+
+    def __init__(self, widget, items, chunk=2000, progress=None, done=None):
+        self._widget = widget
+        self._iter = iter(items)
+        self._chunk = max(1, int(chunk))
+        self._progress = progress
+        self._done = done
+        self._count = 0
+        self._running = True
+        self._cancelled = False
+        self._error = None
+
+    def count(self) -> int:
+        """Number of items added so far."""
+        return self._count
+
+    def isRunning(self) -> bool:
+        return self._running
+
+    def isCancelled(self) -> bool:
+        return self._cancelled
+
+    def error(self):
+        """Exception raised by the item iterable, if loading stopped on one."""
+        return self._error
+
+    def cancel(self):
+        """Stop loading; items already added stay in the widget."""
+        if not self._running:
+            return
+        self._cancelled = True
+        self._finish()
+
+    def _start(self):
+        if self._step():
+            self._schedule()
+
+    def _schedule(self):
+        dlg = self._widget.findDialog()
+        if dlg is not None and hasattr(dlg, "_call_when_idle"):
+            dlg._call_when_idle(self._on_idle)
+            return
+        while self._step():
+            pass
+
+    def _on_idle(self):
+        if self._step():
+            self._schedule()
+
+    def _step(self):
+        """Add the next chunk; return True if more items may follow."""
+        if not self._running:
+            return False
+        try:
+            batch = list(itertools.islice(self._iter, self._chunk))
+        except Exception as e:
+            logging.getLogger(__name__).exception("addItemsAsync: item iterable failed")
+            self._error = e
+            batch = []
+        if batch:
+            with self._widget.batchUpdate():
+                self._widget._append_items(batch)
+            self._count += len(batch)
+            if self._progress is not None:
+                self._progress(self)
+            if not self._running:
+                # cancelled from the progress callback
+                return False
+        if self._error is not None or len(batch) < self._chunk:
+            self._finish()
+            return False
+        return self._running
+
+    def _finish(self):
+        self._running = False
+        if self._widget._item_loader is self:
+            self._widget._item_loader = None
+        if self._done is not None:
+            self._done(self)
+
+
+class YItemDiff:
+    """Difference between two item lists, as computed by YSelectionWidget.setItems().
+
+    Old and new items are matched by key; the matched items that already are
+    in the right relative order (a longest increasing subsequence of their
+    old rows) stay in place, all other matched items are moved, expressed as
+    a remove plus an insert.  Applying ``removed`` and then ``inserted`` to
+    the old rows yields ``items``:
+
+    - ``removed``:  [(old_row, count)], highest row first
+    - ``inserted``: [(new_row, [items])], lowest row first
+    - ``kept``:     [(new_row, old_item, new_item, changed)] for items staying
+      in place; ``changed`` tells whether the row content differs
+    - ``pairs``:    [(old_item, new_item)] for every matched item
+    - ``oldToNew``: {old_row: new_row} for every matched item
+    - ``children``: {new_item: YItemDiff} for matched tree items (recursive)
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.removed = []
+        self.inserted = []
+        self.kept = []
+        self.pairs = []
+        self.oldToNew = {}
+        self.children = {}
+
+    @staticmethod
+    def labelKey(item):
+        return item.label()
+
+    @staticmethod
+    def content(item):
+        """Tuple describing what a row displays (children excluded)."""
+        if isinstance(item, YTableItem):
+            return tuple((c.label(), c.iconName(), c.sortKey(), c._checked)
+                         for c in item._cells)
+        return (item.label(), item.iconName())
+
+    @classmethod
+    def compute(cls, old, new, key, recursive=False):
+        """Diff *old* against *new*, matching items by ``key(item)``.
+
+        Duplicate keys among the old or the new items would pair rows
+        first-to-first and move selection to the wrong rows, so such a level
+        is matched by identity instead.
+        """
+        diff = cls(new)
+        old_keys = [key(it) for it in old]
+        new_keys = [key(it) for it in new]
+        if len(set(old_keys)) != len(old_keys) or len(set(new_keys)) != len(new_keys):
+            logging.getLogger(__name__).debug(
+                "YItemDiff: duplicate item keys, matching items by identity")
+            old_keys = [id(it) for it in old]
+            new_keys = [id(it) for it in new]
+        old_pos = {k: i for i, k in enumerate(old_keys)}
+        matched = []   # (old_row, new_row), in new order
+        for j, k in enumerate(new_keys):
+            i = old_pos.pop(k, None)
+            if i is not None:
+                matched.append((i, j))
+        stable = cls._stable_rows(matched)
+        kept_old = set()
+        for i, j in matched:
+            o, n = old[i], new[j]
+            diff.pairs.append((o, n))
+            diff.oldToNew[i] = j
+            if j in stable:
+                kept_old.add(i)
+                diff.kept.append((j, o, n, cls.content(o) != cls.content(n)))
+            if recursive:
+                diff.children[n] = cls.compute(getattr(o, "_children", []),
+                                               getattr(n, "_children", []),
+                                               key, recursive=True)
+        # group removed old rows into runs, highest first
+        run = None
+        for i in range(len(old) - 1, -1, -1):
+            if i in kept_old:
+                run = None
+            elif run is not None and run[0] == i + 1:
+                run[0] = i
+                run[1] += 1
+            else:
+                run = [i, 1]
+                diff.removed.append(run)
+        diff.removed = [tuple(r) for r in diff.removed]
+        # group inserted new rows into runs, lowest first
+        run = None
+        for j, it in enumerate(new):
+            if j in stable:
+                run = None
+            elif run is not None:
+                run[1].append(it)
+            else:
+                run = (j, [it])
+                diff.inserted.append(run)
+        return diff
+
+    @staticmethod
+    def _stable_rows(matched):
+        """New rows of the longest run of matches whose old rows increase."""
+        tails = []      # tails[k]: match ending the best increasing run of length k+1
+        tail_rows = []  # old row of tails[k]
+        prev = [-1] * len(matched)
+        for m, (i, _j) in enumerate(matched):
+            k = bisect.bisect_left(tail_rows, i)
+            if k > 0:
+                prev[m] = tails[k - 1]
+            if k == len(tails):
+                tails.append(m)
+                tail_rows.append(i)
+            else:
+                tails[k] = m
+                tail_rows[k] = i
+        stable = set()
+        m = tails[-1] if tails else -1
+        while m >= 0:
+            stable.add(matched[m][1])
+            m = prev[m]
+        return stable
+
+    def carryState(self):
+        """Copy selection and open state of matched old items to the new ones."""
+        for o, n in self.pairs:
+            try:
+                n.setSelected(bool(o.selected()))
+            except Exception:
+                pass
+            if hasattr(o, "_is_open") and hasattr(n, "_is_open"):
+                n._is_open = o._is_open
+            sub = self.children.get(n)
+            if sub is not None:
+                sub.carryState()
+
+    def allPairs(self):
+        """Yield (old_item, new_item) for matched items at every tree level."""
+        for o, n in self.pairs:
+            yield o, n
+            sub = self.children.get(n)
+            if sub is not None:
+                yield from sub.allPairs()
+
+    def hasChanges(self):
+        return bool(self.removed or self.inserted or any(k[3] for k in self.kept)
+                    or any(c.hasChanges() for c in self.children.values()))
+
+
+class YTableFilter:
+    """Row filter behind YTable.setFilter(), shared by the YTable backends.
+
+    Every row is indexed once as the case-folded labels of the filtered
+    columns joined by newlines; keys are built lazily on the first match
+    and dropped per row when its cells change (see invalidate()), so
+    re-filtering on each keystroke only runs one string test per row.
+
+    Modes:
+    - ``"substring"``: the text occurs in one of the columns
+    - ``"prefix"``:    one of the columns starts with the text
+    - ``"regex"``:     re.search() on each column, case-insensitive
+    """
+
+    MODES = ("substring", "prefix", "regex")
+
+    # setFilter() results: how the set of matching rows can have changed
+    UNCHANGED = 0
+    STRICTER = 1    # matching rows are a subset of the previous ones
+    LOOSER = 2      # matching rows are a superset of the previous ones
+    DIFFERENT = 3
+
+    def __init__(self):
+        self._text = ""
+        self._columns = None
+        self._mode = "substring"
+        self._needle = ""
+        self._regex = None
+        self._keys = {}   # item -> normalised text of the filtered columns
+
+    def text(self) -> str:
+        return self._text
+
+    def columns(self):
+        return self._columns
+
+    def mode(self) -> str:
+        return self._mode
+
+    def isActive(self) -> bool:
+        return bool(self._text)
+
+    def setFilter(self, text="", columns=None, mode="substring") -> int:
+        """Set the filter; return one of UNCHANGED/STRICTER/LOOSER/DIFFERENT.
+
+        Raises ValueError for an unknown mode or an invalid regular
+        expression, leaving the previous filter in place.
+        """
+        text = text or ""
+        if mode not in self.MODES:
+            raise ValueError(f"unknown filter mode {mode!r}")
+        if columns is not None:
+            columns = tuple(sorted(set(int(c) for c in columns)))
+        regex = None
+        if mode == "regex" and text:
+            try:
+                regex = re.compile(text, re.IGNORECASE | re.MULTILINE)
+            except re.error as e:
+                raise ValueError(f"invalid filter expression {text!r}: {e}") from e
+        if columns != self._columns:
+            self._keys = {}
+            change = self.DIFFERENT
+        elif mode != self._mode:
+            change = self.DIFFERENT if (self._text or text) else self.UNCHANGED
+        else:
+            change = self._narrowing(self._needle, text.casefold())
+        if not (self._text or text):
+            change = self.UNCHANGED
+        self._text = text
+        self._columns = columns
+        self._mode = mode
+        self._needle = text.casefold()
+        self._regex = regex
+        return change
+
+    def _narrowing(self, old, new):
+        if old == new:
+            return self.UNCHANGED
+        if self._mode == "regex":
+            return self.DIFFERENT
+        if not old or (new.startswith(old) if self._mode == "prefix" else old in new):
+            return self.STRICTER
+        if not new or (old.startswith(new) if self._mode == "prefix" else new in old):
+            return self.LOOSER
+        return self.DIFFERENT
+
+    def _key(self, item):
+        try:
+            if self._columns is None:
+                cells = item._cells
+            else:
+                cells = [item.cell(c) for c in self._columns]
+            key = "\n".join(c.label() for c in cells if c is not None).casefold()
+        except Exception:
+            key = ""
+        self._keys[item] = key
+        return key
+
+    def matches(self, item) -> bool:
+        """Tell whether *item* passes the filter (always True when inactive)."""
+        if not self._text:
+            return True
+        key = self._keys.get(item)
+        if key is None:
+            key = self._key(item)
+        if self._regex is not None:
+            return self._regex.search(key) is not None
+        if self._mode == "prefix":
+            return key.startswith(self._needle) or ("\n" + self._needle) in key
+        return self._needle in key
+
+    def filterItems(self, items) -> list:
+        """Return the items of *items* passing the filter, in order."""
+        if not self._text:
+            return list(items)
+        keys = self._keys
+        make = self._key
+        out = []
+        append = out.append
+        if self._regex is not None:
+            search = self._regex.search
+            for it in items:
+                key = keys.get(it)
+                if key is None:
+                    key = make(it)
+                if search(key) is not None:
+                    append(it)
+        elif self._mode == "prefix":
+            needle = self._needle
+            nl_needle = "\n" + needle
+            for it in items:
+                key = keys.get(it)
+                if key is None:
+                    key = make(it)
+                if key.startswith(needle) or nl_needle in key:
+                    append(it)
+        else:
+            needle = self._needle
+            for it in items:
+                key = keys.get(it)
+                if key is None:
+                    key = make(it)
+                if needle in key:
+                    append(it)
+        return out
+
+    def invalidate(self, item=None):
+        """Drop the index entry of *item* (all entries when None)."""
+        if item is None:
+            self._keys = {}
+        else:
+            self._keys.pop(item, None)
+
+    def carryOver(self, diff):
+        """Keep index entries across setItems() for rows whose cells are unchanged."""
+        keys = self._keys
+        self._keys = {n: keys[o] for _row, o, n, changed in diff.kept
+                      if not changed and o in keys}
+
+
+class YTableSort:
+    """Row order behind YTable sorting, shared by the YTable backends.
+
+    Holds the sort columns as [(column, ascending)], primary first, and
+    sorts with one stable pass per column from the last to the primary
+    one, using the cached YTableCell.sortValue() keys.
+    """
+
+    _MISSING = (2, "")   # key of a row without a cell in the sorted column
+
+    def __init__(self):
+        self._keys = []
+
+    def keys(self) -> list:
+        return list(self._keys)
+
+    def setKeys(self, keys):
+        """Set the sort columns: column numbers or (column, ascending) pairs."""
+        normalised = []
+        seen = set()
+        for k in keys or []:
+            if isinstance(k, (tuple, list)):
+                column, ascending = int(k[0]), bool(k[1])
+            else:
+                column, ascending = int(k), True
+            if column >= 0 and column not in seen:
+                seen.add(column)
+                normalised.append((column, ascending))
+        self._keys = normalised
+
+    def clickColumn(self, column: int, ascending: bool = True):
+        """Make *column* the primary sort column; earlier ones break ties."""
+        self.setKeys([(column, ascending)] + [k for k in self._keys if k[0] != column])
+
+    def sorted(self, items) -> list:
+        """Return *items* in the current sort order (stable)."""
+        items = list(items)
+        for column, ascending in reversed(self._keys):
+            keys = self._column_keys(items, column)
+            order = sorted(range(len(items)), key=keys.__getitem__,
+                           reverse=not ascending)
+            items = [items[i] for i in order]
+        return items
+
+    def insertPosition(self, items, item) -> int:
+        """Return where *item* goes in *items*, already in sort order.
+
+        A binary search, after any rows that compare equal, which is where
+        a stable sort of items + [item] would put it.
+        """
+        lo, hi = 0, len(items)
+        key = self._row_key(item)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._compare_keys(key, self._row_key(items[mid])) < 0:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _row_key(self, item):
+        keys = []
+        for column, _ascending in self._keys:
+            try:
+                keys.append(item._cells[column].sortValue())
+            except (IndexError, AttributeError):
+                keys.append(self._MISSING)
+        return keys
+
+    def _compare_keys(self, a, b):
+        for (_column, ascending), ka, kb in zip(self._keys, a, b):
+            if ka != kb:
+                less = ka < kb
+                return -1 if less == ascending else 1
+        return 0
+
+    def _column_keys(self, items, column):
+        """Sort keys of *column* for *items*; bare values when all share a rank."""
+        missing = self._MISSING
+        keys = []
+        append = keys.append
+        for it in items:
+            try:
+                append(it._cells[column].sortValue())
+            except (IndexError, AttributeError):
+                append(missing)
+        if len({k[0] for k in keys}) == 1:
+            # one kind of value: comparing bare values is much cheaper
+            keys = [k[1] for k in keys]
+        return keys
+
+
+class YLogLineStore:
+    """Chronological line storage shared by the YLogView backends.
+
+    Lines are kept oldest first.  With ``codec=None`` (default) the store
+    behaves like a plain list of strings.  With ``codec`` set to ``"zlib"``
+    or ``"lzma"`` it becomes tiered: the most recent lines stay as plain
+    strings, while older lines are packed into compressed chunks of
+    ``chunkLines`` lines.  Chunks are decompressed on demand when indexed
+    (e.g. scrolled into view) or when :meth:`text` is called; a small LRU
+    keeps the last decoded chunks around so scrolling does not decode the
+    same chunk twice.
+
+    ``maxLines`` > 0 turns the store into a ring buffer that drops the
+    oldest lines once exceeded.
+    """
+    CODECS = ("zlib", "lzma")
+    _DECODED_CACHE_SIZE = 4
+
+    def __init__(self, maxLines: int = 0, codec: Optional[str] = None, chunkLines: int = 1000):
+        self._max_lines = max(0, int(maxLines or 0))
+        self._codec = None
+        self._chunk_lines = 1000
+        # cold tier: list of [chunk_id, blob, line_count, max_line_len]
+        self._chunks = []
+        self._next_chunk_id = 0
+        # number of lines already dropped from the first cold chunk
+        self._head_skip = 0
+        self._cold_count = 0
+        # hot tier: most recent lines as plain strings
+        self._hot = []
+        self._hot_max_len = 0
+        self._hot_max_dirty = False
+        self._decoded = OrderedDict()
+        # lines appended since the last clear(), including dropped ones
+        self._appended = 0
+        self.setCompression(codec, chunkLines)
+
+    # configuration
+    def compression(self) -> Optional[str]:
+        """Return the codec used for cold chunks, or None if disabled."""
+        return self._codec
+
+    def chunkLines(self) -> int:
+        return self._chunk_lines
+
+    def setCompression(self, codec: Optional[str] = "zlib", chunkLines: int = 1000):
+        """Enable (``"zlib"``/``"lzma"``) or disable (None) cold storage.
+
+        Existing content is re-packed with the new settings.
+        """
+        if codec is not None:
+            codec = str(codec).lower()
+            if codec not in self.CODECS:
+                raise ValueError(f"Unsupported log compression codec: {codec}")
+        lines = list(self) if (self._chunks or self._hot) else []
+        appended = self._appended
+        self._codec = codec
+        self._chunk_lines = max(1, int(chunkLines or 1000))
+        self._reset()
+        self.extend(lines)
+        self._appended = appended
+
+    def maxLines(self) -> int:
+        return self._max_lines
+
+    def setMaxLines(self, maxLines: int):
+        self._max_lines = max(0, int(maxLines or 0))
+        self._trim()
+
+    # sequence protocol
+    def __len__(self):
+        return self._cold_count + len(self._hot)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        n = len(self)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(n)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self.iterLines(start, stop))
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError("log line index out of range")
+        if index >= self._cold_count:
+            return self._hot[index - self._cold_count]
+        pos = index + self._head_skip
+        return self._decode_chunk(pos // self._chunk_lines)[pos % self._chunk_lines]
+
+    def __iter__(self):
+        return self.iterLines()
+
+    def __reversed__(self):
+        for i in range(len(self._hot) - 1, -1, -1):
+            yield self._hot[i]
+        for ci in range(len(self._chunks) - 1, -1, -1):
+            lines = self._unpack(self._chunks[ci][1])
+            low = self._head_skip if ci == 0 else 0
+            for i in range(len(lines) - 1, low - 1, -1):
+                yield lines[i]
+
+    def iterLines(self, start: int = 0, stop: Optional[int] = None):
+        """Yield lines in chronological order from *start* to *stop*.
+
+        Cold chunks outside the range are not decompressed.
+        """
+        n = len(self)
+        stop = n if stop is None else min(int(stop), n)
+        start = max(0, int(start))
+        i = start
+        while i < stop and i < self._cold_count:
+            pos = i + self._head_skip
+            ci = pos // self._chunk_lines
+            lines = self._decode_chunk(ci)
+            first = pos % self._chunk_lines
+            last = min(len(lines), first + (min(stop, self._cold_count) - i))
+            for line in lines[first:last]:
+                yield line
+            i += last - first
+        if i < stop:
+            for line in self._hot[i - self._cold_count:stop - self._cold_count]:
+                yield line
+
+    # mutation
+    def append(self, line: str):
+        self.extend((line,))
+
+    def extend(self, lines):
+        added = 0
+        for line in lines:
+            line = str(line)
+            self._hot.append(line)
+            if len(line) > self._hot_max_len:
+                self._hot_max_len = len(line)
+            added += 1
+        if not added:
+            return
+        self._appended += added
+        self._trim()
+        if self._codec is not None:
+            while len(self._hot) >= 2 * self._chunk_lines:
+                self._pack_oldest_hot()
+
+    def clear(self):
+        self._reset()
+
+    # helpers
+    def appendedCount(self) -> int:
+        """Return the number of lines appended since the last clear().
+
+        Dropped lines are counted too, so a view that remembers this value
+        and how many lines it shows can tell which lines are new and how
+        many of its own lines were trimmed away, without reading the rest.
+        """
+        return self._appended
+
+    def last(self) -> str:
+        """Return the newest line, or an empty string if the store is empty."""
+        if self._hot:
+            return self._hot[-1]
+        return self[-1] if self._cold_count else ""
+
+    def text(self, reverse: bool = False, start: int = 0) -> str:
+        """Return the retained lines from index *start* on joined with newlines."""
+        if self._codec is None:
+            lines = self._hot[start:] if start else self._hot
+            return "\n".join(reversed(lines) if reverse else lines)
+        if start:
+            lines = list(self.iterLines(start))
+            return "\n".join(reversed(lines) if reverse else lines)
+        return "\n".join(reversed(self) if reverse else self)
+
+    def viewLines(self) -> int:
+        """Return how many of the newest lines a text view should hold.
+
+        Without compression that is every retained line.  With compression
+        it is at most two chunks, so widgets that copy lines into their own
+        text document stay bounded like the store; older lines remain
+        available through :meth:`text` and indexing.
+        """
+        if self._codec is None:
+            return len(self)
+        return min(len(self), 2 * self._chunk_lines)
+
+    def maxLineLength(self) -> int:
+        """Return the length of the longest retained line.
+
+        Cold chunks remember their own maximum, so this never decompresses.
+        After trimming, a partially dropped chunk keeps its original maximum,
+        which may slightly overestimate the real value.
+        """
+        if self._hot_max_dirty:
+            self._hot_max_len = max((len(s) for s in self._hot), default=0)
+            self._hot_max_dirty = False
+        cold = max((c[3] for c in self._chunks), default=0)
+        return max(cold, self._hot_max_len)
+
+    # internals
+    def _reset(self):
+        self._appended = 0
+        self._chunks = []
+        self._head_skip = 0
+        self._cold_count = 0
+        self._hot = []
+        self._hot_max_len = 0
+        self._hot_max_dirty = False
+        self._decoded.clear()
+
+    def _trim(self):
+        if self._max_lines <= 0:
+            return
+        excess = len(self) - self._max_lines
+        if excess <= 0:
+            return
+        # drop whole or partial cold chunks first
+        while excess > 0 and self._chunks:
+            chunk = self._chunks[0]
+            remaining = chunk[2] - self._head_skip
+            if remaining <= excess:
+                self._chunks.pop(0)
+                self._decoded.pop(chunk[0], None)
+                self._head_skip = 0
+                self._cold_count -= remaining
+                excess -= remaining
+            else:
+                self._head_skip += excess
+                self._cold_count -= excess
+                excess = 0
+        if excess > 0:
+            del self._hot[:excess]
+            self._hot_max_dirty = True
+
+    def _pack_oldest_hot(self):
+        n = self._chunk_lines
+        lines = self._hot[:n]
+        del self._hot[:n]
+        self._hot_max_dirty = True
+        blob = self._pack(lines)
+        self._chunks.append([self._next_chunk_id, blob, len(lines), max((len(s) for s in lines), default=0)])
+        self._next_chunk_id += 1
+        self._cold_count += len(lines)
+
+    def _pack(self, lines):
+        data = "\n".join(lines).encode("utf-8")
+        if self._codec == "lzma":
+            import lzma
+            return lzma.compress(data)
+        import zlib
+        return zlib.compress(data)
+
+    def _unpack(self, blob):
+        if self._codec == "lzma":
+            import lzma
+            data = lzma.decompress(blob)
+        else:
+            import zlib
+            data = zlib.decompress(blob)
+        return data.decode("utf-8").split("\n")
+
+    def _decode_chunk(self, ci: int):
+        chunk = self._chunks[ci]
+        lines = self._decoded.get(chunk[0])
+        if lines is not None:
+            self._decoded.move_to_end(chunk[0])
+            return lines
+        lines = self._unpack(chunk[1])
+        self._decoded[chunk[0]] = lines
+        while len(self._decoded) > self._DECODED_CACHE_SIZE:
+            self._decoded.popitem(last=False)
+        return lines
+
+
+class YRichTextDocument:
+    """Backend-neutral form of the HTML subset understood by YRichText.
+
+    :meth:`parse` tokenizes the text in one pass over a single compiled tag
+    pattern and splits it into lines of styled segments.  Each segment is a
+    dict with ``text``, ``bold``, ``italic``, ``underline``, ``color``,
+    ``anchor`` (link target or None) and ``heading`` (1-6, 0 outside
+    headings).  Supported tags: br, p, ul/ol/li, h1-h6, b/strong, i/em, u,
+    a href and span with a ``foreground`` or ``style="color: ..."``
+    attribute; other tags are dropped and character references decoded.
+    The curses backend draws the segments, the GTK backend turns them into
+    Pango markup.
+
+    Results for texts up to ``_CACHE_MAX_CHARS`` characters are memoised
+    in a small LRU keyed by hash and length, so documents are shared and
+    must be treated as read-only; larger texts are parsed on every call
+    rather than kept alive by the cache.
+
+    Text that arrives in pieces is parsed piece by piece by passing the
+    :meth:`endState` of the previous piece to :meth:`parse`, so a tag
+    opened in one piece still styles the following ones.
+    """
+    _TOKEN_RE = re.compile(
+        r"<!--.*?-->|<[!?][^>]*>"
+        r"|<(/?)([a-zA-Z][a-zA-Z0-9]*)((?:\"[^\"]*\"|'[^']*'|[^'\">])*)>",
+        re.DOTALL)
+    _ATTR_RE = re.compile(
+        r"([a-zA-Z_:][-a-zA-Z0-9_:.]*)(?:\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s\"'>]+))?")
+    _COLOR_RE = re.compile(r"color\s*:\s*([^;]+)", re.IGNORECASE)
+    _HEADINGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+    _CACHE_SIZE = 8
+    _CACHE_MAX_CHARS = 256 * 1024
+    _cache = OrderedDict()
+    _lock = threading.Lock()
+    # open styles, link target, heading level, whether any text came before
+    _START = ((), None, 0, False)
+
+    def __init__(self):
+        self._lines = [[]]
+        self._heading_lines = set()
+        self._anchors = None
+        self._max_len = None
+        self._end_state = self._START
+
+    @classmethod
+    def parse(cls, text: str, state=None) -> "YRichTextDocument":
+        """Return the document for *text*, parsing it only on a cache miss.
+
+        *state* is the :meth:`endState` of the text preceding *text*; the
+        tags it left open apply to *text* as well.
+        """
+        text = text or ""
+        if (state is not None and state != cls._START) or len(text) > cls._CACHE_MAX_CHARS:
+            doc = cls()
+            doc._feed(text, state or cls._START)
+            return doc
+        key = (hash(text), len(text))
+        with cls._lock:
+            doc = cls._cache.get(key)
+            if doc is not None:
+                cls._cache.move_to_end(key)
+                return doc
+        doc = cls()
+        doc._feed(text, cls._START)
+        with cls._lock:
+            cls._cache[key] = doc
+            while len(cls._cache) > cls._CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return doc
+
+    def lines(self) -> list:
+        """Lines as lists of segment dicts."""
+        return self._lines
+
+    def endState(self):
+        """Tokenizer state at the end of the text: the tags still open.
+
+        Opaque; pass it to :meth:`parse` along with the text that follows.
+        """
+        return self._end_state
+
+    def headingLines(self) -> set:
+        """Indexes of the lines closed by a heading tag."""
+        return self._heading_lines
+
+    def plainLines(self) -> list:
+        """Lines as plain strings, without any markup."""
+        return ["".join(seg["text"] for seg in row) for row in self._lines]
+
+    def maxLength(self) -> int:
+        """Length of the longest line, in characters."""
+        if self._max_len is None:
+            self._max_len = max((sum(len(seg["text"]) for seg in row) for row in self._lines),
+                                default=0)
+        return self._max_len
+
+    def anchors(self) -> list:
+        """Return a new list of the links, in text order, as dicts with
+        ``sline``, ``scol``, ``eline``, ``ecol``, ``target`` and ``seg_idx``."""
+        if self._anchors is None:
+            anchors = []
+            for ln_idx, segs in enumerate(self._lines):
+                col = 0
+                for seg_idx, seg in enumerate(segs):
+                    length = len(seg["text"])
+                    if seg["anchor"]:
+                        anchors.append({'sline': ln_idx, 'scol': col, 'eline': ln_idx,
+                                        'ecol': col + length, 'target': seg["anchor"],
+                                        'seg_idx': seg_idx})
+                    col += length
+            self._anchors = anchors
+        return list(self._anchors)
+
+    def _attrs(self, raw: str) -> dict:
+        attrs = {}
+        for m in self._ATTR_RE.finditer(raw or ""):
+            value = m.group(2) or ""
+            if value[:1] in ("'", '"'):
+                value = value[1:-1]
+            attrs[m.group(1).lower()] = html.unescape(value)
+        return attrs
+
+    def _feed(self, text: str, start):
+        lines = self._lines
+        styles = list(start[0])   # "b", "i", "u", "span" or ("color", value)
+        buf = []
+        state = {"anchor": start[1], "heading": start[2]}
+        continued = start[3]
+
+        def flush():
+            if not buf:
+                return
+            chunk = "".join(buf)
+            buf.clear()
+            if not chunk:
+                return
+            color = None
+            for st in styles:
+                if isinstance(st, tuple):
+                    color = st[1]
+            lines[-1].append({
+                "text": chunk,
+                "bold": "b" in styles or bool(state["heading"]),
+                "italic": "i" in styles,
+                "underline": "u" in styles or state["anchor"] is not None,
+                "color": color,
+                "anchor": state["anchor"],
+                "heading": state["heading"],
+            })
+
+        def newline():
+            flush()
+            lines.append([])
+
+        def data(chunk):
+            if "&" in chunk:
+                chunk = html.unescape(chunk)
+            parts = chunk.split("\n")
+            buf.append(parts[0])
+            for part in parts[1:]:
+                newline()
+                buf.append(part)
+
+        def drop(style):
+            flush()
+            for i in range(len(styles) - 1, -1, -1):
+                if styles[i] == style:
+                    del styles[i]
+                    return
+
+        pos = 0
+        for m in self._TOKEN_RE.finditer(text):
+            if m.start() > pos:
+                data(text[pos:m.start()])
+            pos = m.end()
+            name = m.group(2)
+            if name is None:
+                continue  # comment, doctype or processing instruction
+            tag = name.lower()
+            if m.group(1):
+                # end tag
+                if tag in ("br", "p", "ul", "ol", "li"):
+                    newline()
+                elif tag in self._HEADINGS:
+                    flush()
+                    self._heading_lines.add(len(lines) - 1)
+                    state["heading"] = 0
+                    lines.append([])
+                elif tag == "a":
+                    flush()
+                    state["anchor"] = None
+                elif tag == "span":
+                    flush()
+                    for i in range(len(styles) - 1, -1, -1):
+                        if isinstance(styles[i], tuple) or styles[i] == "span":
+                            del styles[i]
+                            break
+                elif tag in ("b", "strong"):
+                    drop("b")
+                elif tag in ("i", "em"):
+                    drop("i")
+                elif tag == "u":
+                    drop("u")
+            elif tag in ("br", "ul", "ol"):
+                newline()
+            elif tag == "p":
+                # a paragraph starts on a new line, but not on a leading blank one
+                flush()
+                if continued or len(lines) > 1 or lines[0]:
+                    lines.append([])
+            elif tag == "li":
+                flush()
+                buf.append("• ")
+            elif tag in self._HEADINGS:
+                flush()
+                state["heading"] = self._HEADINGS[tag]
+            elif tag == "a":
+                flush()
+                attrs = self._attrs(m.group(3))
+                state["anchor"] = attrs.get("href")
+            elif tag == "span":
+                flush()
+                attrs = self._attrs(m.group(3))
+                color = attrs.get("foreground") or attrs.get("color")
+                if not color and "style" in attrs:
+                    cm = self._COLOR_RE.search(attrs["style"])
+                    if cm:
+                        color = cm.group(1).strip()
+                styles.append(("color", color) if color else "span")
+            elif tag in ("b", "strong"):
+                flush()
+                styles.append("b")
+            elif tag in ("i", "em"):
+                flush()
+                styles.append("i")
+            elif tag == "u":
+                flush()
+                styles.append("u")
+        if pos < len(text):
+            data(text[pos:])
+        flush()
+        self._end_state = (tuple(styles), state["anchor"], state["heading"],
+                           continued or len(lines) > 1 or bool(lines[0]))
+
+class YIconCache:
+    """Process-wide bounded LRU cache for resolved backend icons.
+
+    Backends resolve icon names through the filesystem and the icon theme,
+    and selection boxes, trees, tables and menus do so once per item.  The
+    cache turns every lookup after the first into a dict hit.
+
+    Keys are tuples chosen by the backend, conventionally
+    ``(kind, name, size, scale, theme)``.  Failed lookups are cached too
+    (negative caching) so missing icons are not probed again.  Backends
+    call :meth:`invalidate` when the icon theme changes; putting the theme
+    name in the key also keeps entries of different themes apart.
+
+    Cached values are shared between callers and must be immutable or
+    implicitly shared objects (QIcon, Gdk.Paintable, GdkPixbuf), never
+    widgets.
+    """
+    _MISSING = object()
+    _shared = None
+
+    def __init__(self, maxSize: int = 512):
+        self._max_size = max(1, int(maxSize))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def shared(cls) -> "YIconCache":
+        """Return the process-wide cache instance."""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def lookup(self, key, resolver):
+        """Return the cached value for *key*, calling *resolver()* on a miss.
+
+        A ``None`` result from *resolver* is remembered as a negative entry.
+        """
+        with self._lock:
+            value = self._entries.get(key, None)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return None if value is self._MISSING else value
+            self._misses += 1
+        value = resolver()
+        with self._lock:
+            self._entries[key] = self._MISSING if value is None else value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        """Drop every cached entry (e.g. after an icon theme change)."""
+        with self._lock:
+            self._entries.clear()
+
+    def maxSize(self) -> int:
+        return self._max_size
+
+    def setMaxSize(self, maxSize: int):
+        with self._lock:
+            self._max_size = max(1, int(maxSize))
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Return ``(entries, hits, misses)`` for diagnostics."""
+        with self._lock:
+            return (len(self._entries), self._hits, self._misses)
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def imageFilePath(name):
+        """Return *name* if it refers to an existing image file, else None.
+
+        Shared by the image widgets of every backend.  A name is a file path
+        when it is absolute, contains a path separator or has an extension
+        (``photo.jpg``); bare names without one are theme icon names and are
+        never probed on disk, so a same-named executable in the current
+        directory is not mistaken for an image.
+        """
+        try:
+            if name and (os.path.isabs(name) or os.sep in name
+                         or os.path.splitext(name)[1]):
+                if os.path.isfile(name):
+                    return name
+        except Exception:
+            pass
+        return None
+
+
 # Property system
 class YPropertyType(Enum):
     YUnknownPropertyType = 0
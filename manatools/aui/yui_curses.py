@@ -11,6 +11,7 @@ import fnmatch
 import logging
 from .yui_common import *
 from .backends.curses import *
+from .backends.curses.commoncurses import pin_color_pair
 
 class YUICurses:
     def __init__(self):
@@ -20,6 +21,7 @@ class YUICurses:
         self._stdscr = None
         self._colors_initialized = False
         self._running = False
+        self._bracketed_paste = False
         
         # Initialize curses
         self._init_curses()
@@ -38,17 +40,19 @@ class YUICurses:
                 curses.define_key("\033[Z", curses.KEY_BTAB)
             except Exception:
                 pass
+            self._enable_bracketed_paste(True)
 
             # Enable colors if available
             if curses.has_colors():
                 curses.start_color()
                 curses.use_default_colors()
                 self._colors_initialized = True
-                # Define some color pairs
-                curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLUE)
-                curses.init_pair(2, curses.COLOR_YELLOW, -1)
-                curses.init_pair(3, curses.COLOR_GREEN, -1)
-                curses.init_pair(4, curses.COLOR_RED, -1)
+                # Define some color pairs (numbers 1-4, kept by the shared
+                # registry that hands out every other pair)
+                pin_color_pair(curses.COLOR_WHITE, curses.COLOR_BLUE)
+                pin_color_pair(curses.COLOR_YELLOW, -1)
+                pin_color_pair(curses.COLOR_GREEN, -1)
+                pin_color_pair(curses.COLOR_RED, -1)
         except Exception as e:
             print(f"Error initializing curses: {e}")
             self._cleanup_curses()
@@ -57,6 +61,7 @@ class YUICurses:
     def _cleanup_curses(self):
         try:
             if self._stdscr:
+                self._enable_bracketed_paste(False)
                 curses.nocbreak()
                 self._stdscr.keypad(False)
                 curses.echo()
@@ -65,6 +70,23 @@ class YUICurses:
         except:
             pass
 
+    def _enable_bracketed_paste(self, on):
+        """Turn xterm bracketed-paste mode on or off.
+
+        While on, the terminal wraps pasted text in ESC[200~ ... ESC[201~;
+        YDialogCurses spots the markers in the getch() stream so a paste
+        reaches the focused widget as a single block. The Linux console
+        has no such mode and is left alone.
+        """
+        if bool(on) == self._bracketed_paste or os.environ.get("TERM", "").startswith("linux"):
+            return
+        try:
+            sys.stdout.write("\033[?2004h" if on else "\033[?2004l")
+            sys.stdout.flush()
+            self._bracketed_paste = bool(on)
+        except Exception:
+            pass
+
     def shutdown(self):
         """Restore terminal state for ncurses applications."""
         self._cleanup_curses()
@@ -712,7 +734,7 @@ class YWidgetFactoryCurses:
         return YDateFieldCurses(parent, label)
 
     def createLogView(self, parent, label, visibleLines, storedLines=0,
-                      focus=YLogViewFocus.HEAD, reverse=False):
+                      focus=YLogViewFocus.HEAD, reverse=False, compression=None):
         """Create a LogView widget (ncurses backend).
 
         Parameters
@@ -722,9 +744,12 @@ class YWidgetFactoryCurses:
             ``TAIL`` follows the last line on every append.
         reverse : bool
             When ``True`` new lines are prepended so the display is newest-first.
+        compression : str, optional
+            ``"zlib"`` or ``"lzma"`` keeps older lines in compressed chunks.
         """
         return YLogViewCurses(parent, label, visibleLines, storedLines,
-                                  focus=focus, reverse=reverse)
+                                  focus=focus, reverse=reverse,
+                                  compression=compression)
 
     def createTimeField(self, parent, label):
         """Create a TimeField widget (ncurses backend)."""
@@ -16,6 +16,7 @@ import os
 import logging
 from .yui_common import *
 from .backends.gtk import *
+from .backends.gtk.commongtk import _icon_cache_key
 
 
 class YUIGtk:
@@ -94,9 +95,17 @@ class YApplicationGtk:
     def _resolve_pixbuf(self, icon_spec):
         """Resolve icon_spec into a GdkPixbuf.Pixbuf if possible.
         Prefer local path resolved against iconBasePath if set, else try theme lookup.
+
+        Results are kept in the shared YIconCache; the icon base path is part
+        of the key because it changes how relative specs are resolved.
         """
         if not icon_spec:
             return None
+        key = _icon_cache_key("pixbuf", f"{self._icon_base_path or ''}|{icon_spec}", 48)
+        return YIconCache.shared().lookup(key, lambda: self._load_pixbuf(icon_spec))
+
+    def _load_pixbuf(self, icon_spec):
+        """Uncached implementation of :meth:`_resolve_pixbuf`."""
         # try explicit path (icon_base_path forced)
         try:
             # if base path set and icon_spec not absolute, try join
@@ -997,7 +1006,8 @@ class YWidgetFactoryGtk:
             parent: Parent widget or container.
             imageFileName: Path to an image file or a theme icon name.
             fallBackName: Optional label shown by text-mode backends instead of
-                the image.  Ignored by GUI backends.  When omitted the basename
+                the image.  GUI backends only use it as placeholder while an
+                asynchronous load is pending.  When omitted the basename
                 of *imageFileName* is used by text-mode backends.
         """
         return YImageGtk(parent, imageFileName, fallBackName=fallBackName)
@@ -1029,7 +1039,7 @@ class YWidgetFactoryGtk:
         return YDateFieldGtk(parent, label)
 
     def createLogView(self, parent, label, visibleLines, storedLines=0,
-                      focus=YLogViewFocus.HEAD, reverse=False):
+                      focus=YLogViewFocus.HEAD, reverse=False, compression=None):
         """Create a LogView widget (GTK backend).
 
         Parameters
@@ -1039,9 +1049,12 @@ class YWidgetFactoryGtk:
             ``TAIL`` follows the last line on every append.
         reverse : bool
             When ``True`` new lines are prepended so the display is newest-first.
+        compression : str, optional
+            ``"zlib"`` or ``"lzma"`` keeps older lines in compressed chunks.
         """
         return YLogViewGtk(parent, label, visibleLines, storedLines,
-                               focus=focus, reverse=reverse)
+                               focus=focus, reverse=reverse,
+                              compression=compression)
 
     def createTimeField(self, parent, label):
         """Create a TimeField widget (GTK backend)."""
@@ -8,7 +8,7 @@ import os
 import logging
 from .yui_common import *
 from .backends.qt import *
-from .backends.qt.commonqt import _resolve_icon
+from .backends.qt.commonqt import _resolve_icon, _watch_icon_theme
 
 class YUIQt:
     def __init__(self):
@@ -18,6 +18,7 @@ class YUIQt:
         self._qapp = QtWidgets.QApplication.instance()
         if not self._qapp:
             self._qapp = QtWidgets.QApplication(sys.argv)
+        _watch_icon_theme(self._qapp)
         self._application = YApplicationQt()
         # logger for the backend manager
         try:
@@ -494,7 +495,8 @@ class YWidgetFactoryQt:
             parent: Parent widget or container.
             imageFileName: Path to an image file or a theme icon name.
             fallBackName: Optional label shown by text-mode backends instead of
-                the image.  Ignored by GUI backends.  When omitted the basename
+                the image.  GUI backends only use it as placeholder while an
+                asynchronous load is pending.  When omitted the basename
                 of *imageFileName* is used by text-mode backends.
         """
         return YImageQt(parent, imageFileName, fallBackName=fallBackName)
@@ -525,7 +527,7 @@ class YWidgetFactoryQt:
         return YDateFieldQt(parent, label)
 
     def createLogView(self, parent, label, visibleLines, storedLines=0,
-                      focus=YLogViewFocus.HEAD, reverse=False):
+                      focus=YLogViewFocus.HEAD, reverse=False, compression=None):
         """Create a LogView widget (Qt backend).
 
         Parameters
@@ -535,9 +537,12 @@ class YWidgetFactoryQt:
             ``TAIL`` follows the last line on every append.
         reverse : bool
             When ``True`` new lines are prepended so the display is newest-first.
+        compression : str, optional
+            ``"zlib"`` or ``"lzma"`` keeps older lines in compressed chunks.
         """
         return YLogViewQt(parent, label, visibleLines, storedLines,
-                              focus=focus, reverse=reverse)
+                              focus=focus, reverse=reverse,
+                              compression=compression)
 
     def createTimeField(self, parent, label):
         """Create a TimeField widget (Qt backend)."""
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Manual test for pasting into input widgets (ncurses bracketed paste).
+
+- Creates an input field, a multiline edit and an OK button to exit.
+- Paste a block of text (several lines) into each widget with the
+  terminal's paste shortcut: it must arrive as one insert, i.e. a single
+  ValueChanged notification per paste and no per-character redraws.
+- Logs every value-changed notification and the final values.
+"""
+import os
+import sys
+import logging
+
+# Ensure project root on PYTHONPATH
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    log_name = os.path.splitext(os.path.basename(__file__))[0] + '.log'
+    logFormatter = logging.Formatter('%(asctime)s %(name)s %(levelname)s: %(message)s')
+    root_logger = logging.getLogger()
+    fileHandler = logging.FileHandler(log_name, mode='w')
+    fileHandler.setFormatter(logFormatter)
+    root_logger.addHandler(fileHandler)
+    root_logger.setLevel(logging.DEBUG)
+except Exception as _e:
+    logging.getLogger().exception("Failed to configure file logger: %s", _e)
+
+
+def test_paste(backend_name=None):
+    if backend_name:
+        os.environ['MUI_BACKEND'] = backend_name
+        logging.getLogger().info("Set backend to %s", backend_name)
+    else:
+        logging.getLogger().info("Using auto-detection")
+    try:
+        from manatools.aui.yui import YUI, YUI_ui
+        import manatools.aui.yui_common as yui
+
+        # force re-detection
+        YUI._instance = None
+        YUI._backend = None
+
+        backend = YUI.backend()
+        logging.getLogger().info("Using backend: %s", backend.value)
+
+        ui = YUI_ui()
+        factory = ui.widgetFactory()
+
+        ui.application().setApplicationTitle(f"Test {backend.value} paste")
+        dlg = factory.createPopupDialog()
+        minSize = factory.createMinSize(dlg, 320, 200)
+        v = factory.createVBox(minSize)
+
+        factory.createLabel(v, "Paste multi-line text into both fields")
+        field = factory.createInputField(v, "Single line")
+        field.setNotify(True)
+        mled = factory.createMultiLineEdit(v, "Multiple lines")
+        mled.setNotify(True)
+        mled.setStretchable(yui.YUIDimension.YD_VERT, True)
+        mled.setStretchable(yui.YUIDimension.YD_HORIZ, True)
+        ok = factory.createPushButton(v, "OK")
+
+        notifications = {field: 0, mled: 0}
+        while True:
+            ev = dlg.waitForEvent()
+            if not ev:
+                continue
+            if ev.eventType() == yui.YEventType.CancelEvent:
+                dlg.destroy()
+                break
+            if ev.eventType() == yui.YEventType.WidgetEvent:
+                w = ev.widget()
+                if w == ok:
+                    logging.getLogger().info("Final input field value: %r", field.value())
+                    logging.getLogger().info("Final multiline value:\n%s", mled.value())
+                    dlg.destroy()
+                    break
+                if w in notifications:
+                    notifications[w] += 1
+                    logging.getLogger().info("ValueChanged #%d from %s: %r",
+                                             notifications[w], w.widgetClass(), w.value())
+
+    except Exception as e:
+        logging.getLogger().exception("Error in paste test: %s", e)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        test_paste(sys.argv[1])
+    else:
+        test_paste()